@@ -13,22 +13,23 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView as BaseTokenRefreshView
 
 from apps.common.errors import StandardErrors
+from apps.common.metrics import registry
+from apps.common.openapi import LazyDocs
 from apps.common.responses import APIResponse
 
-from .docs import (
-    login_docs,
-    logout_docs,
-    profile_get_docs,
-    profile_update_docs,
-    register_docs,
-    token_refresh_docs,
-)
 from .serializers import UserLoginSerializer, UserRegistrationSerializer, UserSerializer
 
+docs = LazyDocs("apps.authentication.docs")
 User = get_user_model()
 
+auth_events = registry.counter(
+    "auth_events_total",
+    "Authentication attempts by event and outcome",
+    labelnames=("event", "outcome"),
+)
+
 
-@register_docs
+@docs.register_docs
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def register(request):
@@ -41,6 +42,7 @@ def register(request):
         refresh = RefreshToken.for_user(user)
         access_token = refresh.access_token
 
+        auth_events.inc(event="register", outcome="success")
         return APIResponse.created(
             data={
                 "user": UserSerializer(user).data,
@@ -49,12 +51,13 @@ def register(request):
             message="User registered successfully",
         )
 
+    auth_events.inc(event="register", outcome="failure")
     return StandardErrors.bad_request(
         message="Registration failed - please check your input"
     )
 
 
-@login_docs
+@docs.login_docs
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def login(request):
@@ -67,6 +70,7 @@ def login(request):
         refresh = RefreshToken.for_user(user)
         access_token = refresh.access_token
 
+        auth_events.inc(event="login", outcome="success")
         return APIResponse.success(
             data={
                 "user": UserSerializer(user).data,
@@ -75,10 +79,11 @@ def login(request):
             message="Login successful",
         )
 
+    auth_events.inc(event="login", outcome="failure")
     return StandardErrors.unauthorized(message="Invalid credentials")
 
 
-@logout_docs
+@docs.logout_docs
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def logout(request):
@@ -86,18 +91,21 @@ def logout(request):
     try:
         refresh_token = request.data.get("refresh")
         if not refresh_token:
+            auth_events.inc(event="logout", outcome="failure")
             return StandardErrors.bad_request(message="Refresh token required")
 
         token = RefreshToken(refresh_token)
         token.blacklist()
+        auth_events.inc(event="logout", outcome="success")
         return APIResponse.success(message="Logout successful")
     except Exception:
+        auth_events.inc(event="logout", outcome="failure")
         return StandardErrors.bad_request(
             message="Logout failed - invalid refresh token"
         )
 
 
-@profile_get_docs
+@docs.profile_get_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def profile(request):
@@ -108,7 +116,7 @@ def profile(request):
     )
 
 
-@profile_update_docs
+@docs.profile_update_docs
 @api_view(["PUT", "PATCH"])
 @permission_classes([IsAuthenticated])
 @transaction.atomic
@@ -131,12 +139,13 @@ def update_profile(request):
 class TokenRefreshView(BaseTokenRefreshView):
     """Custom token refresh view that matches our standardized API response format."""
 
-    @token_refresh_docs
+    @docs.token_refresh_docs
     def post(self, request, *args, **kwargs):
         """Refresh JWT token and return in standardized format."""
         serializer = TokenRefreshSerializer(data=request.data)
 
         if serializer.is_valid():
+            auth_events.inc(event="token_refresh", outcome="success")
             return APIResponse.success(
                 data={
                     "tokens": {
@@ -147,6 +156,7 @@ class TokenRefreshView(BaseTokenRefreshView):
                 message="Token refreshed successfully",
             )
 
+        auth_events.inc(event="token_refresh", outcome="failure")
         return StandardErrors.bad_request(
             message="Token refresh failed", errors=list(serializer.errors.values())
         )
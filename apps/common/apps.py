@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    """Configuration for the shared Common application."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.common"
+
+    def ready(self):
+        """Register the system checks and the execute wrapper dispatcher."""
+        from . import checks  # noqa: F401
+        from .db import instrumentation  # noqa: F401
@@ -0,0 +1,33 @@
+"""Helpers shared by the benchmark, load test and latency report commands."""
+
+import subprocess
+from functools import lru_cache
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def git_commit() -> str | None:
+    """Return the current commit, so reports can be compared across commits."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def route_name(path: str) -> str:
+    """Return the namespaced URL name a path resolves to."""
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return UNMATCHED_ROUTE
+    return match.view_name or UNMATCHED_ROUTE
@@ -0,0 +1,22 @@
+"""Caching utilities for the Wedding Planner API."""
+
+from .aggregates import ProfileCache, profile_cache
+from .detail import RenderedResponseCache, detail_cache, track_detail_writes
+from .versioning import (
+    ProfileScopedQuerySet,
+    bump_profile_version,
+    get_profile_version,
+    track_profile_writes,
+)
+
+__all__ = [
+    "ProfileCache",
+    "ProfileScopedQuerySet",
+    "RenderedResponseCache",
+    "bump_profile_version",
+    "detail_cache",
+    "get_profile_version",
+    "profile_cache",
+    "track_detail_writes",
+    "track_profile_writes",
+]
@@ -0,0 +1,115 @@
+"""Cache for per-profile computed aggregates (statistics, progress, categories)."""
+
+import hashlib
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.common.db.routers import profile_written_recently, reading_from_replica
+from apps.common.metrics import registry
+from apps.common.singleflight import single_flight
+
+from .versioning import get_profile_version
+
+_MISSING = object()
+
+cache_requests = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result",
+    labelnames=("cache", "result"),
+)
+
+
+class ProfileCache:
+    """Caches aggregates under keys that embed the profile's version stamp."""
+
+    name = "aggregates"
+
+    def __init__(self, alias: str | None = None, timeout: int | None = None):
+        """Configure the cache alias and timeout (defaults come from settings)."""
+        self._alias = alias
+        self._timeout = timeout
+
+    @property
+    def alias(self) -> str:
+        """Return the Django cache alias used for aggregates."""
+        return self._alias or settings.AGGREGATE_CACHE_ALIAS
+
+    @property
+    def timeout(self) -> int:
+        """Return how long aggregates live in the cache, in seconds."""
+        if self._timeout is not None:
+            return self._timeout
+        return settings.AGGREGATE_CACHE_TIMEOUT
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether aggregate caching is switched on."""
+        return settings.AGGREGATE_CACHE_ENABLED
+
+    def make_key(
+        self, profile_id: int, name: str, params: dict[str, Any] | None = None
+    ) -> str:
+        """Build the versioned cache key for an aggregate."""
+        key = f"agg:{name}:{profile_id}:v{get_profile_version(profile_id)}"
+        if params:
+            encoded = "&".join(f"{k}={params[k]}" for k in sorted(params))
+            key += ":" + hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+        return key
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for ``key`` or ``None``, recording metrics."""
+        value = caches[self.alias].get(key, _MISSING)
+        if value is _MISSING:
+            cache_requests.inc(cache=self.name, result="miss")
+            return None
+        cache_requests.inc(cache=self.name, result="hit")
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store an aggregate under ``key``."""
+        caches[self.alias].set(key, value, self.timeout)
+
+    def get_or_compute(
+        self,
+        profile_id: int,
+        name: str,
+        compute: Callable[[], Any],
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        """Return the cached aggregate, computing and storing it on a miss.
+
+        The version is read before computing, so a write that lands while the
+        value is being computed leaves it under an already-stale key. Misses
+        are coalesced, so concurrent callers share a single computation.
+        Values computed from a replica within ``REPLICA_PIN_SECONDS`` of a
+        write to the profile are returned but not stored, since the replica
+        may not have the write yet.
+        """
+        key = self.make_key(profile_id, name, params)
+        if not self.enabled:
+            return single_flight.do(key, compute, name=name)
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def compute_and_store():
+            value = compute()
+            if not (reading_from_replica() and profile_written_recently(profile_id)):
+                self.set(key, value)
+            return value
+
+        cache = caches[self.alias]
+        return single_flight.do(
+            key,
+            compute_and_store,
+            name=name,
+            cache=cache if settings.SINGLE_FLIGHT_CACHE_LOCK else None,
+            lookup=lambda: cache.get(key),
+        )
+
+
+profile_cache = ProfileCache()
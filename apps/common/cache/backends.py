@@ -0,0 +1,255 @@
+"""Cache backends for the Wedding Planner API.
+
+``RespCache`` speaks the Redis serialization protocol (RESP) directly over a
+socket, so it works against Redis, Valkey, KeyDB or a local stand-in without
+the ``redis`` package. It reuses Django's ``RedisCache`` key handling,
+serialization and timeout semantics and only replaces the wire client.
+"""
+
+import socket
+import threading
+from urllib.parse import unquote, urlparse
+
+from django.core.cache.backends.redis import (
+    RedisCache,
+    RedisCacheClient,
+    RedisSerializer,
+)
+from django.utils.module_loading import import_string
+
+
+class RespError(Exception):
+    """Error reply returned by the server."""
+
+
+class RespConnection:
+    """Single blocking socket connection speaking RESP2."""
+
+    def __init__(self, host, port, db=0, password=None, socket_timeout=None):
+        """Store connection parameters; the socket is opened lazily."""
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.socket_timeout = socket_timeout
+        self._sock: socket.socket | None = None
+        self._reader = None
+
+    def connect(self) -> None:
+        """Open the socket and authenticate/select the database if needed."""
+        self._sock = socket.create_connection(
+            (self.host, self.port), timeout=self.socket_timeout
+        )
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._roundtrip([("AUTH", self.password)])
+        if self.db:
+            self._roundtrip([("SELECT", self.db)])
+
+    def close(self) -> None:
+        """Close the socket, ignoring errors."""
+        for resource in (self._reader, self._sock):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+        self._sock = None
+        self._reader = None
+
+    def execute(self, *commands: tuple) -> list:
+        """Send one or more commands in a single write and return the replies."""
+        if self._sock is None:
+            self.connect()
+        try:
+            return self._roundtrip(commands)
+        except (OSError, EOFError):
+            self.close()
+            raise
+
+    def _roundtrip(self, commands) -> list:
+        """Write all commands, then read one reply per command."""
+        assert self._sock is not None
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    @staticmethod
+    def _encode(command: tuple) -> bytes:
+        """Encode a command as a RESP array of bulk strings."""
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            if isinstance(arg, bytes):
+                data = arg
+            elif isinstance(arg, str):
+                data = arg.encode("utf-8")
+            else:
+                data = str(arg).encode("ascii")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read_reply(self):
+        """Read a single reply from the socket."""
+        line = self._reader.readline()
+        if not line:
+            raise EOFError("Connection closed by server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode("utf-8")
+        if prefix == b"-":
+            return RespError(payload.decode("utf-8"))
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RespError(f"Unexpected reply prefix {prefix!r}")
+
+
+class RespPipeline:
+    """Buffers commands and sends them in one round trip."""
+
+    def __init__(self, client: "RespClient"):
+        """Create an empty pipeline bound to ``client``."""
+        self._client = client
+        self._commands: list[tuple] = []
+
+    def mset(self, mapping: dict) -> "RespPipeline":
+        """Queue an MSET of every key/value pair."""
+        args = [item for pair in mapping.items() for item in pair]
+        self._commands.append(("MSET", *args))
+        return self
+
+    def expire(self, key, timeout: int) -> "RespPipeline":
+        """Queue an EXPIRE for ``key``."""
+        self._commands.append(("EXPIRE", key, timeout))
+        return self
+
+    def execute(self) -> list:
+        """Send the queued commands and return their replies."""
+        commands, self._commands = self._commands, []
+        return self._client.execute_many(commands) if commands else []
+
+
+class RespClient:
+    """Subset of the ``redis.Redis`` API used by Django's ``RedisCacheClient``."""
+
+    def __init__(self, url: str, socket_timeout: float | None = None):
+        """Parse ``redis://[:password@]host[:port][/db]`` into a connection."""
+        parsed = urlparse(url)
+        db = parsed.path.lstrip("/")
+        self._connection = RespConnection(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            socket_timeout=socket_timeout,
+        )
+        self._lock = threading.Lock()
+
+    def execute_many(self, commands: list[tuple]) -> list:
+        """Run several commands in one round trip."""
+        with self._lock:
+            return self._connection.execute(*commands)
+
+    def execute(self, *command):
+        """Run a single command and return its reply."""
+        return self.execute_many([command])[0]
+
+    def get(self, key):
+        """GET ``key``."""
+        return self.execute("GET", key)
+
+    def set(self, key, value, ex=None, nx=False):
+        """SET ``key`` with optional expiry (seconds) and NX flag."""
+        args = ["SET", key, value]
+        if ex is not None:
+            args += ["EX", ex]
+        if nx:
+            args.append("NX")
+        return self.execute(*args) == "OK"
+
+    def mset(self, mapping: dict):
+        """MSET every key/value pair."""
+        return self.pipeline().mset(mapping).execute()[0]
+
+    def mget(self, keys):
+        """MGET ``keys`` in order."""
+        return self.execute("MGET", *keys)
+
+    def delete(self, *keys):
+        """DEL ``keys`` and return how many existed."""
+        return self.execute("DEL", *keys)
+
+    def exists(self, key):
+        """Return 1 if ``key`` exists."""
+        return self.execute("EXISTS", key)
+
+    def expire(self, key, timeout):
+        """Set a relative expiry in seconds."""
+        return self.execute("EXPIRE", key, timeout)
+
+    def persist(self, key):
+        """Remove the expiry of ``key``."""
+        return self.execute("PERSIST", key)
+
+    def incr(self, key, amount=1):
+        """Atomically add ``amount`` to an integer value."""
+        return self.execute("INCRBY", key, amount)
+
+    def flushdb(self):
+        """Remove every key of the selected database."""
+        return self.execute("FLUSHDB") == "OK"
+
+    def ping(self):
+        """Check that the server answers."""
+        return self.execute("PING") == "PONG"
+
+    def pipeline(self) -> RespPipeline:
+        """Start a pipeline of buffered commands."""
+        return RespPipeline(self)
+
+
+class RespCacheClient(RedisCacheClient):
+    """``RedisCacheClient`` backed by :class:`RespClient` instead of redis-py."""
+
+    def __init__(self, servers, serializer=None, socket_timeout=None, **options):
+        """Skip redis-py initialization and keep one client per server."""
+        self._servers = servers
+        self._socket_timeout = socket_timeout
+        self._clients: dict[int, RespClient] = {}
+        if isinstance(serializer, str):
+            serializer = import_string(serializer)
+        if callable(serializer):
+            serializer = serializer()
+        self._serializer = serializer or RedisSerializer()
+
+    def get_client(self, key=None, *, write=False):
+        """Return the client for the primary (writes) or a replica (reads)."""
+        index = self._get_connection_pool_index(write)
+        if index not in self._clients:
+            self._clients[index] = RespClient(
+                self._servers[index], socket_timeout=self._socket_timeout
+            )
+        return self._clients[index]
+
+
+class RespCache(RedisCache):
+    """Django cache backend for Redis-protocol servers without redis-py."""
+
+    def __init__(self, server, params):
+        """Use :class:`RespCacheClient` as the wire client."""
+        super().__init__(server, params)
+        self._class = RespCacheClient
@@ -0,0 +1,175 @@
+"""Process-local cache of rendered detail responses.
+
+Detail endpoints (``get_guest``, ``get_task``, ``get_vendor``, ``get_profile``)
+are polled far more often than the rows change. This cache keeps the rendered
+bytes of the ``APIResponse.success`` envelope per ``(model, pk)`` and
+negotiated media type, and validates them against the row's ``updated_at`` and
+its profile's version stamp, so a hit skips both the serializer and the
+renderer. Hits and misses are answered with the same body and headers.
+
+Only JSON renderers are cached: their output depends on nothing but the data
+and the media type, while the browsable API's HTML embeds the request's user
+and forms.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .aggregates import cache_requests
+from .versioning import get_profile_version, profile_id_field
+
+
+class RenderedResponseCache:
+    """LRU of rendered response bodies bounded by their total size in bytes."""
+
+    name = "detail"
+
+    def __init__(self, max_bytes: int | None = None):
+        """Create an empty cache; ``max_bytes`` defaults to the setting."""
+        self._max_bytes = max_bytes
+        # (model, pk) -> (version, {media type: (content type, body)})
+        self._entries: OrderedDict[
+            tuple[str, int], tuple[tuple, dict[str, tuple[str, bytes]]]
+        ] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        """Return the size budget for all cached bodies."""
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.DETAIL_CACHE_MAX_BYTES
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the size of every cached body."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        """Return the number of cached bodies."""
+        return len(self._entries)
+
+    def get(
+        self, key: tuple[str, int], version: tuple, media_type: str
+    ) -> tuple[str, bytes] | None:
+        """Return the content type and body stored for ``key`` and ``media_type``.
+
+        Bodies are only returned if they were rendered at ``version``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            rendered = entry[1].get(media_type)
+            if rendered is not None:
+                self._entries.move_to_end(key)
+            return rendered
+
+    def set(
+        self,
+        key: tuple[str, int],
+        version: tuple,
+        media_type: str,
+        content_type: str,
+        content: bytes,
+    ) -> None:
+        """Store a body, evicting least recently used entries over budget."""
+        size = len(content)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._discard(key)
+                entry = self._entries[key] = (version, {})
+            else:
+                self._entries.move_to_end(key)
+            previous = entry[1].get(media_type)
+            if previous is not None:
+                self._total_bytes -= len(previous[1])
+            entry[1][media_type] = (content_type, content)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, label: str, pk) -> None:
+        """Drop the body cached for one row."""
+        with self._lock:
+            self._discard((label, pk))
+
+    def clear(self) -> None:
+        """Drop every cached body."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _discard(self, key: tuple[str, int]) -> None:
+        """Remove ``key`` and release its bytes; the lock must be held."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= sum(len(body) for _, body in entry[1].values())
+
+    def respond(
+        self, request: Request, instance, build_response: Callable[[], Response]
+    ) -> HttpResponse:
+        """Return the rendered detail response for ``instance``.
+
+        ``build_response`` is only called on a miss; its envelope is rendered
+        once with the renderer DRF negotiated for ``request`` and the bytes are
+        reused until the row or anything else in its wedding profile changes.
+        """
+        renderer = request.accepted_renderer
+        if not settings.DETAIL_CACHE_ENABLED or not isinstance(renderer, JSONRenderer):
+            return build_response()
+
+        key = (instance._meta.label_lower, instance.pk)
+        profile_id = getattr(instance, profile_id_field(type(instance)))
+        version = (instance.updated_at, get_profile_version(profile_id))
+        media_type = request.accepted_media_type
+
+        rendered = self.get(key, version, media_type)
+        if rendered is not None:
+            cache_requests.inc(cache=self.name, result="hit")
+        else:
+            cache_requests.inc(cache=self.name, result="miss")
+            response = build_response()
+            if response.status_code != 200:
+                return response
+            # The content type DRF's Response would send for this renderer.
+            content_type = (
+                f"{media_type}; charset={renderer.charset}"
+                if renderer.charset
+                else media_type
+            )
+            content = renderer.render(
+                response.data, media_type, {"request": request, "response": response}
+            )
+            rendered = (content_type, content)
+            self.set(key, version, media_type, *rendered)
+
+        content_type, content = rendered
+        return HttpResponse(content, content_type=content_type)
+
+
+detail_cache = RenderedResponseCache()
+
+
+def _on_detail_write(sender, instance, **kwargs) -> None:
+    """Signal receiver dropping the cached body of a written row."""
+    detail_cache.invalidate(sender._meta.label_lower, instance.pk)
+
+
+def track_detail_writes(model) -> None:
+    """Drop cached detail responses whenever a ``model`` row is written."""
+    uid = f"detail-cache:{model._meta.label_lower}"
+    post_save.connect(_on_detail_write, sender=model, dispatch_uid=uid)
+    post_delete.connect(_on_detail_write, sender=model, dispatch_uid=uid)
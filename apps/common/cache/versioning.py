@@ -0,0 +1,127 @@
+"""Per-profile version stamps for O(1) cache invalidation.
+
+Every cached aggregate embeds the current version of its ``WeddingProfile``
+in the cache key. Any write to a guest, task, vendor or the profile itself
+bumps that version, so stale entries are simply never read again and expire
+on their own instead of being searched for and deleted.
+"""
+
+import time
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.common.db.routers import mark_profiles_written
+
+DEFAULT_PROFILE_ID_FIELD = "wedding_profile_id"
+VERSION_KEY = "profile-version:{profile_id}"
+
+
+def _version_cache():
+    """Return the cache that stores profile version stamps."""
+    return caches[settings.AGGREGATE_CACHE_ALIAS]
+
+
+def _seed_version() -> int:
+    """Start versions from the clock so an evicted stamp never goes backwards."""
+    return time.time_ns() // 1_000_000
+
+
+def get_profile_version(profile_id: int) -> int:
+    """Return the current cache version for a wedding profile."""
+    cache = _version_cache()
+    key = VERSION_KEY.format(profile_id=profile_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _seed_version(), timeout=None)
+        version = cache.get(key)
+    return version if version is not None else _seed_version()
+
+
+def bump_profile_version(*profile_ids: int | None) -> None:
+    """Invalidate every cached aggregate of the given profiles."""
+    cache = _version_cache()
+    ids = {pid for pid in profile_ids if pid is not None}
+    for profile_id in ids:
+        key = VERSION_KEY.format(profile_id=profile_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _seed_version(), timeout=None)
+    mark_profiles_written(*ids)
+
+
+def profile_id_field(model) -> str:
+    """Return the attribute holding the owning profile id for ``model``."""
+    return getattr(model, "PROFILE_ID_FIELD", DEFAULT_PROFILE_ID_FIELD)
+
+
+def _bump_after_write(profile_ids: Iterable[int | None], using: str) -> None:
+    """Bump now, and again on commit so readers never cache uncommitted state."""
+    profile_ids = tuple(profile_ids)
+    bump_profile_version(*profile_ids)
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: bump_profile_version(*profile_ids), using=using)
+
+
+class ProfileScopedQuerySet(models.QuerySet):
+    """QuerySet that bumps profile versions on bulk and queryset writes.
+
+    ``update()``, ``delete()``, ``bulk_create()`` and ``bulk_update()`` bypass
+    model signals, so they report the affected profiles themselves.
+    """
+
+    def _affected_profile_ids(self) -> set[int]:
+        """Return the profile ids of every row matched by this queryset."""
+        field = profile_id_field(self.model)
+        return set(self.order_by().values_list(field, flat=True).distinct())
+
+    def update(self, **kwargs):
+        """Update matching rows and invalidate their profiles."""
+        profile_ids = self._affected_profile_ids()
+        rows = super().update(**kwargs)
+        if rows:
+            field = profile_id_field(self.model)
+            moved_to = kwargs.get(field, kwargs.get(field.removesuffix("_id")))
+            if isinstance(moved_to, models.Model):
+                moved_to = moved_to.pk
+            _bump_after_write([*profile_ids, moved_to], self.db)
+        return rows
+
+    def delete(self):
+        """Delete matching rows and invalidate their profiles."""
+        profile_ids = self._affected_profile_ids()
+        result = super().delete()
+        if result[0]:
+            _bump_after_write(profile_ids, self.db)
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Insert rows in bulk and invalidate their profiles."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        field = profile_id_field(self.model)
+        _bump_after_write({getattr(obj, field) for obj in objs}, self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """Update rows in bulk and invalidate their profiles."""
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        field = profile_id_field(self.model)
+        _bump_after_write({getattr(obj, field) for obj in objs}, self.db)
+        return rows
+
+
+def _on_instance_write(sender, instance, using, **kwargs) -> None:
+    """Signal receiver bumping the version of the instance's profile."""
+    _bump_after_write([getattr(instance, profile_id_field(sender))], using)
+
+
+def track_profile_writes(model) -> None:
+    """Invalidate the owning profile's cache whenever ``model`` is written."""
+    uid = f"profile-version:{model._meta.label_lower}"
+    post_save.connect(_on_instance_write, sender=model, dispatch_uid=uid)
+    post_delete.connect(_on_instance_write, sender=model, dispatch_uid=uid)
@@ -0,0 +1,51 @@
+"""System checks for settings that only break once several workers run."""
+
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+from django.utils.module_loading import import_string
+
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def is_process_local(alias: str) -> bool:
+    """Return whether cache ``alias`` is not shared between worker processes."""
+    backend = import_string(settings.CACHES[alias]["BACKEND"])
+    return issubclass(backend, PROCESS_LOCAL_CACHES)
+
+
+@register(Tags.caches, Tags.database)
+def check_replica_pin_cache(app_configs, **kwargs):
+    """Refuse read replicas when replica pins cannot be seen by every worker."""
+    if not settings.DATABASE_REPLICAS or not is_process_local("default"):
+        return []
+    return [
+        Error(
+            "Read replicas need a cache shared by all workers.",
+            hint="Replica pins are stored in the default cache; set "
+            "CACHE_BACKEND to file or redis, or remove DB_REPLICA_HOSTS.",
+            id="common.E001",
+        )
+    ]
+
+
+@register(Tags.caches)
+def check_profile_version_cache(app_configs, **kwargs):
+    """Require a shared cache for profile version stamps outside DEBUG."""
+    if (
+        settings.DEBUG
+        or not settings.AGGREGATE_CACHE_ENABLED
+        or not is_process_local(settings.AGGREGATE_CACHE_ALIAS)
+    ):
+        return []
+    return [
+        Error(
+            "Cached aggregates need a cache shared by all workers.",
+            hint="Profile version stamps in a per-process cache are not bumped "
+            "by writes on other workers, which then serve stale aggregates for "
+            "AGGREGATE_CACHE_TIMEOUT_SECONDS. Set CACHE_BACKEND to file or "
+            "redis, or AGGREGATE_CACHE_ENABLED to False.",
+            id="common.E002",
+        )
+    ]
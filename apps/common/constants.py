@@ -148,6 +148,8 @@ class ValidationLimits:
     MIN_BUDGET = 50000
     MAX_BUDGET = 10000000
 
+    MAX_GUESTS = 2000
+
     MIN_SERVICE_COST = 1000
     MAX_SERVICE_COST = 5000000
     MAX_HOURLY_RATE = 50000
@@ -0,0 +1 @@
+"""Database routing and connection utilities for the Wedding Planner API."""
@@ -0,0 +1 @@
+"""Database backends used by the Wedding Planner API."""
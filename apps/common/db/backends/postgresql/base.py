@@ -0,0 +1,96 @@
+"""PostgreSQL backend that borrows connections from a :class:`ConnectionPool`.
+
+Select it with ``ENGINE = "apps.common.db.backends.postgresql"`` and add a
+``"pool"`` dict to ``OPTIONS`` with any of ``min_size``, ``max_size``,
+``timeout``, ``max_idle``, ``max_lifetime`` and ``check``. Without ``"pool"``
+it behaves exactly like Django's backend. Pair the pool with
+``CONN_MAX_AGE = 0`` so every request hands its connection back when it ends.
+"""
+
+import functools
+
+from django.db.backends.postgresql import base
+from django.utils.asyncio import async_unsafe
+
+from apps.common.db.pool import ConnectionPool, get_pool
+
+# ``connection.info.transaction_status`` when no transaction is open; the
+# value is the same for psycopg2 and psycopg 3.
+TRANSACTION_STATUS_IDLE = 0
+
+
+def _rollback_if_in_transaction(connection) -> None:
+    """Leave ``connection`` outside any transaction."""
+    if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+def is_healthy(connection) -> bool:
+    """Return whether ``connection`` is open and answers a trivial query."""
+    if connection.closed:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    _rollback_if_in_transaction(connection)
+    return True
+
+
+def reset_connection(connection) -> None:
+    """Roll back whatever a request left open before the connection is reused."""
+    if connection.closed:
+        raise base.Database.InterfaceError("connection already closed")
+    _rollback_if_in_transaction(connection)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Django's PostgreSQL wrapper with pooled connections."""
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """Return the pool shared by every thread using this alias, if enabled."""
+        if not self.settings_dict["OPTIONS"].get("pool"):
+            return None
+        return get_pool(self.alias, self._create_pool)
+
+    def _create_pool(self) -> ConnectionPool:
+        """Build and pre-fill the pool from ``OPTIONS["pool"]``."""
+        options = dict(self.settings_dict["OPTIONS"]["pool"])
+        check = options.pop("check", self.settings_dict["CONN_HEALTH_CHECKS"])
+        # Connecting only touches the wrapper's isolation_level attribute,
+        # which every wrapper of this alias derives from the same OPTIONS.
+        connect = functools.partial(
+            base.DatabaseWrapper.get_new_connection,
+            self,
+            self.get_connection_params(),
+        )
+        pool = ConnectionPool(
+            connect,
+            name=self.alias,
+            check=is_healthy if check else None,
+            reset=reset_connection,
+            **options,
+        )
+        pool.fill()
+        return pool
+
+    def get_connection_params(self):
+        """Drop the pool options, which are not connection parameters."""
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        """Borrow a connection from the pool instead of opening one."""
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.acquire()
+
+    def _close(self):
+        """Return the connection to the pool instead of closing it."""
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.release(self.connection)
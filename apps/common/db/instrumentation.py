@@ -0,0 +1,57 @@
+"""Execute wrappers scoped to a request rather than to a thread.
+
+``connection.execute_wrapper()`` only affects the calling thread's
+connections, but under ASGI the middleware runs on the event loop while sync
+views run their queries on a worker thread. :func:`execute_wrapper` instead
+records the wrapper in a context variable, which asgiref copies into the
+thread running the view, and every connection carries one dispatcher,
+installed when it connects, that runs the wrappers of the current context.
+``CommonConfig.ready()`` imports this module so the dispatcher is in place
+before the first connection opens::
+
+    with execute_wrapper(stats):
+        response = await self.get_response(request)
+
+Wrappers entered first run outermost, as with Django's own.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_wrappers: ContextVar[tuple[Callable, ...]] = ContextVar("execute_wrappers", default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    """Run the statement through the wrappers active in this context."""
+    for wrapper in reversed(_wrappers.get()):
+        execute = partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install(connection, **kwargs) -> None:
+    """Add the dispatcher to ``connection``, once."""
+    if _dispatch not in connection.execute_wrappers:
+        # First in the list, so connection.execute_wrapper() blocks, which
+        # pop the last wrapper on exit, never remove it.
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+connection_created.connect(install, dispatch_uid="apps.common.db.instrumentation")
+
+
+@contextmanager
+def execute_wrapper(wrapper: Callable) -> Iterator[None]:
+    """Run ``wrapper`` around every query of this context, on any thread."""
+    # Connections of this thread that connected before the app was ready.
+    for connection in connections.all(initialized_only=True):
+        install(connection)
+    token = _wrappers.set((*_wrappers.get(), wrapper))
+    try:
+        yield
+    finally:
+        _wrappers.reset(token)
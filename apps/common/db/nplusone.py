@@ -0,0 +1,45 @@
+"""Detect N+1 queries: one statement shape executed over and over in a request.
+
+The usual cause is a serializer or loop touching a relation per row (for
+example a ``StringRelatedField`` without ``select_related``). Detection runs
+from ``RequestLoggingMiddleware`` on top of the request's :class:`QueryStats`;
+it warns by default and raises :class:`NPlusOneError` when
+``NPLUSONE_RAISE`` is on, which the test suite enables.
+"""
+
+from dataclasses import dataclass, field
+
+from .query_stats import QueryStats
+
+
+class NPlusOneError(Exception):
+    """Raised when a request repeats a query shape too many times."""
+
+
+@dataclass
+class RepeatedQuery:
+    """A statement shape executed more often than allowed in one request."""
+
+    shape: str
+    count: int
+    stack: list[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        """Return a multi-line description with the originating stack."""
+        lines = [f"{self.count}x {self.shape}"]
+        lines.extend(f"    {frame}" for frame in self.stack)
+        return "\n".join(lines)
+
+
+def find_repeated_queries(stats: QueryStats, threshold: int) -> list[RepeatedQuery]:
+    """Return the shapes executed more than ``threshold`` times, worst first."""
+    return [
+        RepeatedQuery(shape, count, stats.shape_stacks.get(shape, []))
+        for shape, count in stats.shapes.most_common()
+        if count > threshold
+    ]
+
+
+def format_report(repeated: list[RepeatedQuery]) -> str:
+    """Return a human-readable report of repeated queries."""
+    return "\n".join(query.describe() for query in repeated)
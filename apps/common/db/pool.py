@@ -0,0 +1,308 @@
+"""In-process database connection pool.
+
+Opening a PostgreSQL connection (TCP + TLS + authentication + backend fork)
+costs more than most queries this API runs. :class:`ConnectionPool` keeps a
+bounded set of open connections per database alias and hands them to request
+threads, recycling connections that sat idle or lived too long and dropping
+those that fail a health check. The PostgreSQL backend in
+``apps.common.db.backends.postgresql`` plugs it into Django.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from django.db import OperationalError
+
+from apps.common.metrics import registry
+
+pool_acquisitions = registry.counter(
+    "db_pool_acquisitions_total",
+    "Connection checkouts by database and outcome",
+    labelnames=("database", "result"),
+)
+pool_closed = registry.counter(
+    "db_pool_connections_closed_total",
+    "Pooled connections closed by database and reason",
+    labelnames=("database", "reason"),
+)
+pool_connections = registry.gauge(
+    "db_pool_connections",
+    "Pooled connections by database and state",
+    labelnames=("database", "state"),
+)
+
+_pools: dict[str, "ConnectionPool"] = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    """Raised when no connection becomes available within the timeout."""
+
+
+class _PooledConnection:
+    """Open connection plus the timestamps used to recycle it."""
+
+    def __init__(self, connection: Any):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """Thread-safe pool of database connections.
+
+    Args:
+        connect: Opens a new connection.
+        name: Database alias, used for metrics.
+        min_size: Connections kept open even when idle.
+        max_size: Upper bound on open connections.
+        timeout: Seconds ``acquire()`` waits for a free connection.
+        max_idle: Seconds an idle connection above ``min_size`` is kept.
+        max_lifetime: Seconds after which any connection is replaced.
+        check: Returns whether a reused connection is still healthy.
+        reset: Cleans a returned connection; raising discards it.
+        close: Closes a connection.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        name: str = "default",
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        max_idle: float = 300.0,
+        max_lifetime: float = 3600.0,
+        check: Callable[[Any], bool] | None = None,
+        reset: Callable[[Any], None] | None = None,
+        close: Callable[[Any], None] | None = None,
+    ):
+        """Create an empty pool; call :meth:`fill` to open ``min_size``."""
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size")
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self._connect = connect
+        self._check = check
+        self._reset = reset
+        self._close_connection = close or (lambda connection: connection.close())
+        self._idle: deque[_PooledConnection] = deque()
+        self._in_use: dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def fill(self) -> None:
+        """Open connections until the pool holds ``min_size``."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                entry = _PooledConnection(self._connect())
+            except BaseException:
+                self._forget()
+                raise
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def acquire(self) -> Any:
+        """Return a healthy connection, opening one if the pool has room.
+
+        Raises:
+            PoolTimeout: If ``max_size`` connections stay busy for ``timeout``.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            entry = self._checkout(deadline)
+            if entry is None:
+                try:
+                    entry = _PooledConnection(self._connect())
+                except BaseException:
+                    self._forget()
+                    raise
+                result = "created"
+            elif self._check is not None and not self._healthy(entry):
+                self._discard(entry, "broken")
+                continue
+            else:
+                result = "reused"
+
+            entry.last_used = time.monotonic()
+            with self._cond:
+                self._in_use[id(entry.connection)] = entry
+            pool_acquisitions.inc(database=self.name, result=result)
+            return entry.connection
+
+    def release(self, connection: Any) -> None:
+        """Return ``connection`` to the pool, or close it if it is unusable."""
+        with self._cond:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            self._close_quietly(connection)
+            return
+
+        if self._closed:
+            self._discard(entry, "shutdown")
+            return
+        if time.monotonic() - entry.created_at > self.max_lifetime:
+            self._discard(entry, "lifetime")
+            return
+        if self._reset is not None:
+            try:
+                self._reset(connection)
+            except Exception:
+                self._discard(entry, "broken")
+                return
+
+        entry.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close idle connections; busy ones are closed when released."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry, "shutdown")
+
+    def stats(self) -> dict[str, int]:
+        """Return the pool's current occupancy."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": self._waiting,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+    def _checkout(self, deadline: float) -> _PooledConnection | None:
+        """Take an idle connection, or reserve room for a new one (``None``)."""
+        expired: list[tuple[_PooledConnection, str]] = []
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise OperationalError(f"Connection pool {self.name} is closed")
+                    now = time.monotonic()
+                    # Trim from the least recently used end so stale
+                    # connections do not linger behind busy ones.
+                    while self._idle:
+                        reason = self._expiry_reason(self._idle[0], now)
+                        if reason is None:
+                            break
+                        expired.append((self._idle.popleft(), reason))
+                        self._size -= 1
+                    # Hand out the most recently used connection: it is the
+                    # least likely to have been dropped by the server.
+                    while self._idle:
+                        entry = self._idle.pop()
+                        if now - entry.created_at <= self.max_lifetime:
+                            return entry
+                        expired.append((entry, "lifetime"))
+                        self._size -= 1
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        pool_acquisitions.inc(database=self.name, result="timeout")
+                        raise PoolTimeout(
+                            f"No connection available in pool {self.name} "
+                            f"after {self.timeout}s"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+        finally:
+            for entry, reason in expired:
+                self._retire(entry, reason)
+
+    def _expiry_reason(self, entry: _PooledConnection, now: float) -> str | None:
+        """Return why an idle connection should be closed, if it should."""
+        if now - entry.created_at > self.max_lifetime:
+            return "lifetime"
+        if now - entry.last_used > self.max_idle and self._size > self.min_size:
+            return "idle"
+        return None
+
+    def _healthy(self, entry: _PooledConnection) -> bool:
+        """Run the health check, treating errors as an unhealthy connection."""
+        try:
+            return bool(self._check and self._check(entry.connection))
+        except Exception:
+            return False
+
+    def _discard(self, entry: _PooledConnection, reason: str) -> None:
+        """Close a pooled connection and free its slot."""
+        self._retire(entry, reason)
+        self._forget()
+
+    def _retire(self, entry: _PooledConnection, reason: str) -> None:
+        """Close a connection whose slot has already been freed."""
+        self._close_quietly(entry.connection)
+        pool_closed.inc(database=self.name, reason=reason)
+
+    def _forget(self) -> None:
+        """Free one slot and wake a waiter."""
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _close_quietly(self, connection: Any) -> None:
+        """Close ``connection``, ignoring errors from an already dead socket."""
+        try:
+            self._close_connection(connection)
+        except Exception:
+            pass
+
+
+def get_pool(alias: str, factory: Callable[[], ConnectionPool]) -> ConnectionPool:
+    """Return the pool for ``alias``, creating it with ``factory`` once."""
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = factory()
+    return pool
+
+
+def close_pools() -> None:
+    """Close and forget every pool (used at shutdown and by tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _collect_pool_stats() -> None:
+    """Publish the occupancy of every pool as gauges."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        stats = pool.stats()
+        for state in ("idle", "in_use", "waiting"):
+            pool_connections.set(stats[state], database=pool.name, state=state)
+
+
+registry.add_collector(_collect_pool_stats)
@@ -0,0 +1,86 @@
+"""Inspect PostgreSQL query plans.
+
+:func:`explain` runs ``EXPLAIN (FORMAT JSON)`` on a statement and returns the
+root plan node; :func:`outline` reduces a plan to one line per node (node type,
+relation and index, without costs or row estimates), which is stable enough to
+record and diff; :func:`scans` lists the table accesses so tests can assert
+that hot queries use an index rather than a sequential scan.
+"""
+
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from django.db import connections
+
+INDEX_SCANS = frozenset({"Index Scan", "Index Only Scan", "Bitmap Heap Scan"})
+
+
+@dataclass(frozen=True)
+class Scan:
+    """One access to a table in a plan."""
+
+    node_type: str
+    relation: str
+    index: str | None = None
+
+    @property
+    def uses_index(self) -> bool:
+        """Return whether the table is read through an index."""
+        return self.node_type in INDEX_SCANS
+
+
+def explain(sql: str, params=None, using: str = "default") -> dict:
+    """Return the root node of the plan PostgreSQL chooses for ``sql``."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        result = cursor.fetchone()[0]
+    # psycopg2 decodes json columns; other drivers may return text.
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def walk(node: dict) -> Iterator[dict]:
+    """Yield ``node`` and its descendants, depth first."""
+    yield node
+    for child in node.get("Plans", ()):
+        yield from walk(child)
+
+
+def scans(plan: dict) -> list[Scan]:
+    """Return every table access in ``plan``.
+
+    A Bitmap Heap Scan reports the relation and its Bitmap Index Scan child
+    the index, so the two are merged into one access.
+    """
+    result = []
+    for node in walk(plan):
+        relation = node.get("Relation Name")
+        if relation is None:
+            continue
+        index = node.get("Index Name")
+        if index is None and node["Node Type"] == "Bitmap Heap Scan":
+            index = next(
+                (
+                    child["Index Name"]
+                    for child in walk(node)
+                    if child["Node Type"] == "Bitmap Index Scan"
+                ),
+                None,
+            )
+        result.append(Scan(node["Node Type"], relation, index))
+    return result
+
+
+def outline(plan: dict, depth: int = 0) -> list[str]:
+    """Return ``plan`` as indented lines of node type, relation and index."""
+    line = "  " * depth + plan["Node Type"]
+    if "Index Name" in plan:
+        line += f" using {plan['Index Name']}"
+    if "Relation Name" in plan:
+        line += f" on {plan['Relation Name']}"
+    lines = [line]
+    for child in plan.get("Plans", ()):
+        lines.extend(outline(child, depth + 1))
+    return lines
@@ -0,0 +1,127 @@
+"""Per-request database query statistics.
+
+:func:`collect_query_stats` runs a :class:`QueryStats` execute wrapper around
+every query of the block, including those a sync view runs on a worker thread
+under ASGI (see :mod:`apps.common.db.instrumentation`), so request logging can
+tell whether a slow request was spent in SQL, and whether it repeated the
+same statement (the usual sign of an N+1 query).
+
+With ``track_shapes`` on, statements are also grouped by their normalized
+shape (literals, ``IN`` lists and SQL comments removed), and the Python stack
+that first repeated each shape is kept, for :mod:`apps.common.db.nplusone`.
+"""
+
+import re
+import time
+import traceback
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+from .instrumentation import execute_wrapper
+
+SLOWEST_SQL_MAX_LENGTH = 200
+STACK_MAX_FRAMES = 8
+
+_SHAPE_PATTERNS = (
+    (re.compile(r"/\*.*?\*/", re.DOTALL), ""),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s|\?"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+)
+# Frames from these packages are plumbing, not the code that issued a query.
+_INTERNAL_PATHS = ("apps/common/db/", "apps/common/middleware/")
+
+
+def normalize_sql(sql: str) -> str:
+    """Return the shape of ``sql``: the statement with its values removed."""
+    for pattern, replacement in _SHAPE_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def caller_stack(max_frames: int = STACK_MAX_FRAMES) -> list[str]:
+    """Return the project frames of the current stack, innermost last."""
+    root = str(Path(settings.BASE_DIR))
+    frames = [
+        f"{frame.filename}:{frame.lineno} in {frame.name}"
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(root)
+        and "site-packages" not in frame.filename
+        and not any(path in frame.filename for path in _INTERNAL_PATHS)
+    ]
+    return frames[-max_frames:]
+
+
+class QueryStats:
+    """Execute wrapper that counts and times the queries it sees."""
+
+    def __init__(self, track_shapes: bool = False):
+        """Start with no recorded queries."""
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = ""
+        self.statements: Counter[str] = Counter()
+        self.track_shapes = track_shapes
+        self.shapes: Counter[str] = Counter()
+        self.shape_stacks: dict[str, list[str]] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run the query and record how long it took."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.perf_counter() - start)
+
+    def record(self, sql: str, elapsed: float) -> None:
+        """Add one executed statement to the totals."""
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[sql] += 1
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_sql = sql
+        if self.track_shapes:
+            shape = normalize_sql(sql)
+            self.shapes[shape] += 1
+            if self.shapes[shape] == 2:
+                # The first repeat is where a loop starts issuing the query.
+                self.shape_stacks[shape] = caller_stack()
+
+    @property
+    def duplicates(self) -> int:
+        """Return how many executions repeated an earlier statement."""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def as_log_data(self) -> dict[str, Any]:
+        """Return the statistics as ``extra=`` fields for a log record."""
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_time * 1000, 2),
+            "db_slowest_ms": round(self.slowest_time * 1000, 2),
+            "db_slowest_sql": self.slowest_sql[:SLOWEST_SQL_MAX_LENGTH],
+            "db_duplicates": self.duplicates,
+        }
+
+    def server_timing(self) -> str:
+        """Return a ``Server-Timing`` header entry for the SQL time."""
+        return (
+            f'db;dur={self.total_time * 1000:.2f};desc="{self.count} queries, '
+            f'{self.duplicates} duplicates"'
+        )
+
+
+@contextmanager
+def collect_query_stats(track_shapes: bool = False) -> Iterator[QueryStats]:
+    """Record every query run on any database inside the block."""
+    stats = QueryStats(track_shapes)
+    with execute_wrapper(stats):
+        yield stats
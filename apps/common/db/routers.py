@@ -0,0 +1,148 @@
+"""Read-replica routing with read-your-writes stickiness.
+
+Read-heavy views opt in with :func:`read_from_replica`; every query they run
+is sent to a healthy replica from ``settings.DATABASE_REPLICAS``. All other
+code, and every write, keeps using the ``default`` primary. After a user
+writes, :class:`~apps.common.middleware.ReplicaPinningMiddleware` pins them
+to the primary for ``REPLICA_PIN_SECONDS`` so they always read their own
+changes even if a replica lags behind.
+
+Pins live in the default cache, which every worker must share; the
+``common.E001`` system check refuses replicas with a per-process cache. Each
+write also marks its wedding profile as recently written for the same
+window, so aggregates computed from a possibly lagging replica during it are
+not cached for everyone else (see :mod:`apps.common.cache.aggregates`).
+"""
+
+import functools
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.connection import ConnectionDoesNotExist
+
+PIN_KEY = "replica-pin:{user_id}"
+PROFILE_WRITE_KEY = "replica-write:{profile_id}"
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+_unavailable_until: dict[str, float] = {}
+_health_lock = threading.Lock()
+
+
+def replicas_configured() -> bool:
+    """Return whether any read replica is configured."""
+    return bool(settings.DATABASE_REPLICAS)
+
+
+def pin_to_primary(user_id) -> None:
+    """Send ``user_id``'s reads to the primary for the pin window."""
+    cache.set(PIN_KEY.format(user_id=user_id), 1, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user_id) -> bool:
+    """Return whether ``user_id`` wrote recently and must read the primary."""
+    return cache.get(PIN_KEY.format(user_id=user_id)) is not None
+
+
+def mark_profiles_written(*profile_ids: int) -> None:
+    """Record that ``profile_ids`` changed, for the pin window."""
+    if not replicas_configured() or not profile_ids:
+        return
+    cache.set_many(
+        {PROFILE_WRITE_KEY.format(profile_id=pid): 1 for pid in profile_ids},
+        settings.REPLICA_PIN_SECONDS,
+    )
+
+
+def profile_written_recently(profile_id: int) -> bool:
+    """Return whether a replica may not have caught up with ``profile_id`` yet."""
+    return cache.get(PROFILE_WRITE_KEY.format(profile_id=profile_id)) is not None
+
+
+def reading_from_replica() -> bool:
+    """Return whether reads in this context are routed to replicas."""
+    return _replica_reads.get()
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Route reads issued inside the block to a replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_from_replica(view_func):
+    """Serve a read-only view from a replica unless the user is pinned.
+
+    Apply it directly above the view function (below ``@api_view``) so DRF
+    has already authenticated ``request.user`` against the primary.
+    """
+
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not replicas_configured() or is_pinned_to_primary(request.user.pk):
+            return view_func(request, *args, **kwargs)
+        with replica_reads():
+            return view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+def is_available(alias: str) -> bool:
+    """Return whether ``alias`` accepts connections.
+
+    A replica that fails to connect is skipped for ``REPLICA_RETRY_SECONDS``
+    so requests do not each pay for a connection timeout.
+    """
+    if _unavailable_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except (ConnectionDoesNotExist, DatabaseError):
+        with _health_lock:
+            _unavailable_until[alias] = (
+                time.monotonic() + settings.REPLICA_RETRY_SECONDS
+            )
+        return False
+    return True
+
+
+class ReplicaRouter:
+    """Route opted-in reads to replicas and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        """Pick a healthy replica inside :func:`replica_reads`, else primary."""
+        if not _replica_reads.get():
+            return None
+        candidates = list(settings.DATABASE_REPLICAS)
+        random.shuffle(candidates)
+        for alias in candidates:
+            if is_available(alias):
+                return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        """Always write to the primary."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations between rows of the primary and its replicas."""
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Only migrate the primary; replicas follow through replication."""
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,92 @@
+"""Tag SQL statements with the request that issued them.
+
+:func:`tag_queries` appends a sqlcommenter-style comment to every statement
+run inside a block::
+
+    SELECT ... /*app='guests',request_id='1f2e3d4c',route='list_guests'*/
+
+so a slow query in ``pg_stat_statements`` or the PostgreSQL slow-query log can
+be traced back to the endpoint and the request log line that issued it.
+
+The comment goes after the statement and is identical for every statement of
+a request. PostgreSQL computes ``pg_stat_statements`` query ids from the parse
+tree, so comments do not split its statistics. Client-side statement caches
+keyed by SQL text (psycopg 3 prepared statements, sqlite3) still reuse
+statements within a request, but not across requests while the request id is
+included; set ``SQL_COMMENT_REQUEST_ID`` off where that matters.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from django.http import HttpRequest
+
+from .instrumentation import execute_wrapper
+
+
+def format_comment(tags: dict[str, str]) -> str:
+    """Return ``tags`` as a sqlcommenter comment (sorted, URL-encoded values)."""
+    pairs = ",".join(
+        f"{key}='{quote(str(value), safe='')}'"
+        for key, value in sorted(tags.items())
+        if value
+    )
+    return f"/*{pairs}*/" if pairs else ""
+
+
+class SQLCommenter:
+    """Execute wrapper that appends the request's tags to each statement.
+
+    The tags are read when a statement runs, because the URL is only resolved
+    after the middleware that installs the wrapper has started.
+    """
+
+    def __init__(self, request: HttpRequest, include_request_id: bool = True):
+        """Tag statements run on behalf of ``request``."""
+        self.request = request
+        self.include_request_id = include_request_id
+        self._comment: str | None = None
+
+    def tags(self) -> dict[str, str]:
+        """Return the tags describing the request."""
+        tags = {}
+        if self.include_request_id:
+            tags["request_id"] = getattr(self.request, "request_id", "")
+        match = getattr(self.request, "resolver_match", None)
+        if match is not None:
+            tags["route"] = match.url_name or ""
+            tags["app"] = match.app_name or ""
+        return tags
+
+    def comment(self) -> str:
+        """Return the comment, cached once the URL has been resolved."""
+        if self._comment is not None:
+            return self._comment
+        comment = format_comment(self.tags())
+        if getattr(self.request, "resolver_match", None) is not None:
+            self._comment = comment
+        return comment
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run the statement with the comment appended."""
+        # Leave statements that already carry a comment (or are not plain
+        # strings, such as psycopg2 sql.Composed objects) untouched.
+        if isinstance(sql, str) and "*/" not in sql:
+            comment = self.comment()
+            if comment:
+                sql = f"{sql} {comment}"
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def tag_queries(
+    request: HttpRequest, include_request_id: bool = True
+) -> Iterator[SQLCommenter]:
+    """Comment every statement run on any database inside the block.
+
+    This includes statements a sync view runs on a worker thread under ASGI.
+    """
+    commenter = SQLCommenter(request, include_request_id)
+    with execute_wrapper(commenter):
+        yield commenter
@@ -23,4 +23,4 @@ class LoggingConstants:
 
     REQUEST_ID_LENGTH = 8
     ALWAYS_LOG_METHODS: set[str] = {"POST", "PUT", "PATCH", "DELETE"}
-    EXCLUDED_PATHS: set[str] = {"/health/", "/admin/jsi18n/"}
+    EXCLUDED_PATHS: set[str] = {"/health/", "/metrics", "/admin/jsi18n/"}
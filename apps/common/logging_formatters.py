@@ -0,0 +1,39 @@
+"""Log formatters for the Wedding Planner API."""
+
+import json
+import logging
+from datetime import UTC, datetime
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``.
+RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None))
+) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line.
+
+    The object holds the timestamp, level, logger and message, followed by
+    every field passed through ``extra=`` (``request_id``, ``status_code``,
+    ``duration_ms``, ``user_id`` and so on), so log pipelines can filter and
+    aggregate on them without parsing the message.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render ``record`` as a single-line JSON object."""
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=UTC).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, default=str, separators=(",", ":"))
@@ -0,0 +1,195 @@
+"""Logging handlers that keep log I/O off the request path.
+
+Loggers write to :class:`QueueHandler`, which only copies the record onto an
+in-memory queue. A background :class:`logging.handlers.QueueListener` thread
+takes records off the queue and runs the real handlers (console, rotating
+file), so a slow disk or terminal never adds to request latency.
+"""
+
+import atexit
+import copy
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+
+from apps.common.metrics import registry
+
+log_records = registry.counter(
+    "log_records_total",
+    "Log records handed to a queue handler by outcome",
+    labelnames=("handler", "outcome"),
+)
+
+OVERFLOW_POLICIES = ("drop_new", "drop_oldest", "block")
+
+_exception_formatter = logging.Formatter()
+
+
+def _handler_by_name(name: str) -> logging.Handler:
+    """Return a handler configured through ``LOGGING`` by its name."""
+    # logging.getHandlerByName() only exists from Python 3.12.
+    handler = logging._handlers.get(name)  # type: ignore[attr-defined]
+    if handler is None:
+        # dictConfig retries handlers failing with this message once every
+        # other handler has been configured.
+        raise ValueError(f"Logging handler {name!r}: target not configured yet")
+    return handler
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Queue records for a background thread that runs the named handlers.
+
+    Args:
+        handlers: Names of handlers in ``LOGGING`` that write the records.
+        maxsize: Records buffered before ``overflow`` applies.
+        overflow: ``"drop_new"`` discards records that do not fit,
+            ``"drop_oldest"`` evicts the oldest buffered record to make room,
+            and ``"block"`` waits for room (never loses records).
+    """
+
+    def __init__(
+        self, handlers: list[str], maxsize: int = 10_000, overflow: str = "drop_new"
+    ):
+        """Create the queue; the listener starts with the first record."""
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        super().__init__(queue.Queue(maxsize))
+        # Hold strong references: the logging module only keeps weak ones to
+        # handlers that no logger uses directly.
+        self.handlers = [_handler_by_name(name) for name in handlers]
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._listener: logging.handlers.QueueListener | None = None
+        self._pid: int | None = None
+        self._lock_listener = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue ``record`` without doing any I/O on the calling thread."""
+        try:
+            self._ensure_listener()
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Make ``record`` safe to hand to another thread.
+
+        Unlike the stdlib version this keeps the traceback in ``exc_text``
+        instead of folding it into the message, so formatters on the listener
+        thread can still render it separately.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put ``record`` on the queue, applying the overflow policy."""
+        name = self.name or "queue"
+        if self.overflow == "block":
+            self.queue.put(record)
+            log_records.inc(handler=name, outcome="queued")
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == "drop_new":
+                log_records.inc(handler=name, outcome="dropped")
+                return
+            try:
+                self.queue.get_nowait()
+                log_records.inc(handler=name, outcome="dropped")
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                log_records.inc(handler=name, outcome="dropped")
+                return
+        log_records.inc(handler=name, outcome="queued")
+
+    def _ensure_listener(self) -> None:
+        """Start the listener once per process (again after a fork)."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock_listener:
+            if self._pid == pid:
+                return
+            # A listener thread does not survive fork(); start a fresh one
+            # with a fresh queue in the child.
+            self.queue = queue.Queue(self.maxsize)
+            self._listener = logging.handlers.QueueListener(
+                self.queue, *self.handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            self._pid = pid
+            atexit.register(self.stop_listener)
+
+    def stop_listener(self) -> None:
+        """Write out every queued record and stop the listener thread."""
+        with self._lock_listener:
+            listener, self._listener = self._listener, None
+            self._pid = None
+        if listener is not None:
+            listener.stop()
+
+    def close(self) -> None:
+        """Flush the queue before closing."""
+        self.stop_listener()
+        super().close()
+
+
+def _gzip_namer(name: str) -> str:
+    """Name rotated files with a ``.gz`` suffix."""
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compress the rotated log file into ``dest``."""
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _make_parent(filename: str) -> None:
+    """Create the directory ``filename`` is in, if it does not exist."""
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+
+class GzipRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-based rotating file handler that gzips rotated files."""
+
+    def __init__(self, *args, **kwargs):
+        """Accept the same arguments as ``RotatingFileHandler``."""
+        super().__init__(*args, **kwargs)
+        self.namer = _gzip_namer
+        self.rotator = _gzip_rotator
+
+    def _open(self):
+        """Open the log file, creating its directory on first use."""
+        _make_parent(self.baseFilename)
+        return super()._open()
+
+
+class GzipTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Time-based rotating file handler that gzips rotated files."""
+
+    def __init__(self, *args, **kwargs):
+        """Accept the same arguments as ``TimedRotatingFileHandler``."""
+        super().__init__(*args, **kwargs)
+        self.namer = _gzip_namer
+        self.rotator = _gzip_rotator
+
+    def _open(self):
+        """Open the log file, creating its directory on first use."""
+        _make_parent(self.baseFilename)
+        return super()._open()
@@ -0,0 +1,107 @@
+"""Compare WSGI and ASGI request throughput under concurrent load.
+
+Both handlers run in-process through Django's test clients, so the numbers
+isolate the request/middleware/view path from any particular web server:
+WSGI requests are issued from a pool of threads, like a threaded WSGI
+server, and ASGI requests as concurrent tasks on one event loop::
+
+    python manage.py benchmark_asgi --path /api/v1/guests/list/ --username alice
+
+Sync DRF views are executed one at a time per process under ASGI, so expect
+WSGI to win on database-bound endpoints until the views themselves are async.
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class Command(BaseCommand):
+    help = "Benchmark request throughput through the WSGI and ASGI handlers."
+
+    def add_arguments(self, parser):
+        """Register the workload options."""
+        parser.add_argument("--path", default="/health/")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--username", help="Authenticate requests as this user with a JWT."
+        )
+
+    def handle(self, *args, **options):
+        """Run the workload through both handlers and print a table."""
+        headers = {}
+        if options["username"]:
+            user = get_user_model().objects.filter(username=options["username"])
+            if not user.exists():
+                raise CommandError(f"Unknown user {options['username']!r}")
+            token = AccessToken.for_user(user.get())
+            headers["authorization"] = f"Bearer {token}"
+
+        self.stdout.write(
+            f"{'handler':<10}{'mean ms':>10}{'p50 ms':>10}"
+            f"{'p95 ms':>10}{'req/s':>10}{'errors':>8}"
+        )
+        # The test clients send requests for the "testserver" host.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for handler, run in (("wsgi", self._run_wsgi), ("asgi", self._run_asgi)):
+                started = time.perf_counter()
+                results = run(options, headers)
+                elapsed = time.perf_counter() - started
+                self._report(handler, results, elapsed)
+
+    def _run_wsgi(self, options, headers) -> list[tuple[float, int]]:
+        """Issue the requests from ``concurrency`` threads."""
+        concurrency = options["concurrency"]
+        per_thread = max(1, options["requests"] // concurrency)
+
+        def worker() -> list[tuple[float, int]]:
+            client = Client()
+            results = []
+            for _ in range(per_thread):
+                started = time.perf_counter()
+                response = client.get(options["path"], headers=headers)
+                results.append((time.perf_counter() - started, response.status_code))
+            return results
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+            return [result for future in futures for result in future.result()]
+
+    def _run_asgi(self, options, headers) -> list[tuple[float, int]]:
+        """Issue the requests as ``concurrency`` tasks on one event loop."""
+
+        async def worker(client, count) -> list[tuple[float, int]]:
+            results = []
+            for _ in range(count):
+                started = time.perf_counter()
+                response = await client.get(options["path"], headers=headers)
+                results.append((time.perf_counter() - started, response.status_code))
+            return results
+
+        async def main() -> list[tuple[float, int]]:
+            concurrency = options["concurrency"]
+            per_task = max(1, options["requests"] // concurrency)
+            batches = await asyncio.gather(
+                *(worker(AsyncClient(), per_task) for _ in range(concurrency))
+            )
+            return [result for batch in batches for result in batch]
+
+        return asyncio.run(main())
+
+    def _report(self, handler, results, elapsed) -> None:
+        """Print one row of the results table."""
+        ms = sorted(latency * 1000 for latency, _ in results)
+        errors = sum(1 for _, status_code in results if status_code >= 400)
+        cuts = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+        self.stdout.write(
+            f"{handler:<10}{statistics.fmean(ms):>10.2f}{cuts[49]:>10.2f}"
+            f"{cuts[94]:>10.2f}{len(ms) / elapsed:>10.0f}{errors:>8}"
+        )
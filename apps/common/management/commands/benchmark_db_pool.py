@@ -0,0 +1,116 @@
+"""Compare per-request database latency with and without connection pooling.
+
+Each simulated request runs one query and then goes through Django's
+end-of-request connection handling, so the numbers include whatever the
+connection strategy costs: a fresh connect, a health-check ping on a
+persistent connection, or a checkout from the pool. Run it against a local
+PostgreSQL::
+
+    python manage.py benchmark_db_pool --requests 2000 --concurrency 8
+"""
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.common.db.pool import close_pools
+
+DJANGO_BACKEND = "django.db.backends.postgresql"
+POOLED_BACKEND = "apps.common.db.backends.postgresql"
+
+
+class Command(BaseCommand):
+    help = "Benchmark request latency with fresh, persistent and pooled connections."
+
+    def add_arguments(self, parser):
+        """Register the workload options."""
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--query", default="SELECT 1")
+
+    def handle(self, *args, **options):
+        """Run the workload once per connection strategy and print a table."""
+        base = connections.settings.get(options["database"])
+        if base is None:
+            raise CommandError(f"Unknown database {options['database']!r}")
+        if base["ENGINE"] not in (DJANGO_BACKEND, POOLED_BACKEND):
+            raise CommandError("The connection benchmark needs PostgreSQL")
+
+        concurrency = options["concurrency"]
+        plain_options = {k: v for k, v in base["OPTIONS"].items() if k != "pool"}
+        strategies = {
+            "fresh": {"ENGINE": DJANGO_BACKEND, "CONN_MAX_AGE": 0},
+            "persistent": {
+                "ENGINE": DJANGO_BACKEND,
+                "CONN_MAX_AGE": 600,
+                "CONN_HEALTH_CHECKS": True,
+            },
+            "pooled": {
+                "ENGINE": POOLED_BACKEND,
+                "CONN_MAX_AGE": 0,
+                "OPTIONS": {
+                    **plain_options,
+                    "pool": {"min_size": concurrency, "max_size": concurrency},
+                },
+            },
+        }
+
+        self.stdout.write(
+            f"{'strategy':<12}{'mean ms':>10}{'p50 ms':>10}"
+            f"{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+        )
+        try:
+            for strategy, overrides in strategies.items():
+                alias = f"benchmark_{strategy}"
+                connections.settings[alias] = {
+                    **base,
+                    "OPTIONS": plain_options,
+                    **overrides,
+                }
+                started = time.perf_counter()
+                latencies = self._run(alias, options)
+                elapsed = time.perf_counter() - started
+                self._report(strategy, latencies, elapsed)
+        finally:
+            close_pools()
+
+    def _run(self, alias, options) -> list[float]:
+        """Spread the requests over ``concurrency`` threads."""
+        concurrency = options["concurrency"]
+        per_thread = max(1, options["requests"] // concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(self._worker, alias, options["query"], per_thread)
+                for _ in range(concurrency)
+            ]
+            return [latency for future in futures for latency in future.result()]
+
+    def _worker(self, alias, query, count) -> list[float]:
+        """Issue ``count`` requests from one thread and time each of them."""
+        connection = connections[alias]
+        latencies = []
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                with connection.cursor() as cursor:
+                    cursor.execute(query)
+                    cursor.fetchall()
+                # What the request_finished signal does after every response.
+                connection.close_if_unusable_or_obsolete()
+                latencies.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+        return latencies
+
+    def _report(self, strategy, latencies, elapsed) -> None:
+        """Print one row of the results table."""
+        ms = sorted(latency * 1000 for latency in latencies)
+        cuts = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+        self.stdout.write(
+            f"{strategy:<12}{statistics.fmean(ms):>10.2f}{cuts[49]:>10.2f}"
+            f"{cuts[94]:>10.2f}{cuts[98]:>10.2f}{len(ms) / elapsed:>10.0f}"
+        )
@@ -0,0 +1,680 @@
+"""Benchmark every named URL in-process and fail on regressions.
+
+Runs without a server or network: each size's data is seeded into a
+throwaway test database and every URL name in ``config/urls.py`` is requested
+through Django's test client. Per endpoint and size the command records the
+best and median wall time over ``--iterations`` requests, the number of SQL
+queries and the peak memory allocated while handling the request (measured
+with ``tracemalloc`` in a separate, untimed run)::
+
+    python manage.py benchmark_endpoints --update-baseline
+    python manage.py benchmark_endpoints --sizes small medium
+
+The first command writes ``benchmarks/baseline.json``; later runs compare
+against it and exit non-zero when an endpoint got slower, allocates more
+memory or issues more queries than the thresholds allow. Times are compared
+on the best run, which is far less sensitive to scheduling noise than the
+median. Query counts are exact; wall time and memory are only comparable
+between runs on the same machine, so commit a baseline recorded on the
+machine that checks it.
+
+Caches are swapped for a private local-memory cache that is cleared before
+every request, so each measurement is a cold, cache-miss request. Use
+``--in-place`` where the database user cannot create databases: the data is
+then seeded into the configured database inside a transaction that is rolled
+back at the end.
+
+By default the benchmarked couples are alone in the database, so every query
+reads most of its table. ``--background N`` first seeds N other weddings and
+runs ``ANALYZE``, which is what production tables look like and what indexes
+are for::
+
+    python manage.py benchmark_endpoints --background 500 --sizes medium
+"""
+
+import json
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.common.benchmarking import git_commit
+from apps.common.constants import RSVPStatus, TaskAssignment, VendorCategory
+from apps.common.schema import current_schema
+from apps.common.seeding import (
+    SeededWedding,
+    scratch_database,
+    seed_wedding,
+    seed_weddings,
+)
+from apps.guests.models import Guest
+from apps.tasks.models import Task
+from apps.vendors.models import Vendor
+
+# Guests, tasks and vendors seeded for each size. The largest guest list
+# leaves room under ValidationLimits.MAX_GUESTS for the guests created while
+# benchmarking.
+SIZES = {
+    "small": {"guests": 10, "tasks": 5, "vendors": 3},
+    "medium": {"guests": 200, "tasks": 50, "vendors": 15},
+    "large": {"guests": 1500, "tasks": 300, "vendors": 60},
+}
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+PASSWORD = "Benchmark@Passw0rd"
+METRICS_TOKEN = "benchmark"
+# URL namespaces that are not part of the API.
+IGNORED_NAMESPACES = ("admin",)
+
+
+@dataclass
+class Call:
+    """One request to benchmark: where to send it, as whom, with what body."""
+
+    path: str
+    user: object | None = None
+    data: dict | None = None
+    headers: dict[str, str] | None = None
+
+
+class Fixture:
+    """A seeded couple plus helpers creating fresh objects for each request.
+
+    Requests that consume what they act on (deletes, registrations, profile
+    creation) get a new object from these helpers before every iteration, so
+    each iteration does the same work.
+    """
+
+    def __init__(self, wedding: SeededWedding, rng: random.Random, prefix: str):
+        """Wrap ``wedding``, naming created objects with ``prefix``."""
+        self.wedding = wedding
+        self.rng = rng
+        self.prefix = prefix
+        self._counter = 0
+
+    @property
+    def owner(self):
+        """Return the seeded couple's user."""
+        return self.wedding.user
+
+    def unique(self, stem: str) -> str:
+        """Return a name that has not been used in this run."""
+        self._counter += 1
+        return f"{self.prefix}-{stem}-{self._counter}"
+
+    def new_user(self):
+        """Create a user without a wedding profile."""
+        return get_user_model().objects.create_user(
+            username=self.unique("user"), password=PASSWORD
+        )
+
+    def new_couple(self):
+        """Create a user with an empty wedding profile."""
+        return seed_wedding(
+            self.unique("couple"), guests=0, tasks=0, vendors=0, rng=self.rng
+        ).user
+
+    def new_guest(self) -> Guest:
+        """Create a guest on the seeded wedding."""
+        return Guest.objects.create(
+            wedding_profile=self.wedding.profile, name="Wanjiru Kamau"
+        )
+
+    def new_task(self) -> Task:
+        """Create a task on the seeded wedding."""
+        return Task.objects.create(
+            wedding_profile=self.wedding.profile, title="Confirm the florist"
+        )
+
+    def new_vendor(self) -> Vendor:
+        """Create a vendor on the seeded wedding."""
+        return Vendor.objects.create(
+            wedding_profile=self.wedding.profile,
+            name="Maua Florists",
+            category=VendorCategory.FLOWERS,
+        )
+
+    def guest_id(self) -> int:
+        """Return a random seeded guest's id."""
+        return self.rng.choice(self.wedding.guests).pk
+
+    def task_id(self) -> int:
+        """Return a random seeded task's id."""
+        return self.rng.choice(self.wedding.tasks).pk
+
+    def vendor_id(self) -> int:
+        """Return a random seeded vendor's id."""
+        return self.rng.choice(self.wedding.vendors).pk
+
+    def refresh_token(self) -> str:
+        """Return a new refresh token for the owner."""
+        return str(RefreshToken.for_user(self.owner))
+
+
+def _registration(fixture: Fixture) -> Call:
+    username = fixture.unique("register")
+    return Call(
+        reverse("authentication:register"),
+        data={
+            "username": username,
+            "email": f"{username}@example.com",
+            "first_name": "Amani",
+            "last_name": "Otieno",
+            "password": PASSWORD,
+            "password_confirm": PASSWORD,
+        },
+    )
+
+
+def _new_profile(fixture: Fixture) -> Call:
+    return Call(
+        reverse("profiles:create_profile"),
+        fixture.new_user(),
+        {
+            "wedding_date": (date.today() + timedelta(days=180)).isoformat(),
+            "bride_name": "Amina Wekesa",
+            "groom_name": "Brian Mutua",
+            "venue": "Safari Park Hotel, Nairobi",
+            "budget": "850000.00",
+        },
+    )
+
+
+# URL name -> (HTTP method, builder of the request for one iteration).
+CASES: dict[str, tuple[str, Callable[[Fixture], Call]]] = {
+    "authentication:register": ("post", _registration),
+    "authentication:login": (
+        "post",
+        lambda f: Call(
+            reverse("authentication:login"),
+            data={"username": f.owner.username, "password": PASSWORD},
+        ),
+    ),
+    "authentication:logout": (
+        "post",
+        lambda f: Call(
+            reverse("authentication:logout"), f.owner, {"refresh": f.refresh_token()}
+        ),
+    ),
+    "authentication:token_refresh": (
+        "post",
+        lambda f: Call(
+            reverse("authentication:token_refresh"),
+            data={"refresh": f.refresh_token()},
+        ),
+    ),
+    "authentication:profile": (
+        "get",
+        lambda f: Call(reverse("authentication:profile"), f.owner),
+    ),
+    "authentication:update_profile": (
+        "patch",
+        lambda f: Call(
+            reverse("authentication:update_profile"), f.owner, {"first_name": "Aisha"}
+        ),
+    ),
+    "profiles:create_profile": ("post", _new_profile),
+    "profiles:get_profile": (
+        "get",
+        lambda f: Call(reverse("profiles:get_profile"), f.owner),
+    ),
+    "profiles:update_profile": (
+        "patch",
+        lambda f: Call(
+            reverse("profiles:update_profile"),
+            f.owner,
+            {"venue": "Windsor Golf Hotel & Country Club"},
+        ),
+    ),
+    "profiles:delete_profile": (
+        "delete",
+        lambda f: Call(reverse("profiles:delete_profile"), f.new_couple()),
+    ),
+    "profiles:wedding_progress": (
+        "get",
+        lambda f: Call(reverse("profiles:wedding_progress"), f.owner),
+    ),
+    "tasks:create_task": (
+        "post",
+        lambda f: Call(
+            reverse("tasks:create_task"),
+            f.owner,
+            {"title": "Book the photographer", "assigned_to": TaskAssignment.COUPLE},
+        ),
+    ),
+    "tasks:list_tasks": (
+        "get",
+        lambda f: Call(reverse("tasks:list_tasks"), f.owner),
+    ),
+    "tasks:get_task": (
+        "get",
+        lambda f: Call(reverse("tasks:get_task", args=[f.task_id()]), f.owner),
+    ),
+    "tasks:update_task": (
+        "patch",
+        lambda f: Call(
+            reverse("tasks:update_task", args=[f.task_id()]),
+            f.owner,
+            {"title": "Confirm the caterer"},
+        ),
+    ),
+    "tasks:delete_task": (
+        "delete",
+        lambda f: Call(reverse("tasks:delete_task", args=[f.new_task().pk]), f.owner),
+    ),
+    "tasks:toggle_task": (
+        "patch",
+        lambda f: Call(reverse("tasks:toggle_task", args=[f.task_id()]), f.owner),
+    ),
+    "guests:create_guest": (
+        "post",
+        lambda f: Call(
+            reverse("guests:create_guest"),
+            f.owner,
+            {"name": "Njeri Mwangi", "email": f"{f.unique('guest')}@example.com"},
+        ),
+    ),
+    "guests:list_guests": (
+        "get",
+        lambda f: Call(reverse("guests:list_guests"), f.owner),
+    ),
+    "guests:get_guest": (
+        "get",
+        lambda f: Call(reverse("guests:get_guest", args=[f.guest_id()]), f.owner),
+    ),
+    "guests:update_guest": (
+        "patch",
+        lambda f: Call(
+            reverse("guests:update_guest", args=[f.guest_id()]),
+            f.owner,
+            {"name": "Achieng Odhiambo"},
+        ),
+    ),
+    "guests:delete_guest": (
+        "delete",
+        lambda f: Call(
+            reverse("guests:delete_guest", args=[f.new_guest().pk]), f.owner
+        ),
+    ),
+    "guests:update_rsvp": (
+        "patch",
+        lambda f: Call(
+            reverse("guests:update_rsvp", args=[f.guest_id()]),
+            f.owner,
+            {"rsvp_status": RSVPStatus.CONFIRMED},
+        ),
+    ),
+    "guests:guest_statistics": (
+        "get",
+        lambda f: Call(reverse("guests:guest_statistics"), f.owner),
+    ),
+    "vendors:create_vendor": (
+        "post",
+        lambda f: Call(
+            reverse("vendors:create_vendor"),
+            f.owner,
+            {
+                "name": "Nyama Mama Caterers",
+                "category": VendorCategory.CATERING,
+                "contact_person": "Halima Hassan",
+                "phone": "+254712345678",
+                "email": "bookings@nyamamama.co.ke",
+            },
+        ),
+    ),
+    "vendors:list_vendors": (
+        "get",
+        lambda f: Call(reverse("vendors:list_vendors"), f.owner),
+    ),
+    "vendors:get_vendor": (
+        "get",
+        lambda f: Call(reverse("vendors:get_vendor", args=[f.vendor_id()]), f.owner),
+    ),
+    "vendors:update_vendor": (
+        "patch",
+        lambda f: Call(
+            reverse("vendors:update_vendor", args=[f.vendor_id()]),
+            f.owner,
+            {"notes": "Deposit paid"},
+        ),
+    ),
+    "vendors:delete_vendor": (
+        "delete",
+        lambda f: Call(
+            reverse("vendors:delete_vendor", args=[f.new_vendor().pk]), f.owner
+        ),
+    ),
+    "vendors:vendor_categories": (
+        "get",
+        lambda f: Call(reverse("vendors:vendor_categories"), f.owner),
+    ),
+    "vendors:search_vendors": (
+        "get",
+        lambda f: Call(reverse("vendors:search_vendors") + "?q=cater", f.owner),
+    ),
+    "schema": ("get", lambda f: Call(reverse("schema"))),
+    "schema-versioned": (
+        "get",
+        lambda f: Call(reverse("schema-versioned", args=[current_schema().digest])),
+    ),
+    "swagger-ui": ("get", lambda f: Call(reverse("swagger-ui"))),
+    "redoc": ("get", lambda f: Call(reverse("redoc"))),
+    "metrics": (
+        "get",
+        lambda f: Call(
+            reverse("metrics"),
+            headers={"Authorization": f"Bearer {METRICS_TOKEN}"},
+        ),
+    ),
+}
+
+
+def url_names(patterns=None, namespace: str = "") -> list[str]:
+    """Return the namespaced names of every URL pattern, in definition order."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    names = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            prefix = (
+                f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            )
+            names.extend(url_names(pattern.url_patterns, prefix))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.append(f"{namespace}{pattern.name}")
+    return names
+
+
+def compare(results: dict, baseline: dict, thresholds: dict[str, float]) -> list[str]:
+    """Return a description of every measurement that regressed.
+
+    Time and memory regress when they grow by more than the relative threshold
+    and by more than an absolute floor, which keeps sub-millisecond noise from
+    failing a run; queries regress when the count grows by more than
+    ``thresholds["queries"]``.
+    """
+    regressions = []
+    for size, endpoints in results.items():
+        for name, current in endpoints.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            label = f"{size} {name}"
+            if current["queries"] - previous["queries"] > thresholds["queries"]:
+                regressions.append(
+                    f"{label}: {previous['queries']} -> {current['queries']} queries"
+                )
+            for key, limit, floor, unit in (
+                ("best_ms", "time", "time_floor_ms", "ms"),
+                ("peak_kib", "memory", "memory_floor_kib", "KiB"),
+            ):
+                growth = current[key] - previous[key]
+                if (
+                    growth > thresholds[floor]
+                    and growth > previous[key] * thresholds[limit]
+                ):
+                    regressions.append(
+                        f"{label}: {previous[key]:.2f} -> {current[key]:.2f} {unit}"
+                    )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = "Benchmark every URL name against seeded data and check for regressions."
+
+    def add_arguments(self, parser):
+        """Register the size, iteration, baseline and threshold options."""
+        parser.add_argument(
+            "--sizes", nargs="+", choices=list(SIZES), default=list(SIZES)
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=5,
+            help="Timed requests per endpoint and size (after one warm-up)",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            help="Only benchmark URL names containing this text (repeatable)",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write the results as the new baseline instead of comparing",
+        )
+        parser.add_argument("--output", help="Also write the results to this file")
+        parser.add_argument(
+            "--time-threshold",
+            type=float,
+            default=0.5,
+            help="Allowed relative growth in best time (default 0.5 = 50%%)",
+        )
+        parser.add_argument("--time-floor-ms", type=float, default=2.0)
+        parser.add_argument(
+            "--memory-threshold",
+            type=float,
+            default=0.25,
+            help="Allowed relative growth in peak memory (default 0.25 = 25%%)",
+        )
+        parser.add_argument("--memory-floor-kib", type=float, default=64.0)
+        parser.add_argument(
+            "--query-threshold",
+            type=int,
+            default=0,
+            help="Allowed extra queries per request (default 0)",
+        )
+        parser.add_argument(
+            "--in-place",
+            action="store_true",
+            help="Use the configured database and roll the data back afterwards",
+        )
+        parser.add_argument(
+            "--background",
+            type=int,
+            default=0,
+            help="Other weddings (150 guests, 40 tasks, 12 vendors) to seed first",
+        )
+
+    def handle(self, *args, **options):
+        """Run the benchmark, then write or check the baseline."""
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        cases = {
+            name: case
+            for name, case in CASES.items()
+            if not options["endpoints"]
+            or any(text in name for text in options["endpoints"])
+        }
+        if not cases:
+            raise CommandError("No endpoints match --endpoint.")
+        missing = [
+            name
+            for name in url_names()
+            if name not in CASES and name.split(":")[0] not in IGNORED_NAMESPACES
+        ]
+        if missing:
+            self.stderr.write(
+                f"Not benchmarked (no case defined): {', '.join(missing)}"
+            )
+
+        logging.disable(logging.CRITICAL)
+        try:
+            results = self.run(cases, options)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        report = {
+            "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "database": connection.vendor,
+            "iterations": options["iterations"],
+            "background": options["background"],
+            "results": results,
+        }
+        self.print_results(results)
+        if options["output"]:
+            self.write_json(options["output"], report)
+        failed = [
+            f"{size} {name}"
+            for size, endpoints in results.items()
+            for name, data in endpoints.items()
+            if any(code >= 400 for code in data["status"])
+        ]
+        if failed:
+            raise CommandError(f"Requests failed, fix the cases: {', '.join(failed)}")
+
+        baseline_path = Path(options["baseline"])
+        if options["update_baseline"]:
+            self.write_json(baseline_path, report)
+            self.stdout.write(f"Baseline written to {baseline_path}")
+            return
+        if not baseline_path.exists():
+            raise CommandError(
+                f"No baseline at {baseline_path}; run with --update-baseline first."
+            )
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        regressions = compare(
+            results,
+            baseline["results"],
+            {
+                "time": options["time_threshold"],
+                "time_floor_ms": options["time_floor_ms"],
+                "memory": options["memory_threshold"],
+                "memory_floor_kib": options["memory_floor_kib"],
+                "queries": options["query_threshold"],
+            },
+        )
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} regression(s) against {baseline_path}:\n"
+                + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}"))
+
+    def run(self, cases, options) -> dict[str, dict[str, dict]]:
+        """Seed each size and measure every case; return results by size."""
+        overrides = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                    "LOCATION": "benchmark-endpoints",
+                }
+            },
+            METRICS_TOKEN=METRICS_TOKEN,
+        )
+        with overrides, scratch_database(options["in_place"]):
+            return self.measure_sizes(cases, options)
+
+    def measure_sizes(self, cases, options) -> dict[str, dict[str, dict]]:
+        """Measure every case at every requested size."""
+        results: dict[str, dict[str, dict]] = {}
+        if options["background"]:
+            seed_weddings(
+                options["background"],
+                guests=150,
+                tasks=40,
+                vendors=12,
+                rng=random.Random(options["seed"]),
+                username_prefix="benchmark-background-",
+            )
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+        for size in options["sizes"]:
+            rng = random.Random(f"{options['seed']}-{size}")
+            wedding = seed_wedding(
+                f"benchmark-{size}", rng=rng, password=PASSWORD, **SIZES[size]
+            )
+            fixture = Fixture(wedding, rng, f"benchmark-{size}")
+            results[size] = {
+                name: self.measure(fixture, method, build, options["iterations"])
+                for name, (method, build) in cases.items()
+            }
+        return results
+
+    def measure(self, fixture: Fixture, method: str, build, iterations: int) -> dict:
+        """Time one endpoint; return its timings, queries and peak memory."""
+        client = Client()
+        timings = []
+        queries = 0
+        status_codes = set()
+        # The first request warms up imports and per-process caches.
+        for iteration in range(iterations + 2):
+            request = self.prepare(client, fixture, method, build)
+            if iteration == iterations + 1:
+                tracemalloc.start()
+                try:
+                    request()
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                continue
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = request()
+                elapsed = time.perf_counter() - started
+            if iteration:
+                timings.append(elapsed * 1000)
+                queries = max(queries, len(context))
+                status_codes.add(response.status_code)
+        return {
+            "best_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "queries": queries,
+            "peak_kib": round(peak / 1024, 1),
+            "status": sorted(status_codes),
+        }
+
+    def prepare(self, client: Client, fixture: Fixture, method: str, build):
+        """Build the next request and return a callable sending it."""
+        call = build(fixture)
+        headers = dict(call.headers or {})
+        if call.user is not None:
+            token = RefreshToken.for_user(call.user).access_token
+            headers["Authorization"] = f"Bearer {token}"
+        for cache in caches.all():
+            cache.clear()
+        send = getattr(client, method)
+        kwargs: dict[str, object] = {"headers": headers}
+        if call.data is not None:
+            kwargs.update(data=call.data, content_type="application/json")
+        return lambda: send(call.path, **kwargs)
+
+    def print_results(self, results) -> None:
+        """Print one table row per size and endpoint."""
+        self.stdout.write(
+            f"{'size':<8}{'endpoint':<34}{'best ms':>9}{'median ms':>11}"
+            f"{'queries':>9}{'peak KiB':>10}  status"
+        )
+        for size, endpoints in results.items():
+            for name, data in endpoints.items():
+                statuses = ",".join(str(code) for code in data["status"])
+                self.stdout.write(
+                    f"{size:<8}{name:<34}{data['best_ms']:>9.2f}"
+                    f"{data['median_ms']:>11.2f}{data['queries']:>9}"
+                    f"{data['peak_kib']:>10.1f}  {statuses}"
+                )
+
+    def write_json(self, path, report) -> None:
+        """Write ``report`` to ``path``, creating parent directories."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,137 @@
+"""Measure what the sessionless API fast path saves per request.
+
+Sends the same JWT-authenticated API request through the whole middleware
+stack, once with the session, CSRF, auth and message middleware running for
+it (``API_SESSION_AUTH=True``) and once with the fast path, both with and
+without an admin session cookie on the request::
+
+    python manage.py benchmark_middleware
+    python manage.py benchmark_middleware --path /api/v1/guests/list/ --requests 5000
+
+Requests go through Django's test client in-process, so the numbers isolate
+the request path from any web server. ``SessionAuthentication`` is chosen
+when the views are imported and is the same in both runs; it only matters
+for requests without a valid JWT. Use ``--in-place`` where the database
+user cannot create databases.
+"""
+
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.common.seeding import scratch_database
+
+MODES = (("full stack", True), ("sessionless", False))
+
+
+def build_client(token: str, api_session_auth: bool, path: str) -> Client:
+    """Return a client whose middleware stack runs in the given mode."""
+    # The middleware reads the setting when the client's handler builds the
+    # stack, on its first request.
+    with override_settings(API_SESSION_AUTH=api_session_auth):
+        client = Client(headers={"Authorization": f"Bearer {token}"})
+        response = client.get(path)
+    if response.status_code != 200:
+        raise CommandError(f"{path} returned {response.status_code}.")
+    return client
+
+
+def count_queries(client: Client, path: str) -> int:
+    """Return the number of queries one request for ``path`` runs."""
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        client.get(path)
+    return len(queries)
+
+
+def measure(
+    clients: dict[str, Client], path: str, requests: int
+) -> dict[str, dict[str, float]]:
+    """Time ``requests`` GETs of ``path`` per client, interleaving the clients."""
+    timings: dict[str, list[float]] = {mode: [] for mode in clients}
+    for _ in range(requests):
+        for mode, client in clients.items():
+            started = time.perf_counter()
+            client.get(path)
+            timings[mode].append((time.perf_counter() - started) * 1_000_000)
+    return {
+        mode: {
+            "mean_us": round(statistics.fmean(timings[mode]), 1),
+            "p50_us": round(statistics.median(timings[mode]), 1),
+            "queries": count_queries(client, path),
+        }
+        for mode, client in clients.items()
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark the per-request overhead the sessionless API path saves."
+
+    def add_arguments(self, parser):
+        """Register the workload options."""
+        parser.add_argument("--path", default="/api/v1/auth/profile/")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--format", choices=("table", "json"), default="table")
+        parser.add_argument(
+            "--in-place",
+            action="store_true",
+            help="Create the user in the configured database and roll back.",
+        )
+
+    def handle(self, *args, **options):
+        """Run each mode with and without a session cookie and report."""
+        if not options["path"].startswith(tuple(settings.SESSIONLESS_PATH_PREFIXES)):
+            raise CommandError(
+                f"{options['path']} is not under SESSIONLESS_PATH_PREFIXES."
+            )
+        results: dict[str, dict[str, dict[str, float]]] = {}
+        # The test client sends requests for the "testserver" host.
+        hosts = override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"])
+        with hosts, scratch_database(options["in_place"]):
+            user = get_user_model().objects.create_user(
+                "benchmark-middleware", password="unused-password"
+            )
+            token = AccessToken.for_user(user)
+            for cookie in (False, True):
+                clients = {
+                    mode: build_client(str(token), api_session_auth, options["path"])
+                    for mode, api_session_auth in MODES
+                }
+                if cookie:
+                    for client in clients.values():
+                        client.force_login(user)
+                scenario = "jwt + session cookie" if cookie else "jwt"
+                results[scenario] = measure(
+                    clients, options["path"], options["requests"]
+                )
+
+        if options["format"] == "json":
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(
+            f"{'scenario':<24}{'mode':<14}{'mean us':>10}{'p50 us':>10}{'queries':>9}"
+        )
+        for scenario, modes in results.items():
+            for mode, result in modes.items():
+                self.stdout.write(
+                    f"{scenario:<24}{mode:<14}{result['mean_us']:>10.1f}"
+                    f"{result['p50_us']:>10.1f}{result['queries']:>9}"
+                )
+            full, fast = modes["full stack"], modes["sessionless"]
+            self.stdout.write(
+                f"{'':<24}{'saved':<14}{full['mean_us'] - fast['mean_us']:>10.1f}"
+                f"{full['p50_us'] - fast['p50_us']:>10.1f}"
+                f"{full['queries'] - fast['queries']:>9}"
+            )
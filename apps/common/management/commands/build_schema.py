@@ -0,0 +1,41 @@
+"""Generate the OpenAPI schema served at /api/schema/.
+
+Run once per deploy, after the code is in place and before workers start::
+
+    python manage.py build_schema
+    python manage.py build_schema --output /srv/app/openapi.json
+
+The schema is written to ``OPENAPI_SCHEMA_PATH`` (or ``--output``) and read
+once by each worker; see :mod:`apps.common.schema`.
+"""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.common.schema import write_schema
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema artifact served by the API."
+
+    def add_arguments(self, parser):
+        """Register the output option."""
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Where to write the schema (default: OPENAPI_SCHEMA_PATH).",
+        )
+
+    def handle(self, *args, **options):
+        """Write the schema and print its size and digest."""
+        path = options["output"] or Path(settings.OPENAPI_SCHEMA_PATH)
+        document = write_schema(path)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {path} ({len(document.content) / 1024:.1f} KiB, "
+                f"{len(document.gzipped) / 1024:.1f} KiB gzipped, "
+                f"digest {document.digest})"
+            )
+        )
@@ -0,0 +1,206 @@
+"""Summarize request latency per route from request log files.
+
+Reads the response lines ``RequestLoggingMiddleware`` writes, in either the
+text (``[request_id] GET /path - 200 (12.5ms)``) or JSON log format, from
+plain or gzipped (rotated) files, and prints per-route percentiles::
+
+    python manage.py latency_report logs/django.log logs/django.log.*.gz
+    python manage.py latency_report logs/django.log --format json
+
+Files are streamed line by line and latencies are kept in log-scale
+histograms, so memory stays constant however large the logs are; percentiles
+are accurate to about 2%.
+
+Accurate numbers need JSON logs written at INFO level (``LOG_FORMAT=json``,
+``LOG_FILE_LEVEL=INFO``). The file handler only writes WARNING and above by
+default, which leaves just the slow and failed requests. In production only a
+``LOG_SAMPLE_RATE`` fraction of the other responses is logged; JSON lines
+record that rate and each one counts as ``1 / sample_rate`` requests, while
+text lines carry no rate and count once, so the command warns about them.
+"""
+
+import gzip
+import json
+import math
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.benchmarking import route_name
+
+RESPONSE_LINE_RE = re.compile(
+    r"\[\w+\] (?P<method>[A-Z]+) (?P<path>\S+) - (?P<status>\d{3}) "
+    r"\((?P<duration>[\d.]+)ms\)"
+)
+# Relative width of a histogram bucket (percentiles are within ~2%).
+BUCKET_GROWTH = 1.02
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class RouteLatency:
+    """Streaming latency summary for one route."""
+
+    # Requests the logged lines stand for, each weighted by 1 / sample rate.
+    count: float = 0.0
+    logged: int = 0
+    errors: float = 0.0
+    max_ms: float = 0.0
+    buckets: dict[int, float] = field(default_factory=dict)
+
+    def add(self, duration_ms: float, status_code: int, weight: float = 1.0) -> None:
+        """Record one logged response standing for ``weight`` requests."""
+        self.count += weight
+        self.logged += 1
+        if status_code >= 500:
+            self.errors += weight
+        self.max_ms = max(self.max_ms, duration_ms)
+        index = math.ceil(math.log(max(duration_ms, 0.001), BUCKET_GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0.0) + weight
+
+    def percentile(self, percent: float) -> float:
+        """Return the approximate latency below which ``percent`` % fall."""
+        # Tolerates the rounding error of summed fractional weights.
+        rank = self.count * percent / 100 - 1e-9
+        seen = 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(BUCKET_GROWTH**index, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the summary as a JSON-serializable dict."""
+        data: dict[str, float] = {"count": round(self.count), "logged": self.logged}
+        for percent in PERCENTILES:
+            data[f"p{percent}_ms"] = round(self.percentile(percent), 2)
+        data["max_ms"] = round(self.max_ms, 2)
+        data["error_rate"] = round(self.errors / self.count, 4)
+        return data
+
+
+class LoggedResponse(NamedTuple):
+    """One response line of the request log."""
+
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    # None for text lines, which do not record the rate they were sampled at.
+    sample_rate: float | None
+    slow: bool
+
+
+def parse_line(line: str) -> LoggedResponse | None:
+    """Return the response a log line records, or ``None`` for other lines.
+
+    JSON lines without a ``sample_rate`` were logged unconditionally and get
+    a rate of 1.
+    """
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+            sample_rate = float(record.get("sample_rate", 1.0))
+            if not 0 < sample_rate <= 1:
+                return None
+            return LoggedResponse(
+                record["method"],
+                record["path"],
+                int(record["status_code"]),
+                float(record["duration_ms"]),
+                sample_rate,
+                bool(record.get("slow")),
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+    match = RESPONSE_LINE_RE.search(line)
+    if match is None:
+        return None
+    return LoggedResponse(
+        match["method"],
+        match["path"],
+        int(match["status"]),
+        float(match["duration"]),
+        None,
+        line.rstrip().endswith(" - slow"),
+    )
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Yield the lines of a plain or gzipped log file."""
+    if path.endswith(".gz"):
+        handle = gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    else:
+        handle = open(path, encoding="utf-8", errors="replace")
+    with handle:
+        yield from handle
+
+
+class Command(BaseCommand):
+    help = "Report per-route request latency percentiles from log files."
+
+    def add_arguments(self, parser):
+        """Register the input and output options."""
+        parser.add_argument("files", nargs="+", help="Log files, optionally .gz")
+        parser.add_argument("--format", choices=("table", "json"), default="table")
+
+    def handle(self, *args, **options):
+        """Stream the files and print the per-route summary."""
+        routes: dict[tuple[str, str], RouteLatency] = {}
+        text_lines = fast_successes = 0
+        for path in options["files"]:
+            try:
+                for line in read_lines(path):
+                    response = parse_line(line)
+                    if response is None:
+                        continue
+                    if response.sample_rate is None:
+                        text_lines += 1
+                    if response.status_code < 400 and not response.slow:
+                        fast_successes += 1
+                    key = (route_name(response.path), response.method)
+                    if key not in routes:
+                        routes[key] = RouteLatency()
+                    routes[key].add(
+                        response.duration_ms,
+                        response.status_code,
+                        1 / (response.sample_rate or 1.0),
+                    )
+            except OSError as error:
+                raise CommandError(f"Cannot read {path}: {error}") from error
+
+        if text_lines:
+            self.stderr.write(
+                f"Warning: {text_lines} text-format lines record no sample rate "
+                "and count as one request each; with LOG_SAMPLE_RATE below 1, "
+                "fast responses are under-represented. Log with LOG_FORMAT=json."
+            )
+        if routes and not fast_successes:
+            self.stderr.write(
+                "Warning: the logs only hold failed and slow requests; set "
+                "LOG_FILE_LEVEL=INFO so every response line is written."
+            )
+
+        ordered = sorted(routes.items(), key=lambda item: -item[1].count)
+        if options["format"] == "json":
+            report = [
+                {"route": route, "method": method, **latency.as_dict()}
+                for (route, method), latency in ordered
+            ]
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'route':<36}{'method':<8}{'count':>8}{'logged':>8}{'p50 ms':>10}"
+            f"{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}"
+        )
+        for (route, method), latency in ordered:
+            data = latency.as_dict()
+            self.stdout.write(
+                f"{route:<36}{method:<8}{data['count']:>8}{latency.logged:>8}"
+                f"{data['p50_ms']:>10.2f}{data['p90_ms']:>10.2f}{data['p99_ms']:>10.2f}"
+                f"{data['max_ms']:>10.2f}{data['error_rate']:>8.1%}"
+            )
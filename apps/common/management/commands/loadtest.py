@@ -0,0 +1,357 @@
+r"""Drive concurrent mixed traffic against a running API and report latency.
+
+Provisions synthetic couples (user, wedding profile, guests, tasks and
+vendors) in the configured database, logs each one in over HTTP, and then
+runs ``--concurrency`` virtual users for ``--duration`` seconds. Each virtual
+user repeatedly picks a weighted scenario:
+
+- ``dashboard``: poll progress, guest statistics and the task list
+- ``rsvp_burst``: several RSVP updates in a row
+- ``vendor_search``: search vendors, then list them
+- ``guest_list``: list guests, filtered by RSVP status half the time
+- ``task_toggle``: toggle a task's completion
+
+Without ``--base-url`` a local ``runserver`` is started on a free port and
+stopped afterwards; a server given with ``--base-url`` must use the same
+database. Results (throughput and p50/p95/p99 per route) are printed and
+written as JSON for comparison across commits::
+
+    python manage.py loadtest --couples 10 --concurrency 16 --duration 30 \
+        --output loadtest.json
+"""
+
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.benchmarking import git_commit, route_name
+from apps.common.constants import RSVPStatus
+from apps.common.seeding import seed_wedding
+
+USERNAME_PREFIX = "loadtest-couple-"
+PASSWORD = "LoadTest-Passw0rd"
+SCENARIO_WEIGHTS = {
+    "dashboard": 35,
+    "rsvp_burst": 20,
+    "vendor_search": 20,
+    "guest_list": 15,
+    "task_toggle": 10,
+}
+SEARCH_TERMS = ("cater", "photo", "decor", "music", "venue", "cake")
+RSVP_BURST_SIZE = 5
+
+
+@dataclass
+class Couple:
+    """A provisioned couple and the ids its scenarios act on."""
+
+    username: str
+    guest_ids: list[int]
+    task_ids: list[int]
+    token: str = ""
+
+
+@dataclass
+class Results:
+    """Latencies and status codes per route, shared by all virtual users."""
+
+    latencies: dict[tuple[str, str], list[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    errors: dict[tuple[str, str], int] = field(default_factory=lambda: defaultdict(int))
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, method: str, path: str, latency: float, status: int) -> None:
+        """Record one response."""
+        key = (route_name(urlsplit(path).path), method)
+        with self.lock:
+            self.latencies[key].append(latency)
+            if status >= 400:
+                self.errors[key] += 1
+
+
+class VirtualUser:
+    """One simulated client with its own keep-alive connection."""
+
+    def __init__(self, base_url: str, couple: Couple, results: Results, seed: int):
+        """Connect to ``base_url`` acting as ``couple``."""
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname or "127.0.0.1", parts.port or 80
+        self.couple = couple
+        self.results = results
+        self.random = random.Random(seed)
+        self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+
+    def request(self, method: str, path: str, body: dict | None = None) -> int:
+        """Send one request, record its latency and return the status code."""
+        headers = {"Authorization": f"Bearer {self.couple.token}"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, path, payload, headers)
+            response = self.connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            status = 599
+        self.results.record(method, path, time.perf_counter() - start, status)
+        return status
+
+    def run(self, deadline: float) -> None:
+        """Run weighted scenarios until ``deadline``."""
+        names = list(SCENARIO_WEIGHTS)
+        weights = list(SCENARIO_WEIGHTS.values())
+        while time.monotonic() < deadline:
+            scenario = self.random.choices(names, weights)[0]
+            getattr(self, f"scenario_{scenario}")()
+        self.connection.close()
+
+    def scenario_dashboard(self) -> None:
+        """Poll the planning dashboard."""
+        self.request("GET", "/api/v1/profiles/progress/")
+        self.request("GET", "/api/v1/guests/statistics/")
+        self.request("GET", "/api/v1/tasks/list/")
+
+    def scenario_rsvp_burst(self) -> None:
+        """Record a burst of RSVP replies."""
+        statuses = [value for value, _ in RSVPStatus.CHOICES]
+        for guest_id in self.random.sample(
+            self.couple.guest_ids, min(RSVP_BURST_SIZE, len(self.couple.guest_ids))
+        ):
+            self.request(
+                "PATCH",
+                f"/api/v1/guests/{guest_id}/rsvp/",
+                {"rsvp_status": self.random.choice(statuses)},
+            )
+
+    def scenario_vendor_search(self) -> None:
+        """Search vendors and open the full list."""
+        query = urlencode({"q": self.random.choice(SEARCH_TERMS)})
+        self.request("GET", f"/api/v1/vendors/search/?{query}")
+        self.request("GET", "/api/v1/vendors/list/")
+
+    def scenario_guest_list(self) -> None:
+        """List guests, sometimes filtered."""
+        path = "/api/v1/guests/list/"
+        if self.random.random() < 0.5:
+            path += "?" + urlencode({"rsvp_status": RSVPStatus.CONFIRMED})
+        self.request("GET", path)
+
+    def scenario_task_toggle(self) -> None:
+        """Tick off (or reopen) a task."""
+        task_id = self.random.choice(self.couple.task_ids)
+        self.request("PATCH", f"/api/v1/tasks/{task_id}/toggle/")
+
+
+class Command(BaseCommand):
+    help = "Load test the API with concurrent mixed read/write scenarios."
+
+    def add_arguments(self, parser):
+        """Register the data volume, workload and output options."""
+        parser.add_argument("--base-url", help="Test a running server instead.")
+        parser.add_argument("--couples", type=int, default=5)
+        parser.add_argument("--guests", type=int, default=150)
+        parser.add_argument("--tasks", type=int, default=40)
+        parser.add_argument("--vendors", type=int, default=12)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=30.0)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+
+    def handle(self, *args, **options):
+        """Provision data, run the workload and report."""
+        couples = self.provision(options)
+        server = None
+        base_url = options["base_url"]
+        if not base_url:
+            server, base_url = self.start_server()
+        try:
+            for couple in couples:
+                couple.token = self.login(base_url, couple.username)
+
+            results = Results()
+            deadline = time.monotonic() + options["duration"]
+            users = [
+                VirtualUser(
+                    base_url,
+                    couples[index % len(couples)],
+                    results,
+                    options["seed"] + index,
+                )
+                for index in range(options["concurrency"])
+            ]
+            threads = [
+                threading.Thread(target=user.run, args=(deadline,)) for user in users
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+        report = self.build_report(results, elapsed, options)
+        self.print_report(report)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+
+    def provision(self, options) -> list[Couple]:
+        """Recreate the synthetic couples with the requested data volumes."""
+        get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        rng = random.Random(options["seed"])
+        couples = []
+        for index in range(options["couples"]):
+            wedding = seed_wedding(
+                f"{USERNAME_PREFIX}{index}",
+                guests=options["guests"],
+                tasks=options["tasks"],
+                vendors=options["vendors"],
+                rng=rng,
+                password=PASSWORD,
+            )
+            couples.append(
+                Couple(
+                    username=f"{USERNAME_PREFIX}{index}",
+                    guest_ids=[guest.pk for guest in wedding.guests],
+                    task_ids=[task.pk for task in wedding.tasks],
+                )
+            )
+        return couples
+
+    def start_server(self) -> tuple[subprocess.Popen, str]:
+        """Start ``runserver`` on a free local port and wait until it is up."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                str(settings.BASE_DIR / "manage.py"),
+                "runserver",
+                f"127.0.0.1:{port}",
+                "--noreload",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env={
+                **os.environ,
+                "ALLOWED_HOSTS": ",".join([*settings.ALLOWED_HOSTS, "127.0.0.1"]),
+            },
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError("The local server exited during startup")
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                connection.request("GET", "/health/")
+                if connection.getresponse().status == 200:
+                    return server, base_url
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError("The local server did not start within 30 seconds")
+
+    def login(self, base_url: str, username: str) -> str:
+        """Log in through the API and return an access token."""
+        parts = urlsplit(base_url)
+        connection = http.client.HTTPConnection(
+            parts.hostname or "127.0.0.1", parts.port or 80, timeout=30
+        )
+        connection.request(
+            "POST",
+            "/api/v1/auth/login/",
+            json.dumps({"username": username, "password": PASSWORD}),
+            {"Content-Type": "application/json"},
+        )
+        response = connection.getresponse()
+        body = json.loads(response.read() or b"{}")
+        connection.close()
+        if response.status != 200:
+            raise CommandError(f"Login failed for {username}: {response.status}")
+        return body["data"]["tokens"]["access"]
+
+    def build_report(self, results: Results, elapsed: float, options) -> dict:
+        """Summarize throughput and latency percentiles per route."""
+        routes = []
+        total = 0
+        for (route, method), latencies in sorted(results.latencies.items()):
+            total += len(latencies)
+            ms = sorted(latency * 1000 for latency in latencies)
+            cuts = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+            routes.append(
+                {
+                    "route": route,
+                    "method": method,
+                    "requests": len(ms),
+                    "throughput_rps": round(len(ms) / elapsed, 2),
+                    "error_rate": round(results.errors[(route, method)] / len(ms), 4),
+                    "p50_ms": round(cuts[49], 2),
+                    "p95_ms": round(cuts[94], 2),
+                    "p99_ms": round(cuts[98], 2),
+                    "max_ms": round(ms[-1], 2),
+                }
+            )
+        return {
+            "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "options": {
+                key: options[key]
+                for key in (
+                    "couples",
+                    "guests",
+                    "tasks",
+                    "vendors",
+                    "concurrency",
+                    "duration",
+                    "seed",
+                )
+            },
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "routes": routes,
+        }
+
+    def print_report(self, report: dict) -> None:
+        """Print the per-route table."""
+        self.stdout.write(
+            f"{'route':<32}{'method':<8}{'reqs':>7}{'rps':>8}{'p50 ms':>9}"
+            f"{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+        )
+        for row in report["routes"]:
+            self.stdout.write(
+                f"{row['route']:<32}{row['method']:<8}{row['requests']:>7}"
+                f"{row['throughput_rps']:>8.1f}{row['p50_ms']:>9.2f}"
+                f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['error_rate']:>8.1%}"
+            )
+        self.stdout.write(
+            f"{report['requests']} requests in {report['elapsed_seconds']}s "
+            f"({report['throughput_rps']} req/s)"
+        )
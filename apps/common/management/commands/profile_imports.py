@@ -0,0 +1,159 @@
+"""Measure how long a worker takes to boot and which imports it spends it on.
+
+Boots the application the way a gunicorn worker does before its first
+request (``config.wsgi`` plus the URLconf) in fresh interpreters, reports
+the median boot time against ``--target-ms``, and then summarizes one
+``python -X importtime`` run per package and per app::
+
+    python manage.py profile_imports
+    python manage.py profile_imports --runs 10 --target-ms 600 --format json
+
+Boot times are measured without ``-X importtime``, which adds its own
+overhead; the breakdown is the self time of each imported module, summed
+by top-level package, with ``apps.<app>`` and ``config`` kept separate. The
+command exits non-zero when the median boot time exceeds the target.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOT_SCRIPT = """\
+import time
+started = time.perf_counter()
+from config.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def boot(*flags: str) -> subprocess.CompletedProcess:
+    """Boot the application in a new interpreter and return the process."""
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", BOOT_SCRIPT],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if result.returncode:
+        raise CommandError(f"Booting the application failed:\n{result.stderr}")
+    return result
+
+
+def package_of(module: str) -> str:
+    """Return the group an imported module is reported under."""
+    parts = module.split(".")
+    if parts[0] == "apps" and len(parts) > 1:
+        return f"apps.{parts[1]}"
+    return parts[0]
+
+
+def summarize(importtime: str) -> tuple[dict[str, float], dict[str, float]]:
+    """Return self time in ms per package and per module from importtime output."""
+    packages: dict[str, float] = defaultdict(float)
+    modules: dict[str, float] = {}
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, _, name = line.removeprefix("import time:").split("|")
+        module = name.strip()
+        modules[module] = int(own) / 1000
+        packages[package_of(module)] += int(own) / 1000
+    return dict(packages), modules
+
+
+class Command(BaseCommand):
+    """Report worker boot time and a per-package import-time breakdown."""
+
+    help = "Measure worker boot time and summarize import time per package."
+
+    def add_arguments(self, parser):
+        """Register the command line options."""
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Boots to time; the median is reported (default: 5).",
+        )
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=settings.BOOT_TIME_TARGET_MS,
+            help="Fail when the median boot time exceeds this "
+            "(default: BOOT_TIME_TARGET_MS).",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Packages and modules to list (default: 15).",
+        )
+        parser.add_argument("--format", choices=("table", "json"), default="table")
+
+    def handle(self, *args, **options):
+        """Time the boots, break down one of them and check the target."""
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+        timings = [float(boot().stdout) for _ in range(options["runs"])]
+        packages, modules = summarize(boot("-X", "importtime").stderr)
+        median = statistics.median(timings)
+        top = options["top"]
+        by_time = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        report = {
+            "boot_ms": {
+                "median": round(median, 1),
+                "best": round(min(timings), 1),
+                "runs": [round(timing, 1) for timing in timings],
+                "target": options["target_ms"],
+            },
+            "packages_ms": {name: round(ms, 1) for name, ms in by_time[:top]},
+            "apps_ms": {
+                name: round(ms, 1)
+                for name, ms in sorted(packages.items())
+                if name.startswith("apps.") or name == "config"
+            },
+            "modules_ms": {
+                name: round(ms, 1)
+                for name, ms in sorted(
+                    modules.items(), key=lambda item: item[1], reverse=True
+                )[:top]
+            },
+            "import_total_ms": round(sum(packages.values()), 1),
+        }
+
+        if options["format"] == "json":
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_table(report)
+
+        if median > options["target_ms"]:
+            raise CommandError(
+                f"Median boot time {median:.0f} ms exceeds the "
+                f"{options['target_ms']:.0f} ms target."
+            )
+
+    def write_table(self, report: dict) -> None:
+        """Print the report as aligned sections."""
+        boot_ms = report["boot_ms"]
+        self.stdout.write(
+            f"Boot: median {boot_ms['median']:.0f} ms, best {boot_ms['best']:.0f} ms "
+            f"over {len(boot_ms['runs'])} runs (target {boot_ms['target']:.0f} ms)"
+        )
+        self.stdout.write(
+            f"Import self time under -X importtime: {report['import_total_ms']:.0f} ms"
+        )
+        for title, key in (
+            ("Packages", "packages_ms"),
+            ("Apps", "apps_ms"),
+            ("Modules", "modules_ms"),
+        ):
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            for name, ms in report[key].items():
+                self.stdout.write(f"  {ms:>8.1f} ms  {name}")
@@ -0,0 +1,192 @@
+"""Measure the memory a list endpoint uses, stage by stage.
+
+Seeds one wedding into a throwaway test database and runs each endpoint's
+work in stages under ``tracemalloc``, reporting peak and retained memory and
+the source lines that allocated the most::
+
+    python manage.py profile_memory
+    python manage.py profile_memory guests:list_guests --guests 2000 --top 15
+
+The stages mirror what the view does:
+
+- ``query``: fetch the rows as tuples, without building model instances
+- ``instances``: build the model instances (``list(queryset)``)
+- ``serialize``: ``Serializer(instances, many=True).data``
+- ``render``: render the response envelope to JSON bytes
+- ``request``: the whole endpoint through the test client, for reference
+
+Each of the first four stages keeps the previous stage's objects alive, as
+the view does. Only endpoints registered in ``CASES`` can be profiled; new
+heavy endpoints (exports, bulk imports) should be added there. Use
+``--in-place`` where the database user cannot create databases, and
+``--format json`` to keep results for comparison.
+"""
+
+import json
+import logging
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import QuerySet
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.common.memory import MemoryProfiler
+from apps.common.responses import APIResponse
+from apps.common.seeding import SeededWedding, scratch_database, seed_wedding
+from apps.guests.models import Guest
+from apps.guests.serializers import GuestSerializer
+from apps.profiles.models import WeddingProfile
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskSerializer
+from apps.vendors.models import Vendor
+from apps.vendors.serializers import VendorSerializer
+
+
+@dataclass
+class MemoryCase:
+    """The queryset and serializer an endpoint uses."""
+
+    queryset: Callable[[WeddingProfile], QuerySet]
+    serializer: type[BaseSerializer]
+
+
+# Querysets mirror the unfiltered views.
+CASES = {
+    "guests:list_guests": MemoryCase(
+        lambda profile: Guest.objects.filter(wedding_profile=profile)
+        .select_related("wedding_profile")
+        .order_by("name"),
+        GuestSerializer,
+    ),
+    "tasks:list_tasks": MemoryCase(
+        lambda profile: Task.objects.filter(wedding_profile=profile)
+        .select_related("wedding_profile", "vendor")
+        .order_by("-created_at"),
+        TaskSerializer,
+    ),
+    "vendors:list_vendors": MemoryCase(
+        lambda profile: Vendor.objects.filter(wedding_profile=profile)
+        .select_related("wedding_profile")
+        .order_by("category", "name"),
+        VendorSerializer,
+    ),
+}
+
+
+def profile_case(
+    name: str, wedding: SeededWedding, profiler: MemoryProfiler
+) -> MemoryProfiler:
+    """Run the stages of case ``name`` for ``wedding`` under ``profiler``."""
+    case = CASES[name]
+    queryset = case.queryset(wedding.profile)
+
+    with profiler.stage("query"):
+        compiler = queryset.query.get_compiler(queryset.db)
+        rows = list(compiler.results_iter())
+    del rows
+
+    with profiler.stage("instances"):
+        instances = list(queryset)
+    with profiler.stage("serialize"):
+        data = case.serializer(instances, many=True).data
+    with profiler.stage("render"):
+        content = JSONRenderer().render(APIResponse.success(data=data).data)
+    del instances, data, content
+
+    token = RefreshToken.for_user(wedding.profile.user).access_token
+    client = Client(headers={"Authorization": f"Bearer {token}"})
+    # Keep one-off imports and per-process caches out of the measurement.
+    client.get(reverse(name))
+    with profiler.stage("request"):
+        response = client.get(reverse(name))
+    if response.status_code != 200:
+        raise CommandError(f"{name} returned {response.status_code}.")
+    return profiler
+
+
+class Command(BaseCommand):
+    """Report peak memory and top allocation sites per endpoint stage."""
+
+    help = "Measure the memory list endpoints use, stage by stage."
+
+    def add_arguments(self, parser):
+        """Register the command line options."""
+        parser.add_argument(
+            "endpoints",
+            nargs="*",
+            metavar="url_name",
+            help=f"Endpoints to profile (default: all of {', '.join(CASES)}).",
+        )
+        parser.add_argument("--guests", type=int, default=2000)
+        parser.add_argument("--tasks", type=int, default=300)
+        parser.add_argument("--vendors", type=int, default=60)
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=5,
+            help="Allocation sites to report per stage (default: 5).",
+        )
+        parser.add_argument(
+            "--frames",
+            type=int,
+            default=1,
+            help="Stack frames tracemalloc keeps per allocation (default: 1).",
+        )
+        parser.add_argument("--format", choices=("table", "json"), default="table")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--in-place",
+            action="store_true",
+            help="Seed into the configured database and roll back afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        """Seed a wedding, profile each endpoint and print the results."""
+        unknown = sorted(set(options["endpoints"]) - set(CASES))
+        if unknown:
+            raise CommandError(
+                f"No memory case for: {', '.join(unknown)}. "
+                f"Available: {', '.join(CASES)}."
+            )
+        names = options["endpoints"] or list(CASES)
+
+        overrides = override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            },
+        )
+        results = {}
+        logging.disable(logging.CRITICAL)
+        try:
+            with overrides, scratch_database(options["in_place"]):
+                wedding = seed_wedding(
+                    "profile-memory",
+                    guests=options["guests"],
+                    tasks=options["tasks"],
+                    vendors=options["vendors"],
+                    rng=random.Random(options["seed"]),
+                )
+                for name in names:
+                    with MemoryProfiler(options["frames"], options["top"]) as profiler:
+                        results[name] = profile_case(name, wedding, profiler)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        if options["format"] == "json":
+            report = {
+                name: [stage.as_dict() for stage in profiler.stages]
+                for name, profiler in results.items()
+            }
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for name, profiler in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(profiler.report(options["top"]))
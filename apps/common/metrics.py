@@ -0,0 +1,351 @@
+"""In-process metrics registry for the Wedding Planner API.
+
+Keeps thread-safe counters, gauges and histograms that other common utilities
+(caching, request coalescing, connection pooling, request handling) report
+into, and renders them in the Prometheus text exposition format, so
+operational numbers can be scraped without an external service.
+
+With several worker processes (gunicorn), each worker periodically writes its
+values to a shared directory with :func:`write_snapshot` and the worker that
+serves a scrape merges them with :func:`merged_metrics`. Counters and
+histograms are summed over every file, gauges over live processes only.
+"""
+
+import bisect
+import copy
+import json
+import math
+import os
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, TypeVar
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """Base class for labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        """Create a metric with a fixed set of label names."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _label_key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        """Order label values by the declared label names."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{type(self).__name__} {self.name} expects labels {self.labelnames}, "
+                f"got {tuple(sorted(labels))}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple[str, ...]) -> dict[str, str]:
+        """Turn a label key back into a ``{name: value}`` dict."""
+        return dict(zip(self.labelnames, key, strict=True))
+
+    def value(self, **labels: Any) -> float:
+        """Return the current value for the given label values."""
+        key = self._label_key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> list[tuple[dict[str, str], float]]:
+        """Return ``(labels, value)`` pairs for every recorded label set."""
+        with self._lock:
+            items = list(self._values.items())
+        return [(self._labels(key), value) for key, value in items]
+
+    def exposition_samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return ``(sample name, labels, value)`` triples for exposition."""
+        return [(self.name, labels, value) for labels, value in self.samples()]
+
+    def dump(self) -> list[list]:
+        """Return the raw values in a JSON-serializable form."""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def load(self, values: list[list]) -> None:
+        """Add raw values produced by :meth:`dump` (of another process)."""
+        with self._lock:
+            for key, value in values:
+                self._merge(tuple(key), value)
+
+    def _merge(self, key: tuple[str, ...], value: Any) -> None:
+        """Add one raw value; the lock must be held."""
+        self._values[key] = self._values.get(key, 0.0) + value
+
+    def clone(self) -> "Metric":
+        """Return an empty metric with the same definition."""
+        metric = copy.copy(self)
+        metric._values = {}
+        metric._lock = threading.Lock()
+        return metric
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    """Monotonically increasing counter with optional labels."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Increase the counter for the given label values."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down, such as a pool size."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the gauge for the given label values."""
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ):
+        """Create a histogram with the given upper bucket bounds."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation for the given label values."""
+        key = self._label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # One count per bucket, one for +Inf, then the running sum.
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def value(self, **labels: Any) -> float:
+        """Return the number of observations for the given label values."""
+        key = self._label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            return sum(state[:-1]) if state else 0.0
+
+    def samples(self) -> list[tuple[dict[str, str], float]]:
+        """Return ``(labels, observation count)`` for every label set."""
+        with self._lock:
+            items = [(key, sum(state[:-1])) for key, state in self._values.items()]
+        return [(self._labels(key), count) for key, count in items]
+
+    def exposition_samples(self) -> list[tuple[str, dict[str, str], float]]:
+        """Return the ``_bucket``, ``_sum`` and ``_count`` samples."""
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        samples = []
+        for key, state in items:
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), state, strict=False):
+                cumulative += count
+                samples.append(
+                    (
+                        f"{self.name}_bucket",
+                        {**labels, "le": _format_value(bound)},
+                        cumulative,
+                    )
+                )
+            samples.append((f"{self.name}_sum", labels, state[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+    def _merge(self, key: tuple[str, ...], value: Any) -> None:
+        """Add another process's bucket counts and sum."""
+        state = self._values.get(key)
+        if state is None:
+            self._values[key] = list(value)
+        else:
+            self._values[key] = [a + b for a, b in zip(state, value, strict=True)]
+
+
+MetricT = TypeVar("MetricT", bound=Metric)
+
+
+class MetricsRegistry:
+    """Named collection of metrics shared across the process."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(
+        self,
+        cls: type[MetricT],
+        name: str,
+        documentation: str,
+        labelnames,
+        **kwargs: Any,
+    ) -> MetricT:
+        """Return the metric registered under ``name``, creating it if needed."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        """Return the counter registered under ``name``, creating it if needed."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        """Return the gauge registered under ``name``, creating it if needed."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Return the histogram registered under ``name``, creating it if needed."""
+        return self._register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Call ``collector`` before every snapshot to refresh derived gauges."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def get(self, name: str) -> Metric | None:
+        """Return a registered metric by name."""
+        return self._metrics.get(name)
+
+    def collect(self) -> list[Metric]:
+        """Run the collectors and return every registered metric."""
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            collector()
+        with self._lock:
+            return list(self._metrics.values())
+
+    def snapshot(self) -> dict[str, list[tuple[dict[str, str], float]]]:
+        """Return the current samples of every registered metric."""
+        return {metric.name: metric.samples() for metric in self.collect()}
+
+    def reset(self) -> None:
+        """Reset every registered metric (used by tests)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_text(metrics: Iterable[Metric]) -> str:
+    """Render metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in metrics:
+        documentation = metric.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric.name} {documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.exposition_samples():
+            if labels:
+                rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                name = f"{name}{{{rendered}}}"
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(directory: str | Path, source: MetricsRegistry = registry) -> None:
+    """Write this process's metric values to ``directory/<pid>.json``."""
+    data = {metric.name: metric.dump() for metric in source.collect()}
+    path = Path(directory) / f"{os.getpid()}.json"
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def _process_alive(pid: int) -> bool:
+    """Return whether a process with ``pid`` is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merged_metrics(
+    directory: str | Path | None, source: MetricsRegistry = registry
+) -> list[Metric]:
+    """Return this process's live metrics merged with other processes' snapshots.
+
+    Only metrics this process has registered are merged, which holds for
+    workers forked from the same application.
+    """
+    local = source.collect()
+    if not directory:
+        return local
+
+    merged: dict[str, Metric] = {}
+    for metric in local:
+        merged[metric.name] = metric.clone()
+        merged[metric.name].load(metric.dump())
+
+    own_pid = os.getpid()
+    for path in Path(directory).glob("*.json"):
+        try:
+            pid = int(path.stem)
+            data = json.loads(path.read_text())
+        except (ValueError, OSError):
+            continue
+        if pid == own_pid:
+            continue
+        alive = _process_alive(pid)
+        for name, values in data.items():
+            target = merged.get(name)
+            if target is None or (target.kind == "gauge" and not alive):
+                continue
+            target.load(values)
+    return list(merged.values())
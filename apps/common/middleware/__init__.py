@@ -1,5 +1,23 @@
 """Common middleware for the Wedding Planner API."""
 
 from .logging import RequestLoggingMiddleware
+from .metrics import RequestMetricsMiddleware
+from .profiling import RequestProfilingMiddleware
+from .replicas import ReplicaPinningMiddleware
+from .sessions import (
+    AuthenticationMiddleware,
+    CsrfViewMiddleware,
+    MessageMiddleware,
+    SessionMiddleware,
+)
 
-__all__ = ["RequestLoggingMiddleware"]
+__all__ = [
+    "AuthenticationMiddleware",
+    "CsrfViewMiddleware",
+    "MessageMiddleware",
+    "ReplicaPinningMiddleware",
+    "RequestLoggingMiddleware",
+    "RequestMetricsMiddleware",
+    "RequestProfilingMiddleware",
+    "SessionMiddleware",
+]
@@ -1,45 +1,203 @@
 """Request/Response logging middleware for Wedding Planner API."""
 
-import json
 import logging
+import random
+import re
 import time
 import uuid
+from contextlib import AbstractContextManager, nullcontext
 from typing import Any
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse
+from django.utils.functional import empty
 
+from apps.common.db.nplusone import (
+    NPlusOneError,
+    find_repeated_queries,
+    format_report,
+)
+from apps.common.db.query_stats import QueryStats, collect_query_stats
+from apps.common.db.sql_comments import SQLCommenter, tag_queries
 from apps.common.logging_constants import LoggingConstants, SecurityConstants
 
+# A complete JSON string, and the colon that makes the string before it a key.
+JSON_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+KEY_SEPARATOR_RE = re.compile(r"\s*:\s*")
+
+
+def json_value_end(text: str, start: int) -> int:
+    """Return the index just past the JSON value starting at ``start``.
+
+    Strings end at their closing quote, arrays and objects at their matching
+    bracket and other values at the next delimiter. A value cut off by
+    truncation ends with ``text``.
+    """
+    depth = 0
+    in_string = False
+    index = start
+    while index < len(text):
+        char = text[index]
+        if in_string:
+            if char == "\\":
+                index += 1
+            elif char == '"':
+                in_string = False
+                if depth == 0:
+                    return index + 1
+        elif char == '"':
+            in_string = True
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            if depth == 0:
+                return index
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        elif depth == 0 and (char == "," or char.isspace()):
+            return index
+        index += 1
+    return len(text)
+
 
 class RequestLoggingMiddleware:
-    """Simple request/response logging middleware for Django 4.2+."""
+    """Simple request/response logging middleware for Django 4.2+.
+
+    Runs natively under both WSGI and ASGI, so Django never has to switch
+    threads to call it.
+    """
+
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         """Initialize the middleware with response handler."""
         self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
         self.logger = logging.getLogger("apps.requests")
         self.error_logger = logging.getLogger("apps.errors")
         self.is_production = not settings.DEBUG
         self.log_request_bodies = getattr(
             settings, "LOG_REQUEST_BODIES", settings.DEBUG
         )
+        self.body_max_bytes = getattr(settings, "LOG_REQUEST_BODY_MAX_BYTES", 2048)
+        self.sample_rate = getattr(settings, "LOG_SAMPLE_RATE", 1.0)
+        self.slow_request_ms = getattr(settings, "LOG_SLOW_REQUEST_MS", 1000)
+        self.log_query_stats = getattr(settings, "LOG_QUERY_STATS", True)
+        self.detect_n_plus_one = getattr(settings, "NPLUSONE_DETECTION", False)
+        self.n_plus_one_threshold = getattr(settings, "NPLUSONE_THRESHOLD", 5)
+        self.raise_n_plus_one = getattr(settings, "NPLUSONE_RAISE", False)
+        self.server_timing = getattr(settings, "SERVER_TIMING_HEADER", False)
+        self.sql_comments = getattr(settings, "SQL_COMMENTS", False)
+        self.sql_comment_request_id = getattr(settings, "SQL_COMMENT_REQUEST_ID", True)
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         """Process each request/response through the middleware."""
+        if self.is_async:
+            return self.__acall__(request)  # type: ignore[return-value]
+
         if self._should_skip_logging(request):
             return self.get_response(request)
 
+        request_id, start_time = self._start(request)
+        with (
+            self._collect_query_stats() as query_stats,
+            self._tag_queries(request),
+        ):
+            request.query_stats = query_stats
+            response = self.get_response(request)
+        self._finish(request, response, request_id, start_time, query_stats)
+
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Process each request/response on the event loop."""
+        if self._should_skip_logging(request):
+            return await self.get_response(request)
+
+        request_id, start_time = self._start(request)
+        with (
+            self._collect_query_stats() as query_stats,
+            self._tag_queries(request),
+        ):
+            request.query_stats = query_stats
+            response = await self.get_response(request)
+        self._finish(request, response, request_id, start_time, query_stats)
+
+        return response
+
+    def _start(self, request: HttpRequest) -> tuple[str, float]:
+        """Assign a request id and log the incoming request."""
         request_id = str(uuid.uuid4())[: LoggingConstants.REQUEST_ID_LENGTH]
         request.request_id = request_id
         start_time = time.time()
-
         self._log_request(request, request_id)
-        response = self.get_response(request)
+        return request_id, start_time
+
+    def _collect_query_stats(self) -> AbstractContextManager[QueryStats | None]:
+        """Count and time the request's queries, unless disabled."""
+        if not (self.log_query_stats or self.detect_n_plus_one):
+            return nullcontext()
+        return collect_query_stats(track_shapes=self.detect_n_plus_one)
+
+    def _tag_queries(
+        self, request: HttpRequest
+    ) -> AbstractContextManager[SQLCommenter | None]:
+        """Comment the request's SQL with its request id and route, if enabled."""
+        # Entered after the query stats so those still see the untagged SQL.
+        if not self.sql_comments:
+            return nullcontext()
+        return tag_queries(request, self.sql_comment_request_id)
+
+    def _finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        request_id: str,
+        start_time: float,
+        query_stats: QueryStats | None = None,
+    ) -> None:
+        """Log the response with the time spent handling the request."""
         duration = round((time.time() - start_time) * 1000, 2)
-        self._log_response(request, response, request_id, duration)
+        if query_stats is not None and self.detect_n_plus_one:
+            self._check_n_plus_one(request, request_id, query_stats)
+        if not self.log_query_stats:
+            query_stats = None
+        if self.server_timing:
+            timings = [f"app;dur={duration}"]
+            if query_stats is not None:
+                timings.append(query_stats.server_timing())
+            response["Server-Timing"] = ", ".join(timings)
+        self._log_response(request, response, request_id, duration, query_stats)
 
-        return response
+    def _check_n_plus_one(
+        self, request: HttpRequest, request_id: str, query_stats: QueryStats
+    ) -> None:
+        """Warn about, or raise for, query shapes repeated past the threshold."""
+        repeated = find_repeated_queries(query_stats, self.n_plus_one_threshold)
+        if not repeated:
+            return
+        message = (
+            f"[{request_id}] {request.method} {request.path} - possible N+1 "
+            f"queries:\n{format_report(repeated)}"
+        )
+        if self.raise_n_plus_one:
+            raise NPlusOneError(message)
+        self.logger.warning(
+            message,
+            extra={
+                "request_id": request_id,
+                "path": request.path,
+                "n_plus_one": [
+                    {"shape": query.shape, "count": query.count, "stack": query.stack}
+                    for query in repeated
+                ],
+            },
+        )
 
     def _should_skip_logging(self, request: HttpRequest) -> bool:
         """Check if request should be excluded from logging."""
@@ -82,8 +240,14 @@ class RequestLoggingMiddleware:
         response: HttpResponse,
         request_id: str,
         duration: float,
+        query_stats: QueryStats | None = None,
     ) -> None:
-        """Log response with status code and duration."""
+        """Log response with status code, duration and query statistics.
+
+        Errors and slow requests are always logged. In production only a
+        ``LOG_SAMPLE_RATE`` fraction of other responses is, and the rate is
+        recorded so log pipelines can weight the sampled lines.
+        """
         status_code = response.status_code
         log_data = {
             "request_id": request_id,
@@ -91,59 +255,92 @@ class RequestLoggingMiddleware:
             "path": request.path,
             "status_code": status_code,
             "duration_ms": duration,
+            "user_id": self._get_user_id(request),
         }
 
         message = (
             f"[{request_id}] {request.method} {request.path} - "
             f"{status_code} ({duration}ms)"
         )
+        if query_stats is not None:
+            log_data.update(query_stats.as_log_data())
+            message += (
+                f" - {query_stats.count} queries "
+                f"({log_data['db_time_ms']}ms, {query_stats.duplicates} duplicated)"
+            )
 
         if status_code >= 500:
             self.error_logger.error(message, extra=log_data)
         elif status_code >= 400:
             self.logger.warning(message, extra=log_data)
+        elif duration >= self.slow_request_ms:
+            log_data["slow"] = True
+            self.logger.warning(f"{message} - slow", extra=log_data)
         elif not self.is_production:
             self.logger.info(message, extra=log_data)
+        elif random.random() < self.sample_rate:
+            log_data["sample_rate"] = self.sample_rate
+            self.logger.info(message, extra=log_data)
 
     def _log_request_body(self, request: HttpRequest, request_id: str) -> None:
-        """Log filtered request body based on configuration."""
-        if not self.log_request_bodies:
+        """Log the start of the JSON request body with sensitive values redacted.
+
+        The body is never parsed: at most ``LOG_REQUEST_BODY_MAX_BYTES`` are
+        decoded and redacted in one regex pass, so bulk payloads with
+        thousands of rows cost the same to log as small ones.
+        """
+        if not self.log_request_bodies or not self.logger.isEnabledFor(logging.DEBUG):
             return
 
-        try:
-            if hasattr(request, "body") and request.body:
-                body = json.loads(request.body.decode("utf-8"))
-                filtered_body = self._filter_sensitive_data(body)
+        body = request.body if hasattr(request, "body") else b""
+        if not body:
+            return
 
-                self.logger.debug(
-                    f"[{request_id}] Request body: {json.dumps(filtered_body)}",
-                    extra={"request_id": request_id},
-                )
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            self.logger.debug(
-                f"[{request_id}] Request body: <non-JSON data>",
-                extra={"request_id": request_id},
-            )
+        size = len(body)
+        if "json" not in (request.content_type or ""):
+            text = f"<non-JSON data, {size} bytes>"
+        else:
+            head = body[: self.body_max_bytes].decode("utf-8", errors="replace")
+            text = self._redact(head)
+            if size > self.body_max_bytes:
+                text += f"... <truncated, {size} bytes total>"
 
-    def _filter_sensitive_data(self, data: Any) -> Any:
-        """Remove or redact sensitive fields from data."""
-        if not isinstance(data, dict):
-            return data
-
-        filtered = {}
-        for key, value in data.items():
-            if key.lower() in SecurityConstants.SENSITIVE_FIELDS:
-                filtered[key] = "[REDACTED]"
-            elif key.lower() in SecurityConstants.PARTIALLY_REDACTED_FIELDS:
-                filtered[key] = self._partially_redact(str(value))
-            elif isinstance(value, dict):
-                filtered[key] = self._filter_sensitive_data(value)
-            elif isinstance(value, list):
-                filtered[key] = [self._filter_sensitive_data(item) for item in value]  # type: ignore[assignment]
-            else:
-                filtered[key] = value
+        self.logger.debug(
+            f"[{request_id}] Request body: {text}",
+            extra={"request_id": request_id, "body_bytes": size},
+        )
 
-        return filtered
+    def _redact(self, text: str) -> str:
+        """Return JSON ``text`` with the values of sensitive keys redacted.
+
+        The text is walked string by string, so key-like text inside a value
+        is never taken for a key. Arrays and objects under a sensitive key are
+        replaced as a whole.
+        """
+        parts = []
+        position = 0
+        while (string := JSON_STRING_RE.search(text, position)) is not None:
+            separator = KEY_SEPARATOR_RE.match(text, string.end())
+            key = string.group()[1:-1].lower()
+            if separator is None or not (
+                key in SecurityConstants.SENSITIVE_FIELDS
+                or key in SecurityConstants.PARTIALLY_REDACTED_FIELDS
+            ):
+                parts.append(text[position : string.end()])
+                position = string.end()
+                continue
+            end = json_value_end(text, separator.end())
+            value = text[separator.end() : end]
+            if key in SecurityConstants.SENSITIVE_FIELDS or value.startswith(
+                ("[", "{")
+            ):
+                redacted = "[REDACTED]"
+            else:
+                redacted = self._partially_redact(value.strip('"'))
+            parts.append(f'{text[position : separator.end()]}"{redacted}"')
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
 
     def _partially_redact(self, value: str) -> str:
         """Partially hide sensitive values like emails."""
@@ -163,6 +360,16 @@ class RequestLoggingMiddleware:
 
         return request.META.get("REMOTE_ADDR", "unknown")
 
+    def _get_user_id(self, request: HttpRequest) -> int | None:
+        """Return the authenticated user's id without forcing a lazy lookup."""
+        user = getattr(request, "user", None)
+        # DRF sets the resolved user on the request; a still-lazy user would
+        # need a session query just for logging.
+        user = getattr(user, "_wrapped", user)
+        if user is None or user is empty or not user.is_authenticated:
+            return None
+        return user.pk
+
     def _get_user_info(self, request: HttpRequest) -> dict[str, Any]:
         """Get authenticated user information if available."""
         if hasattr(request, "user") and request.user.is_authenticated:
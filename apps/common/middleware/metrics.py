@@ -0,0 +1,126 @@
+"""Request metrics middleware for the Wedding Planner API."""
+
+import atexit
+import os
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from apps.common.metrics import registry, write_snapshot
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP responses by resolved view, method and status code",
+    labelnames=("view", "method", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests by resolved view and method",
+    labelnames=("view", "method"),
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries",
+    "Database queries per HTTP request by resolved view",
+    labelnames=("view",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+http_exceptions = registry.counter(
+    "http_exceptions_total",
+    "Unhandled exceptions raised by views by resolved view and exception type",
+    labelnames=("view", "exception"),
+)
+
+UNMATCHED_VIEW = "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Record request counts, latency and query counts per resolved view.
+
+    Views are labelled by their namespaced URL name (``guests:list_guests``)
+    rather than the path, so label cardinality stays bounded. With
+    ``METRICS_MULTIPROC_DIR`` set, every worker process writes its values to
+    that directory at most once per ``METRICS_FLUSH_INTERVAL_SECONDS`` and at
+    exit, for the ``/metrics`` view to merge.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Initialize the middleware with response handler."""
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.multiproc_dir = getattr(settings, "METRICS_MULTIPROC_DIR", None)
+        self.flush_interval = getattr(settings, "METRICS_FLUSH_INTERVAL_SECONDS", 1.0)
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+        if self.multiproc_dir:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+            atexit.register(self.flush)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Time the request and record its metrics."""
+        if self.is_async:
+            return self.__acall__(request)  # type: ignore[return-value]
+
+        start_time = time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - start_time)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Time the request on the event loop and record its metrics."""
+        start_time = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - start_time)
+        return response
+
+    def process_exception(self, request: HttpRequest, exception: Exception) -> None:
+        """Count exceptions raised by views; Django still renders the 500."""
+        http_exceptions.inc(
+            view=self._view_name(request), exception=type(exception).__name__
+        )
+
+    def _record(
+        self, request: HttpRequest, response: HttpResponse, duration: float
+    ) -> None:
+        """Record the finished request and flush if it is time to."""
+        view = self._view_name(request)
+        http_requests.inc(view=view, method=request.method, status=response.status_code)
+        http_request_duration.observe(duration, view=view, method=request.method)
+        # Set by RequestLoggingMiddleware while LOG_QUERY_STATS is on.
+        query_stats = getattr(request, "query_stats", None)
+        if query_stats is not None:
+            http_request_db_queries.observe(query_stats.count, view=view)
+        self._maybe_flush()
+
+    def _view_name(self, request: HttpRequest) -> str:
+        """Return the namespaced URL name of the view that handled ``request``."""
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return UNMATCHED_VIEW
+        return match.view_name or UNMATCHED_VIEW
+
+    def _maybe_flush(self) -> None:
+        """Write a snapshot if the flush interval has passed."""
+        if not self.multiproc_dir:
+            return
+        now = time.monotonic()
+        if now - self._last_flush < self.flush_interval:
+            return
+        if self._flush_lock.acquire(blocking=False):
+            try:
+                self._last_flush = now
+                write_snapshot(self.multiproc_dir)
+            finally:
+                self._flush_lock.release()
+
+    def flush(self) -> None:
+        """Write this process's metrics to the shared directory."""
+        if self.multiproc_dir:
+            write_snapshot(self.multiproc_dir)
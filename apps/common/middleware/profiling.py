@@ -0,0 +1,141 @@
+"""Opt-in request profiling middleware for Wedding Planner API."""
+
+import cProfile
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from apps.common.logging_constants import LoggingConstants
+from apps.common.metrics import registry
+from apps.common.profiling import StackSampler, prune_profiles, write_collapsed
+
+request_profiles = registry.counter(
+    "request_profiles_total",
+    "Request profiles written by trigger",
+    labelnames=("trigger",),
+)
+
+
+class RequestProfilingMiddleware:
+    """Profile a sample of requests, and every slow request, to disk.
+
+    Enabled with ``PROFILE_REQUESTS``. A ``PROFILE_SAMPLE_RATE`` fraction of
+    requests runs under ``cProfile`` and is written as a ``.pstats`` file.
+    Every request is also watched by a stack sampler, and its samples are
+    written as a ``.collapsed`` file (for flamegraphs) when the request was
+    sampled or took at least ``PROFILE_SLOW_REQUEST_MS``. Files are named
+    ``<timestamp>-<request_id>`` and go to ``PROFILES_DIR``; the oldest are
+    deleted once the directory grows beyond ``PROFILE_MAX_BYTES``.
+
+    Under ASGI requests share the event loop thread, so their stacks cannot be
+    told apart; async requests pass through unprofiled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Initialize the middleware, or drop out of the chain if disabled."""
+        if not getattr(settings, "PROFILE_REQUESTS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.logger = logging.getLogger("apps.profiling")
+        self.sample_rate = getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+        self.slow_request_ms = getattr(settings, "PROFILE_SLOW_REQUEST_MS", 1000)
+        self.max_bytes = getattr(settings, "PROFILE_MAX_BYTES", 100 * 1024 * 1024)
+        self.directory = Path(
+            getattr(settings, "PROFILES_DIR", settings.BASE_DIR / "logs" / "profiles")
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sampler = StackSampler(
+            interval=getattr(settings, "PROFILE_INTERVAL_MS", 5) / 1000
+        )
+        self._prune_lock = threading.Lock()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Run the request under the profilers."""
+        if self.is_async:
+            return self.__acall__(request)  # type: ignore[return-value]
+        if self._should_skip(request):
+            return self.get_response(request)
+
+        profile = cProfile.Profile() if random.random() < self.sample_rate else None
+        start_time = time.perf_counter()
+        self.sampler.start()
+        try:
+            if profile is not None:
+                response = profile.runcall(self.get_response, request)
+            else:
+                response = self.get_response(request)
+        finally:
+            samples = self.sampler.stop()
+        duration = (time.perf_counter() - start_time) * 1000
+
+        if profile is not None:
+            self._write(request, duration, "sampled", samples, profile)
+        elif duration >= self.slow_request_ms:
+            self._write(request, duration, "slow", samples)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Pass async requests through unprofiled."""
+        return await self.get_response(request)
+
+    def _should_skip(self, request: HttpRequest) -> bool:
+        """Check if request should be excluded from profiling."""
+        return any(
+            request.path.startswith(path) for path in LoggingConstants.EXCLUDED_PATHS
+        )
+
+    def _write(
+        self,
+        request: HttpRequest,
+        duration: float,
+        trigger: str,
+        samples: Counter[str],
+        profile: cProfile.Profile | None = None,
+    ) -> None:
+        """Write the profile files and keep the directory within its budget."""
+        # Set by RequestLoggingMiddleware, which runs before this middleware.
+        request_id = getattr(request, "request_id", None) or uuid.uuid4().hex[:8]
+        stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}"
+        paths = []
+        if profile is not None:
+            path = self.directory / f"{stem}.pstats"
+            profile.dump_stats(path)
+            paths.append(path)
+        if samples:
+            path = self.directory / f"{stem}.collapsed"
+            write_collapsed(path, samples)
+            paths.append(path)
+        if not paths:
+            return
+
+        request_profiles.inc(trigger=trigger)
+        self.logger.info(
+            f"[{request_id}] {request.method} {request.path} profiled "
+            f"({trigger}, {duration:.2f}ms)",
+            extra={
+                "request_id": request_id,
+                "duration_ms": round(duration, 2),
+                "profile_trigger": trigger,
+                "profile_files": [path.name for path in paths],
+            },
+        )
+        if self._prune_lock.acquire(blocking=False):
+            try:
+                prune_profiles(self.directory, self.max_bytes)
+            finally:
+                self._prune_lock.release()
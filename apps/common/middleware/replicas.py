@@ -0,0 +1,51 @@
+"""Read-your-writes stickiness for read-replica routing."""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import HttpRequest, HttpResponse
+
+from apps.common.db.routers import pin_to_primary, replicas_configured
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReplicaPinningMiddleware:
+    """Pin users to the primary database for a short window after they write."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Initialize the middleware with response handler."""
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Pin the requesting user after any unsafe request."""
+        if self.is_async:
+            return self.__acall__(request)  # type: ignore[return-value]
+
+        response = self.get_response(request)
+        if self._should_pin(request):
+            self._pin_user(request)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Pin the requesting user after any unsafe request, asynchronously."""
+        response = await self.get_response(request)
+        if self._should_pin(request):
+            # Resolving the user may hit the session store.
+            await sync_to_async(self._pin_user)(request)
+        return response
+
+    def _should_pin(self, request: HttpRequest) -> bool:
+        """Return whether the request may have written to the primary."""
+        return request.method not in SAFE_METHODS and replicas_configured()
+
+    def _pin_user(self, request: HttpRequest) -> None:
+        """Pin the authenticated user, if any."""
+        # DRF copies the JWT-authenticated user onto the Django request.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
@@ -0,0 +1,73 @@
+"""Keep session, CSRF, auth and message middleware off the API's request path.
+
+API clients authenticate with a JWT on every request, yet Django's session
+middleware would still load the session (one query on the session table)
+for any request carrying a session cookie, such as a browser also signed in
+to the admin. The subclasses here behave exactly like Django's own, except
+that requests under ``SESSIONLESS_PATH_PREFIXES`` go straight to the next
+middleware. Setting ``API_SESSION_AUTH`` restores the full stack for every
+path, together with DRF's ``SessionAuthentication``.
+
+Because they subclass the originals, the admin's system checks for the
+session, auth and message middleware keep passing.
+"""
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.http import HttpRequest, HttpResponse
+from django.middleware import csrf
+
+
+class BrowserOnlyMiddlewareMixin:
+    """Pass requests for sessionless paths through without processing them."""
+
+    def __init__(self, get_response):
+        """Read the sessionless path prefixes once, when the stack is built."""
+        super().__init__(get_response)  # type: ignore[call-arg]
+        self.sessionless_prefixes = (
+            ()
+            if settings.API_SESSION_AUTH
+            else tuple(settings.SESSIONLESS_PATH_PREFIXES)
+        )
+
+    def is_sessionless(self, request: HttpRequest) -> bool:
+        """Return whether ``request`` skips this middleware."""
+        return request.path_info.startswith(self.sessionless_prefixes)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Process browser requests; hand sessionless ones straight on."""
+        if self.is_sessionless(request):
+            # A coroutine under ASGI, which the handler awaits.
+            return self.get_response(request)  # type: ignore[attr-defined]
+        return super().__call__(request)  # type: ignore[misc]
+
+
+class SessionMiddleware(BrowserOnlyMiddlewareMixin, sessions.SessionMiddleware):
+    """``SessionMiddleware`` that leaves sessionless paths alone."""
+
+
+class CsrfViewMiddleware(BrowserOnlyMiddlewareMixin, csrf.CsrfViewMiddleware):
+    """``CsrfViewMiddleware`` that leaves sessionless paths alone."""
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        """Check the CSRF token, except on sessionless paths."""
+        # The handler calls process_view directly, bypassing __call__.
+        if self.is_sessionless(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(
+    BrowserOnlyMiddlewareMixin, auth.AuthenticationMiddleware
+):
+    """``AuthenticationMiddleware`` that leaves sessionless paths alone.
+
+    On those paths ``request.user`` is only set once DRF has authenticated
+    the request.
+    """
+
+
+class MessageMiddleware(BrowserOnlyMiddlewareMixin, messages.MessageMiddleware):
+    """``MessageMiddleware`` that leaves sessionless paths alone."""
@@ -0,0 +1,73 @@
+"""Attach OpenAPI documentation to views only when the schema is generated.
+
+Each app's ``docs.py`` builds dozens of ``extend_schema`` decorators full of
+examples at import time, which every worker paid for at boot although only
+schema generation reads them. Views reference them through :class:`LazyDocs`
+instead::
+
+    docs = LazyDocs("apps.guests.docs")
+
+    @docs.guest_list_docs
+    @api_view(["GET"])
+    def list_guests(request): ...
+
+With ``LAZY_API_DOCS`` on, the decorator only records the view; the docs
+module is imported and its decorators applied by :class:`SchemaGenerator`
+the first time a schema is generated. With it off, ``docs.<name>`` is the
+``extend_schema`` decorator itself, applied at import as before.
+"""
+
+import threading
+from collections.abc import Callable
+from importlib import import_module
+from typing import TypeVar
+
+from django.conf import settings
+from django.urls import get_resolver
+from drf_spectacular.generators import SchemaGenerator as BaseSchemaGenerator
+
+View = TypeVar("View", bound=Callable)
+
+# (view, docs module, decorator name) still waiting to be applied.
+_deferred: list[tuple[Callable, str, str]] = []
+_lock = threading.Lock()
+
+
+class LazyDocs:
+    """Decorators from a docs module, applied at schema generation."""
+
+    def __init__(self, module: str):
+        """Refer to the decorators defined in ``module``."""
+        self.module = module
+
+    def __getattr__(self, name: str) -> Callable[[View], View]:
+        """Return a decorator applying the docs module's ``name`` later."""
+        if not settings.LAZY_API_DOCS:
+            return getattr(import_module(self.module), name)
+
+        def defer(view: View) -> View:
+            with _lock:
+                _deferred.append((view, self.module, name))
+            return view
+
+        return defer
+
+
+def apply_deferred_docs() -> None:
+    """Apply every recorded documentation decorator to its view."""
+    with _lock:
+        while _deferred:
+            view, module, name = _deferred.pop(0)
+            getattr(import_module(module), name)(view)
+
+
+class SchemaGenerator(BaseSchemaGenerator):
+    """Schema generator that first attaches the deferred documentation."""
+
+    def get_schema(self, request=None, public=False):
+        """Apply deferred docs, then generate the schema."""
+        # Views register their docs when the URLconf imports them, which in a
+        # fresh process has not happened yet.
+        get_resolver(self.urlconf).url_patterns  # noqa: B018
+        apply_deferred_docs()
+        return super().get_schema(request=request, public=public)
@@ -0,0 +1,126 @@
+"""Request profiling helpers.
+
+:class:`StackSampler` is a low-overhead sampling profiler: one background
+thread periodically records the stack of every registered thread, which is
+cheap enough to leave on for each request and only keep the result when the
+request turned out to be slow. Samples are kept in the collapsed-stack format
+(``outer;inner;leaf count``) that flamegraph tools read directly.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+MAX_STACK_DEPTH = 128
+
+
+def frame_label(frame: FrameType) -> str:
+    """Return the ``module:qualified_name`` label of a stack frame."""
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def collapse_stack(frame: FrameType | None, max_depth: int = MAX_STACK_DEPTH) -> str:
+    """Return the stack ending in ``frame`` as ``outer;...;inner``."""
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Sample the stacks of registered threads from a background thread.
+
+    Args:
+        interval: Seconds between samples.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """Create the sampler; its thread starts with the first registration."""
+        self.interval = interval
+        self._samples: dict[int, Counter[str]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid: int | None = None
+
+    def start(self, thread_id: int | None = None) -> None:
+        """Start sampling ``thread_id`` (the calling thread by default)."""
+        thread_id = thread_id or threading.get_ident()
+        self._ensure_thread()
+        with self._lock:
+            self._samples[thread_id] = Counter()
+        self._wakeup.set()
+
+    def stop(self, thread_id: int | None = None) -> Counter[str]:
+        """Stop sampling ``thread_id`` and return its collapsed stacks."""
+        thread_id = thread_id or threading.get_ident()
+        with self._lock:
+            return self._samples.pop(thread_id, Counter())
+
+    def _ensure_thread(self) -> None:
+        """Start the sampling thread once per process (again after a fork)."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._samples.clear()
+            threading.Thread(
+                target=self._run, name="stack-sampler", daemon=True
+            ).start()
+            self._pid = pid
+
+    def _run(self) -> None:
+        """Take a sample of every registered thread each interval."""
+        own_id = threading.get_ident()
+        while True:
+            if not self._samples:
+                self._wakeup.wait()
+                self._wakeup.clear()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, samples in self._samples.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own_id:
+                        samples[collapse_stack(frame)] += 1
+            del frames
+
+
+def write_collapsed(path: Path, samples: Counter[str]) -> None:
+    """Write samples in the collapsed-stack format, most frequent first."""
+    path.write_text(
+        "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+    )
+
+
+def prune_profiles(directory: Path, max_bytes: int) -> list[Path]:
+    """Delete the oldest files in ``directory`` until it fits in ``max_bytes``.
+
+    Returns:
+        The deleted paths.
+    """
+    files = []
+    for path in directory.iterdir():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+
+    total = sum(size for _, size, _ in files)
+    deleted = []
+    for _, size, path in files:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        deleted.append(path)
+    return deleted
@@ -0,0 +1,195 @@
+"""Serve the OpenAPI schema and its docs pages from memory.
+
+Generating the schema introspects every view and serializer, which is far
+too slow to repeat per request. ``python manage.py build_schema`` writes it
+to ``OPENAPI_SCHEMA_PATH`` at deploy time; each process reads that file once
+and serves the bytes, gzipped when the client accepts it, with an ETag
+derived from their SHA-256 digest.
+
+The schema is also available at ``/api/schema/<digest>/``, which never
+changes and may be cached for a year. Swagger UI and Redoc are rendered once
+per schema digest and point at that URL, so browsers only fetch the schema
+again after a deploy changed it. With ``DEBUG`` on the schema is generated
+on every request instead, so edits show up without a build step.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.views.decorators.http import require_safe
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CONTENT_TYPE = "application/vnd.oai.openapi+json"
+HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+DOCS_PAGES = {"swagger-ui": SpectacularSwaggerView, "redoc": SpectacularRedocView}
+
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+@dataclass(frozen=True)
+class Document:
+    """A response body prepared once and served many times."""
+
+    content: bytes
+    gzipped: bytes
+    digest: str
+    content_type: str
+    headers: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def build(
+        cls, content: bytes, content_type: str, headers: dict[str, str] | None = None
+    ) -> "Document":
+        """Compress ``content`` and compute its digest."""
+        return cls(
+            content=content,
+            gzipped=gzip.compress(content, mtime=0),
+            digest=hashlib.sha256(content).hexdigest()[:16],
+            content_type=content_type,
+            headers=tuple((headers or {}).items()),
+        )
+
+    @property
+    def etag(self) -> str:
+        """Return the ETag, weak so it holds for the gzipped body too."""
+        return f'W/"{self.digest}"'
+
+
+def generate_schema() -> bytes:
+    """Introspect the URL configuration and return the schema as JSON."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(
+        request=None, public=spectacular_settings.SERVE_PUBLIC
+    )
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def write_schema(path: Path) -> Document:
+    """Generate the schema into ``path``, replacing it atomically."""
+    content = generate_schema()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+    return Document.build(content, SCHEMA_CONTENT_TYPE)
+
+
+@lru_cache(maxsize=4)
+def _load_schema(path: str) -> Document:
+    """Read the prebuilt schema at ``path``, generating it if missing."""
+    try:
+        content = Path(path).read_bytes()
+    except FileNotFoundError:
+        logger.warning(
+            "No prebuilt OpenAPI schema at %s; generating it for this process. "
+            "Run 'python manage.py build_schema' when deploying.",
+            path,
+        )
+        content = generate_schema()
+    return Document.build(content, SCHEMA_CONTENT_TYPE)
+
+
+def current_schema() -> Document:
+    """Return the schema to serve: prebuilt, or freshly generated in DEBUG."""
+    if settings.DEBUG:
+        return Document.build(generate_schema(), SCHEMA_CONTENT_TYPE)
+    return _load_schema(str(settings.OPENAPI_SCHEMA_PATH))
+
+
+@lru_cache(maxsize=8)
+def _render_page(name: str, schema_url: str) -> Document:
+    """Render a docs page pointing at ``schema_url``.
+
+    The page is rendered without a request, so it carries no CSRF token and
+    is the same for every visitor.
+    """
+    view = DOCS_PAGES[name](url=schema_url)
+    response = view.get(HttpRequest())
+    content = render_to_string(response.template_name, response.data)
+    headers = {
+        header: value
+        for header, value in response.items()
+        if header.lower() != "content-type"
+    }
+    return Document.build(content.encode(), HTML_CONTENT_TYPE, headers)
+
+
+def serve(
+    request: HttpRequest, document: Document, max_age: int, immutable: bool = False
+) -> HttpResponse:
+    """Return ``document``, gzipped if accepted, honouring If-None-Match."""
+    response = HttpResponse(content_type=document.content_type)
+    for header, value in document.headers:
+        response[header] = value
+    if ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")):
+        response.content = document.gzipped
+        response["Content-Encoding"] = "gzip"
+    else:
+        response.content = document.content
+    response["ETag"] = document.etag
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if settings.DEBUG:
+        patch_cache_control(response, no_cache=True)
+    elif immutable:
+        patch_cache_control(response, public=True, max_age=max_age, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=max_age)
+    # A 304 when If-None-Match matches, otherwise the response itself.
+    return (
+        get_conditional_response(request, etag=document.etag, response=response)
+        or response
+    )
+
+
+@require_safe
+def schema(request: HttpRequest) -> HttpResponse:
+    """Serve the OpenAPI schema."""
+    return serve(request, current_schema(), settings.OPENAPI_CACHE_MAX_AGE)
+
+
+@require_safe
+def versioned_schema(request: HttpRequest, digest: str) -> HttpResponse:
+    """Serve the schema whose digest is ``digest``; redirect once it changed."""
+    document = current_schema()
+    if digest != document.digest:
+        return HttpResponseRedirect(reverse("schema"))
+    return serve(request, document, IMMUTABLE_MAX_AGE, immutable=True)
+
+
+def serve_docs_page(request: HttpRequest, name: str) -> HttpResponse:
+    """Serve docs page ``name`` for the current schema."""
+    schema_url = reverse("schema-versioned", args=[current_schema().digest])
+    document = _render_page(name, schema_url)
+    return serve(request, document, settings.OPENAPI_CACHE_MAX_AGE)
+
+
+@require_safe
+def swagger_ui(request: HttpRequest) -> HttpResponse:
+    """Serve Swagger UI."""
+    return serve_docs_page(request, "swagger-ui")
+
+
+@require_safe
+def redoc(request: HttpRequest) -> HttpResponse:
+    """Serve Redoc."""
+    return serve_docs_page(request, "redoc")
@@ -0,0 +1,386 @@
+"""Synthetic wedding data for seeding, load tests and benchmarks.
+
+Generated values pass the apps' validators: people get Kenyan first names and
+surnames, phones are ``+2547XXXXXXXX`` or ``+2541XXXXXXXX``, and budgets stay
+within ``ValidationLimits``. Everything is drawn from the ``random.Random``
+passed in, so a given seed always produces the same data.
+
+:func:`seed_wedding` creates one couple and returns its objects;
+:func:`seed_weddings` inserts many couples with ``bulk_create`` in batches and
+only returns row counts, which is what large volumes need.
+:func:`scratch_database` provides a database to seed throwaway data into.
+"""
+
+import random
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, router, transaction
+from django.utils import timezone
+
+from apps.common.cache import bump_profile_version
+from apps.common.constants import (
+    RSVPStatus,
+    TaskAssignment,
+    ValidationLimits,
+    VendorCategory,
+)
+from apps.guests.models import Guest
+from apps.profiles.models import WeddingProfile
+from apps.tasks.models import Task
+from apps.vendors.models import Vendor
+
+FEMALE_NAMES = tuple(
+    (
+        "Achieng Adhiambo Akinyi Amina Atieno Awino Chebet Faith Grace Halima "
+        "Jepchirchir Kanini Kerubo Khadija Makena Mary Mercy Moraa Mwende "
+        "Nafula Naliaka Nekesa Njeri Nyokabi Wairimu Wambui Wanjiku Zawadi"
+    ).split()
+)
+MALE_NAMES = tuple(
+    (
+        "Baraka Barasa Brian Dennis Hassan James Juma Kamau Kevin Kibet "
+        "Kipchoge Kiprotich Lomuria Mugo Musyoka Mutua Mwangi Njoroge Nyaga "
+        "Ochieng Omondi Onyango Otieno Peter Salim Vincent Wafula"
+    ).split()
+)
+SURNAMES = tuple(
+    (
+        "Ali Barasa Chege Cheruiyot Ekiru Githinji Hassan Juma Kamau Karanja "
+        "Kariuki Kimani Kiptoo Lokol Maina Mbugua Mohamed Muthoni Mutua Mwangi "
+        "Njoroge Nyamweya Ochieng Odhiambo Omar Ongeri Onyango Otieno Rotich "
+        "Simiyu Wafula Wanjiku Wekesa"
+    ).split()
+)
+VENUES = (
+    "Brackenhurst, Limuru",
+    "Enashipai Resort & Spa, Naivasha",
+    "Fairmont Mount Kenya Safari Club",
+    "Great Rift Valley Lodge, Naivasha",
+    "Kentmere Club, Limuru",
+    "Lake Naivasha Country Club",
+    "Ole Sereni, Nairobi",
+    "Safari Park Hotel, Nairobi",
+    "Sarova Whitesands, Mombasa",
+    "Windsor Golf Hotel & Country Club",
+)
+PLACES = tuple(
+    (
+        "Amboseli Diani Kilifi Lamu Malindi Marula Mara Nakuru Nanyuki Savannah "
+        "Turkana Tsavo"
+    ).split()
+)
+VENDOR_TRADES = {
+    VendorCategory.CATERING: "Caterers",
+    VendorCategory.PHOTOGRAPHY: "Studios Photography",
+    VendorCategory.VIDEOGRAPHY: "Films",
+    VendorCategory.MUSIC_DJ: "DJs & Sound",
+    VendorCategory.LIVE_BAND: "Band",
+    VendorCategory.FLOWERS: "Florists",
+    VendorCategory.DECORATIONS: "Decor",
+    VendorCategory.VENUE: "Gardens",
+    VendorCategory.TRANSPORTATION: "Car Hire",
+    VendorCategory.BEAUTY: "Beauty Parlour",
+    VendorCategory.ATTIRE: "Bridal Wear",
+    VendorCategory.JEWELRY: "Jewellers",
+    VendorCategory.STATIONERY: "Prints",
+    VendorCategory.CAKE: "Cakes & Pastries",
+    VendorCategory.PLANNING: "Events",
+    VendorCategory.OTHER: "Services",
+}
+TASK_TITLES = (
+    "Book the venue",
+    "Confirm the caterer",
+    "Book the photographer",
+    "Order the wedding cake",
+    "Send the invitations",
+    "Arrange ruracio negotiations",
+    "Plan the dowry ceremony",
+    "Hire the DJ",
+    "Book traditional drummers",
+    "Choose the bridal gown",
+    "Fit the groom's suit",
+    "Book guest transport",
+    "Confirm the florist",
+    "Print the programme",
+    "Plan the seating chart",
+)
+EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "outlook.com")
+
+
+@dataclass
+class SeededWedding:
+    """A couple created by :func:`seed_wedding` and its planning data."""
+
+    user: object
+    profile: WeddingProfile
+    guests: list[Guest]
+    tasks: list[Task]
+    vendors: list[Vendor]
+
+
+class WeddingDataFactory:
+    """Build unsaved model instances with plausible, valid values."""
+
+    def __init__(self, rng: random.Random):
+        """Draw every value from ``rng``."""
+        self.rng = rng
+        self.categories = [value for value, _ in VendorCategory.CHOICES]
+        self.statuses = [value for value, _ in RSVPStatus.CHOICES]
+        self.assignments = [value for value, _ in TaskAssignment.CHOICES]
+
+    def person(self, first_names=None) -> str:
+        """Return a first name and surname."""
+        first_names = first_names or self.rng.choice((FEMALE_NAMES, MALE_NAMES))
+        return f"{self.rng.choice(first_names)} {self.rng.choice(SURNAMES)}"
+
+    def phone(self) -> str:
+        """Return a Kenyan mobile number in international format."""
+        return f"+254{self.rng.choice('17')}{self.rng.randrange(10**8):08d}"
+
+    def email(self, name: str, number: int) -> str:
+        """Return an address for ``name``, made unique by ``number``."""
+        local = name.lower().replace(" ", ".")
+        return f"{local}{number}@{self.rng.choice(EMAIL_DOMAINS)}"
+
+    def user(self, username: str, password: str):
+        """Return a user with an already hashed ``password``."""
+        first_name, last_name = self.person().split(" ", 1)
+        return get_user_model()(
+            username=username,
+            email=f"{username}@example.com",
+            first_name=first_name,
+            last_name=last_name,
+            password=password,
+        )
+
+    def profile(self, user) -> WeddingProfile:
+        """Return a wedding profile for ``user``."""
+        return WeddingProfile(
+            user=user,
+            wedding_date=date.today() + timedelta(days=self.rng.randint(30, 540)),
+            bride_name=self.person(FEMALE_NAMES),
+            groom_name=self.person(MALE_NAMES),
+            venue=self.rng.choice(VENUES),
+            budget=Decimal(self.rng.randrange(300_000, 5_000_000, 1000)),
+        )
+
+    def vendor(self, profile: WeddingProfile, number: int) -> Vendor:
+        """Return a vendor for ``profile``."""
+        category = self.rng.choice(self.categories)
+        name = f"{self.rng.choice(PLACES)} {VENDOR_TRADES[category]}"
+        contact = self.person()
+        return Vendor(
+            wedding_profile=profile,
+            name=name,
+            category=category,
+            contact_person=contact,
+            phone=self.phone(),
+            email=self.email(contact, number),
+        )
+
+    def guest(self, number: int) -> dict:
+        """Return a guest's field values; a fifth have no email."""
+        name = self.person()
+        return {
+            "name": name,
+            "email": self.email(name, number) if self.rng.random() < 0.8 else "",
+            "rsvp_status": self.rng.choice(self.statuses),
+            "plus_one": self.rng.random() < 0.3,
+        }
+
+    def task(self, vendor_ids: list[int]) -> dict:
+        """Return a task's field values, linked to a vendor half the time."""
+        return {
+            "title": self.rng.choice(TASK_TITLES),
+            "description": "",
+            "assigned_to": self.rng.choice(self.assignments),
+            "is_completed": self.rng.random() < 0.4,
+            "vendor_id": self.rng.choice(vendor_ids)
+            if vendor_ids and self.rng.random() < 0.5
+            else None,
+        }
+
+
+def insert_rows(model, rows: list[dict], batch_size: int) -> None:
+    """Insert ``rows`` (field values keyed by name) with multi-row INSERTs.
+
+    This skips ``bulk_create``'s per-value field preparation, which caps it at
+    around 15k rows per second, so values must already be in database form.
+    Every row needs the same keys; ``auto_now`` and ``auto_now_add``
+    timestamps are filled in. Neither save signals nor the cache-invalidating
+    ``bulk_create`` run, so callers bump the profiles they touch.
+    """
+    if not rows:
+        return
+    connection = connections[router.db_for_write(model)]
+    columns = [model._meta.get_field(name) for name in rows[0]]
+    timestamps = [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    extra = (now,) * len(timestamps)
+    columns.extend(timestamps)
+    batch_size = min(batch_size, connection.ops.bulk_batch_size(columns, rows))
+    quote = connection.ops.quote_name
+    statement = (
+        f"INSERT INTO {quote(model._meta.db_table)} "
+        f"({', '.join(quote(column.column) for column in columns)}) VALUES "
+    )
+    placeholder = f"({', '.join(['%s'] * len(columns))})"
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            cursor.execute(
+                statement + ", ".join([placeholder] * len(batch)),
+                [value for row in batch for value in (*row.values(), *extra)],
+            )
+
+
+def seed_wedding(
+    username: str,
+    *,
+    guests: int,
+    tasks: int,
+    vendors: int,
+    rng: random.Random,
+    password: str | None = None,
+) -> SeededWedding:
+    """Create a user with a wedding profile and the given data volumes."""
+    factory = WeddingDataFactory(rng)
+    user = factory.user(username, make_password(password))
+    user.save()
+    profile = factory.profile(user)
+    profile.save()
+    vendor_rows = Vendor.objects.bulk_create(
+        factory.vendor(profile, number) for number in range(vendors)
+    )
+    guest_rows = Guest.objects.bulk_create(
+        Guest(wedding_profile=profile, **factory.guest(number))
+        for number in range(guests)
+    )
+    vendor_ids = [vendor.pk for vendor in vendor_rows]
+    task_rows = Task.objects.bulk_create(
+        Task(wedding_profile=profile, **factory.task(vendor_ids)) for _ in range(tasks)
+    )
+    return SeededWedding(user, profile, guest_rows, task_rows, vendor_rows)
+
+
+def seed_weddings(
+    couples: int,
+    *,
+    guests: int,
+    tasks: int,
+    vendors: int,
+    rng: random.Random,
+    username_prefix: str,
+    password: str | None = None,
+    batch_size: int = 1000,
+    progress: Callable[[dict[str, int]], None] | None = None,
+) -> dict[str, int]:
+    """Create ``couples`` weddings in batches and return the rows per model.
+
+    Couples are processed in groups of about ``batch_size`` rows, each group
+    in one transaction, so memory stays bounded and rows are not committed
+    one by one. Users, profiles and vendors go through ``bulk_create`` (their
+    primary keys are needed); guests and tasks, the bulk of the rows, through
+    :func:`insert_rows`. The password is hashed once and shared, since hashing
+    dominates otherwise. ``progress`` is called with the running counts after
+    each group.
+    """
+    if guests > ValidationLimits.MAX_GUESTS:
+        raise ValueError(
+            f"A wedding cannot have more than {ValidationLimits.MAX_GUESTS} guests."
+        )
+    factory = WeddingDataFactory(rng)
+    password_hash = make_password(password)
+    per_couple = 2 + guests + tasks + vendors
+    group_size = max(1, batch_size // per_couple)
+    counts = dict.fromkeys(("users", "profiles", "vendors", "guests", "tasks"), 0)
+
+    for start in range(0, couples, group_size):
+        numbers = range(start, min(start + group_size, couples))
+        with transaction.atomic():
+            users = get_user_model().objects.bulk_create(
+                [
+                    factory.user(f"{username_prefix}{number:06d}", password_hash)
+                    for number in numbers
+                ],
+                batch_size=batch_size,
+            )
+            profiles = WeddingProfile.objects.bulk_create(
+                [factory.profile(user) for user in users], batch_size=batch_size
+            )
+            vendor_rows = Vendor.objects.bulk_create(
+                [
+                    factory.vendor(profile, number)
+                    for profile in profiles
+                    for number in range(vendors)
+                ],
+                batch_size=batch_size,
+            )
+            vendor_ids: dict[int, list[int]] = {profile.pk: [] for profile in profiles}
+            for vendor in vendor_rows:
+                vendor_ids[vendor.wedding_profile_id].append(vendor.pk)
+
+            insert_rows(
+                Guest,
+                [
+                    {"wedding_profile_id": profile.pk, **factory.guest(number)}
+                    for profile in profiles
+                    for number in range(guests)
+                ],
+                batch_size,
+            )
+            insert_rows(
+                Task,
+                [
+                    {
+                        "wedding_profile_id": profile.pk,
+                        **factory.task(vendor_ids[profile.pk]),
+                    }
+                    for profile in profiles
+                    for _ in range(tasks)
+                ],
+                batch_size,
+            )
+            # Ids of deleted profiles can be reused, so drop cached versions.
+            bump_profile_version(*vendor_ids)
+        counts["users"] += len(users)
+        counts["profiles"] += len(profiles)
+        counts["vendors"] += len(vendor_rows)
+        counts["guests"] += len(profiles) * guests
+        counts["tasks"] += len(profiles) * tasks
+        if progress is not None:
+            progress(counts)
+    return counts
+
+
+@contextmanager
+def scratch_database(in_place: bool = False) -> Iterator[None]:
+    """Provide a database whose data is discarded when the block exits.
+
+    By default a test database is created and destroyed afterwards. With
+    ``in_place`` the configured database is used inside a transaction that
+    is rolled back, for database users that cannot create databases.
+    """
+    if in_place:
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+        return
+
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
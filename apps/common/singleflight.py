@@ -0,0 +1,131 @@
+"""Single-flight request coalescing for expensive read endpoints.
+
+When several requests ask for the same expensive computation at once (a
+couple polling from two devices, an aggressive client retry), only the first
+caller runs it; the others wait and share its result. Within a process this
+uses an event per key. Across processes the leader additionally holds a
+short-lived cache lock, and other processes wait for the result to appear in
+the cache instead of recomputing it.
+"""
+
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+
+from apps.common.metrics import registry
+
+singleflight_calls = registry.counter(
+    "singleflight_calls_total",
+    "Coalesced computations by flight name and caller role",
+    labelnames=("flight", "role"),
+)
+
+
+class _Call:
+    """In-flight computation shared by every caller of the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time and shares its result."""
+
+    def __init__(self):
+        """Initialize an empty table of in-flight calls."""
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        *,
+        name: str = "default",
+        cache=None,
+        lookup: Callable[[], Any] | None = None,
+    ) -> Any:
+        """Return ``fn()``, sharing one execution between concurrent callers.
+
+        Args:
+            key: Identity of the computation, e.g. endpoint + profile + params.
+            fn: The computation. Exceptions are re-raised in every waiter.
+            name: Label used for metrics.
+            cache: Optional Django cache used for a cross-process lock.
+            lookup: With ``cache``, returns the stored result or ``None``;
+                other processes poll it while the lock holder computes.
+        """
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return fn()
+
+        with self._lock:
+            existing = self._calls.get(key)
+            leader = existing is None
+            if existing is None:
+                call = self._calls[key] = _Call()
+            else:
+                call = existing
+                call.waiters += 1
+
+        if not leader:
+            singleflight_calls.inc(flight=name, role="coalesced")
+            if not call.done.wait(settings.SINGLE_FLIGHT_TIMEOUT_SECONDS):
+                singleflight_calls.inc(flight=name, role="timeout")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            if cache is not None and lookup is not None:
+                call.result = self._run_with_cache_lock(key, fn, name, cache, lookup)
+            else:
+                singleflight_calls.inc(flight=name, role="leader")
+                call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _run_with_cache_lock(self, key, fn, name, cache, lookup) -> Any:
+        """Compute under a cache lock, or wait for another process's result."""
+        timeout = settings.SINGLE_FLIGHT_TIMEOUT_SECONDS
+        lock_key = f"singleflight-lock:{key}"
+        token = uuid.uuid4().hex
+
+        deadline = time.monotonic() + timeout
+        while not cache.add(lock_key, token, timeout=timeout):
+            result = lookup()
+            if result is not None:
+                singleflight_calls.inc(flight=name, role="remote")
+                return result
+            if time.monotonic() >= deadline:
+                singleflight_calls.inc(flight=name, role="timeout")
+                return fn()
+            time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL_SECONDS)
+
+        try:
+            # Another process may have stored the result just before we locked.
+            result = lookup()
+            if result is not None:
+                singleflight_calls.inc(flight=name, role="remote")
+                return result
+            singleflight_calls.inc(flight=name, role="leader")
+            return fn()
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+
+single_flight = SingleFlight()
@@ -1,15 +1,121 @@
 """Comprehensive tests for Common utilities."""
 
+import difflib
+import gzip
+import json
+import logging.handlers
+import os
+import pstats
+import random
+import socketserver
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import warnings
 from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import ClassVar
 
 import pytest
-from django.core.exceptions import ValidationError
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed, ValidationError
+from django.core.management import CommandError, call_command
+from django.core.management.utils import get_random_secret_key
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.operations import RunSQL, SeparateDatabaseAndState
+from django.db.models import F, QuerySet
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
 from rest_framework import status
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
-from .constants import Messages, RSVPStatus, TaskAssignment, TeamRole, VendorCategory
+from apps.guests.models import Guest
+from apps.guests.validators import validate_guest_email_format, validate_guest_name
+from apps.profiles.models import WeddingProfile
+from apps.profiles.validators import (
+    validate_venue_name,
+    validate_wedding_budget_structure,
+)
+from apps.tasks.models import Task
+from apps.vendors.models import Vendor
+from apps.vendors.validators import validate_vendor_name
+
+from . import schema
+from .cache import (
+    ProfileCache,
+    RenderedResponseCache,
+    bump_profile_version,
+    detail_cache,
+    get_profile_version,
+)
+from .cache.aggregates import cache_requests
+from .cache.backends import RespCache
+from .checks import check_profile_version_cache, check_replica_pin_cache
+from .constants import (
+    Messages,
+    RSVPStatus,
+    TaskAssignment,
+    TeamRole,
+    ValidationLimits,
+    VendorCategory,
+)
+from .db import query_plans, routers
+from .db.backends.postgresql.base import DatabaseWrapper
+from .db.nplusone import NPlusOneError
+from .db.pool import ConnectionPool, PoolTimeout, pool_acquisitions, pool_closed
+from .db.query_stats import QueryStats, collect_query_stats, normalize_sql
+from .db.routers import (
+    ReplicaRouter,
+    is_pinned_to_primary,
+    pin_to_primary,
+    read_from_replica,
+    replica_reads,
+)
+from .db.sql_comments import format_comment
+from .logging_formatters import JsonFormatter
+from .logging_handlers import GzipRotatingFileHandler, QueueHandler, log_records
+from .management.commands.benchmark_endpoints import CASES, url_names
+from .management.commands.profile_imports import summarize
+from .metrics import MetricsRegistry, merged_metrics, render_text, write_snapshot
+from .metrics import registry as metrics_registry
+from .middleware import (
+    CsrfViewMiddleware,
+    RequestLoggingMiddleware,
+    RequestProfilingMiddleware,
+    SessionMiddleware,
+)
+from .middleware.metrics import http_request_db_queries, http_requests
+from .openapi import LazyDocs, apply_deferred_docs
+from .profiling import StackSampler, prune_profiles
 from .responses import APIResponse
-from .validators.base import validate_future_date, validate_positive_amount
+from .seeding import (
+    SURNAMES,
+    WeddingDataFactory,
+    insert_rows,
+    seed_wedding,
+    seed_weddings,
+)
+from .singleflight import SingleFlight, singleflight_calls
+from .validators.base import (
+    validate_future_date,
+    validate_kenyan_phone_number,
+    validate_positive_amount,
+)
+
+User = get_user_model()
 
 
 class TestConstants:
@@ -255,3 +361,2706 @@ class TestAPIResponse:
         assert meta["total_pages"] == 3
         assert meta["has_next"] is False
         assert meta["has_previous"] is True
+
+
+class FakeRespServer(socketserver.ThreadingTCPServer):
+    """Minimal in-process Redis stand-in speaking RESP2 for backend tests."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.data: dict[bytes, bytes] = {}
+        self.expiry: dict[bytes, float] = {}
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), FakeRespHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def live(self, key: bytes) -> bool:
+        deadline = self.expiry.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.data
+
+    def run(self, name: str, args: list[bytes]):  # noqa: C901
+        if name == "PING":
+            return "+PONG"
+        if name in ("SELECT", "AUTH"):
+            return "+OK"
+        if name == "GET":
+            return self.data.get(args[0]) if self.live(args[0]) else None
+        if name == "SET":
+            key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+            if b"NX" in options and self.live(key):
+                return None
+            self.data[key] = value
+            self.expiry.pop(key, None)
+            if b"EX" in options:
+                seconds = int(options[options.index(b"EX") + 1])
+                self.expiry[key] = time.monotonic() + seconds
+            return "+OK"
+        if name == "MSET":
+            for key, value in zip(args[::2], args[1::2], strict=True):
+                self.data[key] = value
+            return "+OK"
+        if name == "MGET":
+            return [self.data.get(k) if self.live(k) else None for k in args]
+        if name == "DEL":
+            removed = [k for k in args if self.live(k)]
+            for key in removed:
+                self.data.pop(key)
+            return len(removed)
+        if name == "EXISTS":
+            return sum(1 for k in args if self.live(k))
+        if name == "INCRBY":
+            value = int(self.data.get(args[0], b"0")) + int(args[1])
+            self.data[args[0]] = str(value).encode()
+            return value
+        if name == "EXPIRE":
+            if not self.live(args[0]):
+                return 0
+            self.expiry[args[0]] = time.monotonic() + int(args[1])
+            return 1
+        if name == "PERSIST":
+            return 1 if self.expiry.pop(args[0], None) is not None else 0
+        if name == "FLUSHDB":
+            self.data.clear()
+            self.expiry.clear()
+            return "+OK"
+        return f"-ERR unknown command '{name}'"
+
+
+class FakeRespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            header = self.rfile.readline()
+            if not header:
+                return
+            args = []
+            for _ in range(int(header[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            with self.server.lock:
+                reply = self.server.run(args[0].decode().upper(), args[1:])
+            self.wfile.write(self._encode(reply))
+
+    def _encode(self, reply) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, str):
+            return reply.encode() + b"\r\n"
+        if isinstance(reply, list):
+            return b"*%d\r\n" % len(reply) + b"".join(self._encode(r) for r in reply)
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+@pytest.fixture
+def resp_server():
+    """Run a fake Redis-protocol server on a random local port."""
+    server = FakeRespServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def clear_cache():
+    """Start each cache test with an empty default cache and fresh metrics."""
+    cache.clear()
+    detail_cache.clear()
+    metrics_registry.reset()
+    yield
+    cache.clear()
+    detail_cache.clear()
+
+
+@pytest.fixture
+def records():
+    """Capture records logged by the request logging middleware."""
+    handler = logging.handlers.BufferingHandler(capacity=100)
+    logger = logging.getLogger("apps.requests")
+    logger.addHandler(handler)
+    previous_level = logger.level
+    logger.setLevel(logging.INFO)
+    yield handler.buffer
+    logger.setLevel(previous_level)
+    logger.removeHandler(handler)
+
+
+def asgi_get(user, path):
+    """GET ``path`` as ``user`` through the ASGI handler."""
+    token = AccessToken.for_user(user)
+    return async_to_sync(AsyncClient().get)(
+        path, headers={"authorization": f"Bearer {token}"}
+    )
+
+
+class TestMetricsRegistry:
+    """Test the in-process metrics registry."""
+
+    def test_counter_increments_per_label_set(self):
+        """Test counters keep separate values per label combination."""
+        registry = MetricsRegistry()
+        counter = registry.counter("lookups_total", "Lookups", ("result",))
+        counter.inc(result="hit")
+        counter.inc(2, result="miss")
+
+        assert counter.value(result="hit") == 1
+        assert counter.value(result="miss") == 2
+        assert registry.counter("lookups_total", "Lookups", ("result",)) is counter
+
+    def test_counter_rejects_unknown_labels(self):
+        """Test counters validate label names."""
+        counter = MetricsRegistry().counter("lookups_total", "Lookups", ("result",))
+        with pytest.raises(ValueError):
+            counter.inc(status="hit")
+
+    def test_collectors_refresh_gauges_before_snapshot(self):
+        """Test collectors run before samples are read."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("open_connections", "Open connections")
+        registry.add_collector(lambda: gauge.set(3))
+
+        assert registry.snapshot()["open_connections"] == [({}, 3.0)]
+        with pytest.raises(ValueError):
+            registry.counter("open_connections", "Open connections")
+
+    def test_histogram_renders_cumulative_buckets(self):
+        """Test histograms expose cumulative buckets, sum and count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "latency_seconds", "Latency", ("view",), buckets=(0.1, 1)
+        )
+        histogram.observe(0.05, view="home")
+        histogram.observe(0.5, view="home")
+        histogram.observe(3, view="home")
+
+        text = render_text(registry.collect())
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{view="home",le="0.1"} 1.0' in text
+        assert 'latency_seconds_bucket{view="home",le="1.0"} 2.0' in text
+        assert 'latency_seconds_bucket{view="home",le="+Inf"} 3.0' in text
+        assert 'latency_seconds_sum{view="home"} 3.55' in text
+        assert 'latency_seconds_count{view="home"} 3.0' in text
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and newlines in label values cannot break the format."""
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors", ("exception",)).inc(
+            exception='Bad"\nthing'
+        )
+
+        assert 'errors_total{exception="Bad\\"\\nthing"} 1.0' in render_text(
+            registry.collect()
+        )
+
+    def test_snapshots_from_other_processes_are_merged(self, tmp_path):
+        """Test counters and histograms are summed and dead gauges skipped."""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests", ("view",))
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(1,))
+        gauge = registry.gauge("open_connections", "Open connections")
+        counter.inc(2, view="home")
+        histogram.observe(0.5)
+        gauge.set(4)
+        write_snapshot(tmp_path, registry)
+        # Pretend the snapshot came from a worker that has since exited.
+        (tmp_path / f"{os.getpid()}.json").rename(tmp_path / "999999999.json")
+        registry.reset()
+        counter.inc(view="home")
+        histogram.observe(2)
+
+        merged = {metric.name: metric for metric in merged_metrics(tmp_path, registry)}
+
+        assert merged["requests_total"].value(view="home") == 3
+        assert merged["latency_seconds"].value() == 2
+        assert merged["latency_seconds"].exposition_samples()[0][2] == 1
+        assert merged["open_connections"].value() == 0
+        assert counter.value(view="home") == 1
+
+
+class TestRespCache:
+    """Test the Redis-protocol cache backend against a local stand-in."""
+
+    def make_cache(self, resp_server):
+        return RespCache(resp_server.url, {"TIMEOUT": 60, "KEY_PREFIX": "test"})
+
+    def test_get_set_delete(self, resp_server):
+        """Test basic key operations round-trip through the protocol."""
+        backend = self.make_cache(resp_server)
+        backend.set("stats", {"total_guests": 3})
+
+        assert backend.get("stats") == {"total_guests": 3}
+        assert backend.has_key("stats")
+        assert backend.delete("stats") is True
+        assert backend.get("stats", "missing") == "missing"
+
+    def test_add_and_incr(self, resp_server):
+        """Test add only sets missing keys and incr is atomic on integers."""
+        backend = self.make_cache(resp_server)
+
+        assert backend.add("version", 10) is True
+        assert backend.add("version", 99) is False
+        assert backend.incr("version") == 11
+        with pytest.raises(ValueError):
+            backend.incr("unknown")
+
+    def test_many_and_clear(self, resp_server):
+        """Test multi-key operations and flushing."""
+        backend = self.make_cache(resp_server)
+        backend.set_many({"a": 1, "b": [1, 2]})
+
+        assert backend.get_many(["a", "b", "c"]) == {"a": 1, "b": [1, 2]}
+        backend.clear()
+        assert backend.get_many(["a", "b"]) == {}
+
+    def test_zero_timeout_does_not_store(self, resp_server):
+        """Test a zero timeout expires the value immediately."""
+        backend = self.make_cache(resp_server)
+        backend.set("ephemeral", "value", timeout=0)
+
+        assert backend.get("ephemeral") is None
+
+
+@pytest.mark.usefixtures("clear_cache")
+class TestProfileCache:
+    """Test versioned aggregate caching."""
+
+    def test_hit_and_miss_metrics(self):
+        """Test repeated lookups are served from cache and counted."""
+        profile_cache = ProfileCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"total": 1}
+
+        assert profile_cache.get_or_compute(1, "stats", compute) == {"total": 1}
+        assert profile_cache.get_or_compute(1, "stats", compute) == {"total": 1}
+
+        assert len(calls) == 1
+        assert cache_requests.value(cache="aggregates", result="miss") == 1
+        assert cache_requests.value(cache="aggregates", result="hit") == 1
+
+    def test_version_bump_invalidates(self):
+        """Test bumping the profile version makes old entries unreachable."""
+        profile_cache = ProfileCache()
+        profile_cache.get_or_compute(7, "stats", lambda: "old")
+        bump_profile_version(7)
+
+        assert profile_cache.get_or_compute(7, "stats", lambda: "new") == "new"
+
+    def test_params_are_part_of_key(self):
+        """Test different parameters produce different cache entries."""
+        profile_cache = ProfileCache()
+        first = profile_cache.make_key(1, "progress", {"today": "2026-01-01"})
+        second = profile_cache.make_key(1, "progress", {"today": "2026-01-02"})
+
+        assert first != second
+
+    def test_file_backend(self, tmp_path):
+        """Test aggregates work with the file-based backend."""
+        file_cache = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path),
+            }
+        }
+        with override_settings(CACHES=file_cache):
+            profile_cache = ProfileCache()
+            profile_cache.get_or_compute(3, "stats", lambda: {"total": 2})
+            bump_profile_version(3)
+
+            assert profile_cache.get_or_compute(3, "stats", lambda: 5) == 5
+
+    def test_shared_cache_required_outside_debug(self, tmp_path):
+        """Test locmem version stamps are refused in production."""
+        with override_settings(DEBUG=False):
+            (error,) = check_profile_version_cache(None)
+        assert error.id == "common.E002"
+        with override_settings(DEBUG=True):
+            assert check_profile_version_cache(None) == []
+
+        shared = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path),
+            }
+        }
+        with override_settings(DEBUG=False, CACHES=shared):
+            assert check_profile_version_cache(None) == []
+
+    def test_disabled_always_computes(self, settings):
+        """Test the cache can be switched off."""
+        settings.AGGREGATE_CACHE_ENABLED = False
+        profile_cache = ProfileCache()
+        profile_cache.get_or_compute(1, "stats", lambda: "first")
+
+        assert profile_cache.get_or_compute(1, "stats", lambda: "second") == "second"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("clear_cache")
+class TestProfileVersioning:
+    """Test that writes through every path invalidate cached aggregates."""
+
+    @pytest.fixture
+    def wedding_profile(self):
+        user = User.objects.create_user(username="versioned", password="pass12345")
+        return WeddingProfile.objects.create(
+            user=user,
+            wedding_date=date.today() + timedelta(days=200),
+            bride_name="Aisha Juma",
+            groom_name="Vincent Simiyu",
+            budget=750000,
+        )
+
+    def test_save_and_delete_bump_version(self, wedding_profile):
+        """Test model saves and deletes bump the owning profile version."""
+        version = get_profile_version(wedding_profile.id)
+        guest = Guest.objects.create(wedding_profile=wedding_profile, name="Khadija")
+        after_create = get_profile_version(wedding_profile.id)
+        guest.delete()
+
+        assert after_create > version
+        assert get_profile_version(wedding_profile.id) > after_create
+
+    def test_queryset_update_bumps_version(self, wedding_profile):
+        """Test queryset update() bypassing signals still invalidates."""
+        Guest.objects.create(wedding_profile=wedding_profile, name="Khadija")
+        version = get_profile_version(wedding_profile.id)
+        Guest.objects.filter(wedding_profile=wedding_profile).update(
+            rsvp_status="confirmed"
+        )
+
+        assert get_profile_version(wedding_profile.id) > version
+
+    def test_bulk_create_bumps_version(self, wedding_profile):
+        """Test bulk_create invalidates the owning profile."""
+        version = get_profile_version(wedding_profile.id)
+        Vendor.objects.bulk_create(
+            [
+                Vendor(
+                    wedding_profile=wedding_profile,
+                    name="Marula Studios",
+                    category="photography",
+                    contact_person="Sarah Kimani",
+                    phone="0712345678",
+                    email="info@marula.co.ke",
+                )
+            ]
+        )
+
+        assert get_profile_version(wedding_profile.id) > version
+
+    def test_statistics_refresh_after_queryset_update(self, wedding_profile):
+        """Test the statistics endpoint reflects bulk RSVP changes."""
+        Guest.objects.create(wedding_profile=wedding_profile, name="Khadija")
+        client = APIClient()
+        client.force_authenticate(wedding_profile.user)
+        url = reverse("guests:guest_statistics")
+
+        assert client.get(url).data["data"]["confirmed"] == 0
+        Guest.objects.filter(wedding_profile=wedding_profile).update(
+            rsvp_status="confirmed"
+        )
+        assert client.get(url).data["data"]["confirmed"] == 1
+
+
+JSON = "application/json"
+
+
+class TestRenderedResponseCache:
+    """Test the byte-bounded rendered response cache."""
+
+    def test_version_mismatch_is_a_miss(self):
+        """Test a body is only returned for the version it was rendered at."""
+        rendered = RenderedResponseCache(max_bytes=1024)
+        rendered.set(("guests.guest", 1), ("t1", 1), JSON, JSON, b"{}")
+
+        assert rendered.get(("guests.guest", 1), ("t1", 1), JSON) == (JSON, b"{}")
+        assert rendered.get(("guests.guest", 1), ("t2", 1), JSON) is None
+
+    def test_media_types_are_cached_separately(self):
+        """Test each negotiated media type gets its own body for a row."""
+        rendered = RenderedResponseCache(max_bytes=1024)
+        indented = "application/json; indent=2"
+        rendered.set(("guests.guest", 1), (1,), JSON, JSON, b"{}")
+        assert rendered.get(("guests.guest", 1), (1,), indented) is None
+
+        rendered.set(("guests.guest", 1), (1,), indented, indented, b"{\n}")
+        assert rendered.get(("guests.guest", 1), (1,), JSON) == (JSON, b"{}")
+        assert rendered.total_bytes == 5
+        rendered.invalidate("guests.guest", 1)
+        assert rendered.total_bytes == 0
+
+    def test_evicts_least_recently_used_over_budget(self):
+        """Test total size never exceeds the byte budget."""
+        rendered = RenderedResponseCache(max_bytes=10)
+        rendered.set(("tasks.task", 1), (1,), JSON, JSON, b"aaaa")
+        rendered.set(("tasks.task", 2), (1,), JSON, JSON, b"bbbb")
+        rendered.get(("tasks.task", 1), (1,), JSON)
+        rendered.set(("tasks.task", 3), (1,), JSON, JSON, b"cccc")
+
+        assert rendered.total_bytes == 8
+        assert rendered.get(("tasks.task", 2), (1,), JSON) is None
+        assert rendered.get(("tasks.task", 1), (1,), JSON) == (JSON, b"aaaa")
+
+    def test_oversized_body_is_not_cached(self):
+        """Test a body larger than the whole budget is skipped."""
+        rendered = RenderedResponseCache(max_bytes=4)
+        rendered.set(("tasks.task", 1), (1,), JSON, JSON, b"too large")
+
+        assert len(rendered) == 0
+
+    def test_invalidate(self):
+        """Test a single row can be dropped."""
+        rendered = RenderedResponseCache(max_bytes=1024)
+        rendered.set(("vendors.vendor", 5), (1,), JSON, JSON, b"{}")
+        rendered.invalidate("vendors.vendor", 5)
+
+        assert rendered.total_bytes == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("clear_cache")
+class TestDetailResponseCache:
+    """Test detail endpoints serve cached envelopes until the row changes."""
+
+    @pytest.fixture
+    def guest(self):
+        user = User.objects.create_user(username="detail", password="pass12345")
+        wedding_profile = WeddingProfile.objects.create(
+            user=user,
+            wedding_date=date.today() + timedelta(days=200),
+            bride_name="Grace Njeri",
+            groom_name="Peter Kiprotich",
+            budget=950000,
+        )
+        return Guest.objects.create(wedding_profile=wedding_profile, name="Mary")
+
+    @pytest.fixture
+    def client(self, guest):
+        client = APIClient()
+        client.force_authenticate(guest.wedding_profile.user)
+        return client
+
+    def test_second_request_is_served_from_cache(self, client, guest):
+        """Test a repeated poll returns identical bytes from the cache."""
+        url = reverse("guests:get_guest", args=[guest.id])
+        first = client.get(url)
+        second = client.get(url)
+
+        assert first.content == second.content
+        for header in ("Content-Type", "Allow", "Vary"):
+            assert first.get(header) == second.get(header)
+        assert second.json()["success"] is True
+        assert second.json()["data"]["name"] == "Mary"
+        assert cache_requests.value(cache="detail", result="hit") == 1
+
+    def test_write_refreshes_cached_body(self, client, guest):
+        """Test updating the row invalidates the rendered body."""
+        url = reverse("guests:get_guest", args=[guest.id])
+        client.get(url)
+        client.patch(
+            reverse("guests:update_rsvp", args=[guest.id]),
+            {"rsvp_status": "confirmed"},
+            format="json",
+        )
+
+        assert client.get(url).json()["data"]["rsvp_status"] == "confirmed"
+
+    def test_profile_change_refreshes_related_rows(self, client, guest):
+        """Test a profile edit invalidates bodies that embed the profile."""
+        url = reverse("guests:get_guest", args=[guest.id])
+        client.get(url)
+        WeddingProfile.objects.filter(id=guest.wedding_profile_id).update(
+            bride_name="Grace Wanjiku"
+        )
+
+        assert "Grace Wanjiku" in client.get(url).json()["data"]["wedding_profile"]
+
+    def test_negotiated_media_type_is_honoured(self, client, guest):
+        """Test a cached body is not served for a different Accept header."""
+        url = reverse("guests:get_guest", args=[guest.id])
+        client.get(url)
+        response = client.get(url, HTTP_ACCEPT="application/json; indent=2")
+
+        assert response["Content-Type"] == "application/json; indent=2"
+        assert response.content.startswith(b"{\n  ")
+        assert cache_requests.value(cache="detail", result="hit") == 0
+
+    def test_html_renderers_are_not_cached(self, guest):
+        """Test responses rendered per request go through DRF uncached."""
+        rendered = RenderedResponseCache(max_bytes=1024)
+        request = SimpleNamespace(
+            accepted_renderer=BrowsableAPIRenderer(), accepted_media_type="text/html"
+        )
+        response = APIResponse.success(data={"name": guest.name})
+
+        assert rendered.respond(request, guest, lambda: response) is response
+        assert len(rendered) == 0
+
+    def test_not_found_is_not_cached(self, client):
+        """Test missing rows still return a 404 envelope."""
+        response = client.get(reverse("guests:get_guest", args=[999999]))
+
+        assert response.status_code == 404
+
+
+@pytest.mark.usefixtures("clear_cache")
+class TestSingleFlight:
+    """Test coalescing of concurrent identical computations."""
+
+    def run_concurrently(self, flight, key, fn, callers, **kwargs):
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(flight.do(key, fn, **kwargs))
+            )
+            for _ in range(callers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_concurrent_callers_share_one_computation(self):
+        """Test only the leader computes and every waiter gets its result."""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return {"total_guests": 42}
+
+        threads, results = self.run_concurrently(
+            flight, "guest_statistics:1", compute, 5, name="guest_statistics"
+        )
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            call = flight._calls.get("guest_statistics:1")
+            if call is not None and call.waiters == 4:
+                break
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert results == [{"total_guests": 42}] * 5
+        assert singleflight_calls.value(flight="guest_statistics", role="leader") == 1
+        assert (
+            singleflight_calls.value(flight="guest_statistics", role="coalesced") == 4
+        )
+
+    def test_errors_reach_every_waiter(self):
+        """Test an exception in the leader is raised in the caller."""
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("database unavailable")
+
+        with pytest.raises(RuntimeError):
+            flight.do("progress:1", fail)
+        assert flight._calls == {}
+
+    def test_sequential_calls_recompute(self):
+        """Test finished flights are not reused as a cache."""
+        flight = SingleFlight()
+
+        assert flight.do("categories:1", lambda: 1) == 1
+        assert flight.do("categories:1", lambda: 2) == 2
+
+    def test_cache_lock_waits_for_other_process(self, settings):
+        """Test a locked key is served from the cache once the holder stores it."""
+        settings.SINGLE_FLIGHT_POLL_INTERVAL_SECONDS = 0.01
+        cache.add("singleflight-lock:progress:2", "other-process", timeout=5)
+
+        def other_process_finishes():
+            time.sleep(0.05)
+            cache.set("progress:2", {"overall_progress": 50})
+
+        threading.Thread(target=other_process_finishes).start()
+        result = SingleFlight().do(
+            "progress:2",
+            lambda: pytest.fail("computed despite the cache lock"),
+            name="wedding_progress",
+            cache=cache,
+            lookup=lambda: cache.get("progress:2"),
+        )
+
+        assert result == {"overall_progress": 50}
+        assert singleflight_calls.value(flight="wedding_progress", role="remote") == 1
+
+    def test_cache_lock_released_after_compute(self):
+        """Test the leader releases its cache lock."""
+        SingleFlight().do(
+            "progress:3", lambda: 1, cache=cache, lookup=lambda: cache.get("x")
+        )
+
+        assert cache.get("singleflight-lock:progress:3") is None
+
+
+@pytest.mark.usefixtures("clear_cache")
+class TestReplicaRouter:
+    """Test read-replica routing and read-your-writes stickiness."""
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings, monkeypatch):
+        settings.DATABASE_REPLICAS = ["replica_0"]
+        monkeypatch.setattr(routers, "_unavailable_until", {})
+        monkeypatch.setattr(routers, "is_available", lambda alias: True)
+
+    def test_reads_use_primary_by_default(self):
+        """Test reads outside opted-in views stay on the primary."""
+        assert ReplicaRouter().db_for_read(Guest) is None
+
+    def test_opted_in_reads_use_replica(self):
+        """Test reads inside replica_reads() go to a replica."""
+        with replica_reads():
+            assert ReplicaRouter().db_for_read(Guest) == "replica_0"
+        assert ReplicaRouter().db_for_read(Guest) is None
+
+    def test_writes_always_use_primary(self):
+        """Test writes are never routed to replicas."""
+        with replica_reads():
+            assert ReplicaRouter().db_for_write(Guest) == "default"
+
+    def test_unavailable_replica_falls_back_to_primary(self, monkeypatch):
+        """Test a replica that cannot connect is skipped."""
+        monkeypatch.undo()
+        routers._unavailable_until.clear()
+        with override_settings(DATABASE_REPLICAS=["missing_replica"]):
+            with replica_reads():
+                assert ReplicaRouter().db_for_read(Guest) == "default"
+            assert "missing_replica" in routers._unavailable_until
+
+    def test_replicas_are_not_migrated(self):
+        """Test migrations only run against the primary."""
+        assert ReplicaRouter().allow_migrate("replica_0", "guests") is False
+        assert ReplicaRouter().allow_migrate("default", "guests") is None
+
+    def test_pinned_user_reads_primary(self):
+        """Test a user who just wrote is not routed to replicas."""
+        seen = []
+
+        @read_from_replica
+        def view(request):
+            seen.append(routers._replica_reads.get())
+
+        request = type("Request", (), {"user": type("User", (), {"pk": 9})()})()
+        view(request)
+        pin_to_primary(9)
+        view(request)
+
+        assert seen == [True, False]
+
+    def test_replicas_require_a_shared_cache(self, tmp_path):
+        """Test replicas are refused while pins would stay in one process."""
+        (error,) = check_replica_pin_cache(None)
+        assert error.id == "common.E001"
+
+        shared = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path),
+            }
+        }
+        with override_settings(CACHES=shared):
+            assert check_replica_pin_cache(None) == []
+
+    def test_replica_aggregates_are_not_cached_after_a_write(self):
+        """Test a lagging replica's aggregate is not stored for everyone."""
+        profile_cache = ProfileCache()
+        bump_profile_version(4)
+
+        with replica_reads():
+            assert profile_cache.get_or_compute(4, "stats", lambda: "stale") == "stale"
+        assert profile_cache.get_or_compute(4, "stats", lambda: "fresh") == "fresh"
+        with replica_reads():
+            assert profile_cache.get_or_compute(4, "stats", lambda: "stale") == "fresh"
+
+    @pytest.mark.django_db
+    def test_write_request_pins_user(self):
+        """Test the middleware pins users after unsafe requests."""
+        user = User.objects.create_user(username="writer", password="pass12345")
+        client = APIClient()
+        client.force_authenticate(user)
+        client.post(
+            reverse("profiles:create_profile"),
+            {
+                "wedding_date": (date.today() + timedelta(days=200)).isoformat(),
+                "bride_name": "Aisha Juma",
+                "groom_name": "Vincent Simiyu",
+                "budget": 750000,
+            },
+            format="json",
+        )
+
+        assert is_pinned_to_primary(user.pk)
+
+
+class FakeConnection:
+    """Stand-in DB-API connection that records whether it was closed."""
+
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.usefixtures("clear_cache")
+class TestConnectionPool:
+    """Test the in-process database connection pool."""
+
+    def make_pool(self, **kwargs):
+        opened = []
+
+        def connect():
+            opened.append(FakeConnection())
+            return opened[-1]
+
+        kwargs.setdefault("timeout", 0.05)
+        return ConnectionPool(connect, name="test", **kwargs), opened
+
+    def test_released_connections_are_reused(self):
+        """Test a returned connection is handed out again."""
+        pool, opened = self.make_pool(max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+
+        assert pool.acquire() is first
+        assert len(opened) == 1
+        assert pool_acquisitions.value(database="test", result="reused") == 1
+
+    def test_fill_opens_min_size(self):
+        """Test the pool can be pre-warmed to its minimum size."""
+        pool, opened = self.make_pool(min_size=2, max_size=4)
+        pool.fill()
+
+        assert len(opened) == 2
+        assert pool.stats()["idle"] == 2
+
+    def test_acquire_times_out_when_exhausted(self):
+        """Test callers give up once every connection stays busy."""
+        pool, _ = self.make_pool(max_size=1)
+        pool.acquire()
+
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+        assert pool_acquisitions.value(database="test", result="timeout") == 1
+
+    def test_waiter_gets_released_connection(self):
+        """Test a blocked caller receives the next released connection."""
+        pool, opened = self.make_pool(max_size=1, timeout=2)
+        held = pool.acquire()
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(pool.acquire()))
+        waiter.start()
+        while pool.stats()["waiting"] == 0:
+            time.sleep(0.001)
+        pool.release(held)
+        waiter.join()
+
+        assert received == [held]
+        assert len(opened) == 1
+
+    def test_unhealthy_connections_are_replaced(self):
+        """Test connections failing the health check are closed."""
+        pool, opened = self.make_pool(check=lambda conn: conn.healthy)
+        first = pool.acquire()
+        pool.release(first)
+        first.healthy = False
+
+        second = pool.acquire()
+
+        assert second is not first
+        assert first.closed
+        assert pool_closed.value(database="test", reason="broken") == 1
+
+    def test_failed_reset_discards_connection(self):
+        """Test a connection that cannot be cleaned is not pooled."""
+
+        def reset(conn):
+            raise RuntimeError("connection lost")
+
+        pool, _ = self.make_pool(reset=reset)
+        conn = pool.acquire()
+        pool.release(conn)
+
+        assert conn.closed
+        assert pool.stats()["size"] == 0
+
+    def test_idle_connections_above_min_size_are_recycled(self):
+        """Test connections idle for too long are closed on checkout."""
+        pool, opened = self.make_pool(min_size=1, max_size=3, max_idle=0)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        time.sleep(0.01)
+
+        pool.acquire()
+
+        assert first.closed
+        assert not second.closed
+        assert pool_closed.value(database="test", reason="idle") == 1
+
+    def test_expired_connections_are_closed_on_release(self):
+        """Test connections past their lifetime are not reused."""
+        pool, _ = self.make_pool(max_lifetime=0)
+        conn = pool.acquire()
+        time.sleep(0.01)
+        pool.release(conn)
+
+        assert conn.closed
+        assert pool_closed.value(database="test", reason="lifetime") == 1
+
+    def test_close_shuts_idle_connections(self):
+        """Test closing the pool closes idle and later released connections."""
+        pool, _ = self.make_pool(max_size=2)
+        idle, busy = pool.acquire(), pool.acquire()
+        pool.release(idle)
+        pool.close()
+        pool.release(busy)
+
+        assert idle.closed and busy.closed
+        assert pool.stats()["size"] == 0
+
+    def test_pool_options_are_not_connection_params(self):
+        """Test the pooled backend keeps pool options away from the driver."""
+        wrapper = DatabaseWrapper(
+            {
+                "ENGINE": "apps.common.db.backends.postgresql",
+                "NAME": "wedding_planner_db",
+                "USER": "",
+                "PASSWORD": "",
+                "HOST": "",
+                "PORT": "",
+                "OPTIONS": {"pool": {"max_size": 4}},
+                "CONN_MAX_AGE": 0,
+                "CONN_HEALTH_CHECKS": False,
+                "TIME_ZONE": None,
+                "AUTOCOMMIT": True,
+                "ATOMIC_REQUESTS": False,
+            },
+            "pooled",
+        )
+
+        assert "pool" not in wrapper.get_connection_params()
+
+
+class TestAsyncMiddleware:
+    """Test middleware runs natively under both WSGI and ASGI."""
+
+    def test_logging_middleware_stays_sync_for_sync_stack(self):
+        """Test a sync handler chain gets a plain callable."""
+        middleware = RequestLoggingMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get("/api/v1/guests/list/")
+
+        assert not iscoroutinefunction(middleware)
+        assert middleware(request).status_code == 200
+        assert len(request.request_id) == 8
+
+    def test_logging_middleware_awaits_async_stack(self):
+        """Test an async handler chain is awaited without a thread hop."""
+
+        async def get_response(request):
+            return HttpResponse(status=201)
+
+        middleware = RequestLoggingMiddleware(get_response)
+        request = RequestFactory().get("/api/v1/guests/list/")
+
+        assert iscoroutinefunction(middleware)
+        assert async_to_sync(middleware)(request).status_code == 201
+        assert len(request.request_id) == 8
+
+    @pytest.mark.django_db(transaction=True)
+    def test_api_served_through_asgi_handler(self):
+        """Test authenticated reads work end to end under ASGI."""
+        user = User.objects.create_user(username="asgi", password="pass12345")
+        WeddingProfile.objects.create(
+            user=user,
+            wedding_date=date.today() + timedelta(days=200),
+            bride_name="Aisha Juma",
+            groom_name="Vincent Simiyu",
+            budget=Decimal("750000"),
+        )
+        token = RefreshToken.for_user(user).access_token
+        response = async_to_sync(AsyncClient().get)(
+            reverse("guests:list_guests"),
+            headers={"authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.usefixtures("clear_cache")
+class TestQueueLogging:
+    """Test log records are written off the request thread."""
+
+    @pytest.fixture
+    def target(self):
+        handler = logging.handlers.BufferingHandler(capacity=100)
+        handler.name = "test-target"
+        yield handler
+        handler.close()
+
+    def make_record(self, message):
+        return logging.LogRecord(
+            "apps.test", logging.INFO, __file__, 1, message, (), None
+        )
+
+    def test_records_reach_target_handler(self, target):
+        """Test the listener thread runs the named handlers."""
+        handler = QueueHandler(["test-target"])
+        handler.name = "test-queue"
+        handler.emit(self.make_record("guest created"))
+        handler.close()
+
+        assert [record.getMessage() for record in target.buffer] == ["guest created"]
+        assert log_records.value(handler="test-queue", outcome="queued") == 1
+
+    def test_prepare_keeps_traceback_out_of_message(self):
+        """Test exceptions survive the hand-off for the listener's formatter."""
+        try:
+            raise RuntimeError("vendor sync failed")
+        except RuntimeError:
+            record = logging.LogRecord(
+                "apps.test", logging.ERROR, __file__, 1, "boom", (), sys.exc_info()
+            )
+
+        prepared = QueueHandler([]).prepare(record)
+
+        assert prepared.getMessage() == "boom"
+        assert prepared.exc_info is None
+        assert "vendor sync failed" in prepared.exc_text
+
+    def test_drop_new_discards_overflow(self):
+        """Test a full queue drops new records and counts them."""
+        handler = QueueHandler([], maxsize=1)
+        handler.name = "test-queue"
+        handler.enqueue(self.make_record("first"))
+        handler.enqueue(self.make_record("second"))
+
+        assert handler.queue.get_nowait().getMessage() == "first"
+        assert log_records.value(handler="test-queue", outcome="dropped") == 1
+
+    def test_drop_oldest_keeps_newest(self):
+        """Test a full queue can evict its oldest record instead."""
+        handler = QueueHandler([], maxsize=1, overflow="drop_oldest")
+        handler.name = "test-queue"
+        handler.enqueue(self.make_record("first"))
+        handler.enqueue(self.make_record("second"))
+
+        assert handler.queue.get_nowait().getMessage() == "second"
+        assert log_records.value(handler="test-queue", outcome="dropped") == 1
+
+    def test_rotated_files_are_gzipped(self, tmp_path):
+        """Test size-based rotation compresses the previous file."""
+        path = tmp_path / "django.log"
+        handler = GzipRotatingFileHandler(path, maxBytes=64, backupCount=2)
+        for index in range(4):
+            handler.emit(self.make_record(f"guest {index} " + "x" * 40))
+        handler.close()
+
+        backup = tmp_path / "django.log.1.gz"
+        assert backup.exists()
+        assert gzip.decompress(backup.read_bytes()).startswith(b"guest")
+        assert not (tmp_path / "django.log.3.gz").exists()
+
+    def test_file_handler_creates_its_directory(self, tmp_path):
+        """Test the log directory is created on the first write."""
+        path = tmp_path / "logs" / "django.log"
+        handler = GzipRotatingFileHandler(path, maxBytes=64, delay=True)
+        assert not path.parent.exists()
+
+        handler.emit(self.make_record("first"))
+        handler.close()
+        assert path.read_text().startswith("first")
+
+
+class TestStructuredRequestLogs:
+    """Test JSON request logs and production sampling."""
+
+    def run_request(self, status_code=200, delay=0.0):
+        def get_response(request):
+            time.sleep(delay)
+            return HttpResponse(status=status_code)
+
+        middleware = RequestLoggingMiddleware(get_response)
+        middleware(RequestFactory().get("/api/v1/guests/list/"))
+
+    def test_json_formatter_emits_extra_fields(self):
+        """Test one JSON object per record including request fields."""
+        record = logging.LogRecord(
+            "apps.requests", logging.INFO, __file__, 1, "GET %s", ("/x/",), None
+        )
+        record.request_id = "abc12345"
+        record.status_code = 200
+        record.duration_ms = 1.5
+
+        data = json.loads(JsonFormatter().format(record))
+
+        assert data["message"] == "GET /x/"
+        assert data["level"] == "INFO"
+        assert data["request_id"] == "abc12345"
+        assert data["status_code"] == 200
+        assert data["duration_ms"] == 1.5
+        assert "args" not in data
+
+    @override_settings(DEBUG=False, LOG_SAMPLE_RATE=0.0)
+    def test_production_drops_unsampled_success(self, records):
+        """Test successful responses outside the sample are not logged."""
+        self.run_request()
+
+        assert not [r for r in records if hasattr(r, "status_code")]
+
+    @override_settings(DEBUG=False, LOG_SAMPLE_RATE=1.0)
+    def test_production_keeps_sampled_success(self, records):
+        """Test sampled responses record the sample rate."""
+        self.run_request()
+
+        (record,) = [r for r in records if hasattr(r, "status_code")]
+        assert record.sample_rate == 1.0
+        assert record.user_id is None
+
+    @override_settings(DEBUG=False, LOG_SAMPLE_RATE=0.0)
+    def test_production_keeps_errors(self, records):
+        """Test client errors are logged regardless of sampling."""
+        self.run_request(status_code=404)
+
+        (record,) = [r for r in records if hasattr(r, "status_code")]
+        assert record.levelno == logging.WARNING
+
+    @override_settings(DEBUG=False, LOG_SAMPLE_RATE=0.0, LOG_SLOW_REQUEST_MS=1)
+    def test_production_keeps_slow_requests(self, records):
+        """Test slow responses are logged regardless of sampling."""
+        self.run_request(delay=0.01)
+
+        (record,) = [r for r in records if hasattr(r, "status_code")]
+        assert record.slow is True
+
+
+@pytest.mark.django_db
+class TestQueryStats:
+    """Test per-request query counting and timing."""
+
+    def count_users(self, request):
+        User.objects.count()
+        User.objects.count()
+        User.objects.filter(username="planner").exists()
+        return HttpResponse()
+
+    def test_collects_count_time_and_duplicates(self):
+        """Test statements run inside the block are recorded."""
+        with collect_query_stats() as stats:
+            self.count_users(None)
+
+        assert stats.count == 3
+        assert stats.duplicates == 1
+        assert stats.total_time >= stats.slowest_time > 0
+        assert "auth_user" in stats.slowest_sql
+
+    def test_server_timing_entry(self):
+        """Test the header entry reports SQL time and query counts."""
+        stats = QueryStats()
+        stats.record("SELECT 1", 0.0125)
+
+        assert stats.server_timing() == 'db;dur=12.50;desc="1 queries, 0 duplicates"'
+
+    @override_settings(DEBUG=True, SERVER_TIMING_HEADER=True)
+    def test_response_log_and_header_include_stats(self, records):
+        """Test the middleware attaches query stats to the log and header."""
+        middleware = RequestLoggingMiddleware(self.count_users)
+        response = middleware(RequestFactory().get("/api/v1/guests/list/"))
+
+        (record,) = [r for r in records if hasattr(r, "status_code")]
+        assert record.db_queries == 3
+        assert record.db_duplicates == 1
+        assert "3 queries" in record.getMessage()
+        assert response["Server-Timing"].startswith("app;dur=")
+        assert 'desc="3 queries, 1 duplicates"' in response["Server-Timing"]
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(DEBUG=True, SERVER_TIMING_HEADER=True)
+    def test_counts_queries_of_sync_views_under_asgi(self, records):
+        """Test queries a sync view runs off the event loop are counted."""
+        user = User.objects.create_user(username="asgi", password="pass12345")
+        WeddingProfile.objects.create(
+            user=user,
+            wedding_date=date.today() + timedelta(days=200),
+            bride_name="Aisha Juma",
+            groom_name="Vincent Simiyu",
+            budget=Decimal("750000"),
+        )
+
+        response = asgi_get(user, reverse("guests:list_guests"))
+
+        assert response.status_code == status.HTTP_200_OK
+        (record,) = [r for r in records if hasattr(r, "status_code")]
+        assert record.db_queries > 0
+        assert f'desc="{record.db_queries} queries' in response["Server-Timing"]
+
+    @override_settings(DEBUG=True, LOG_QUERY_STATS=False)
+    def test_stats_can_be_disabled(self, records):
+        """Test no wrapper is installed when query stats are off."""
+        middleware = RequestLoggingMiddleware(self.count_users)
+        response = middleware(RequestFactory().get("/api/v1/guests/list/"))
+
+        (record,) = [r for r in records if hasattr(r, "status_code")]
+        assert not hasattr(record, "db_queries")
+        assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("clear_cache")
+class TestMetricsEndpoint:
+    """Test request metrics and the protected /metrics endpoint."""
+
+    def make_planner(self):
+        user = User.objects.create_user(username="metrics", password="pass12345")
+        WeddingProfile.objects.create(
+            user=user,
+            wedding_date=date.today() + timedelta(days=200),
+            bride_name="Aisha Juma",
+            groom_name="Vincent Simiyu",
+            budget=Decimal("750000"),
+        )
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.mark.django_db(transaction=True)
+    def test_records_query_counts_of_asgi_requests(self):
+        """Test the query histogram sees the queries of ASGI requests."""
+        self.make_planner()
+        user = User.objects.get(username="metrics")
+
+        asgi_get(user, reverse("guests:list_guests"))
+
+        (queries,) = [
+            value
+            for name, labels, value in http_request_db_queries.exposition_samples()
+            if name.endswith("_sum") and labels["view"] == "guests:list_guests"
+        ]
+        assert queries > 0
+
+    @override_settings(METRICS_TOKEN="scrape-token")
+    def test_requests_are_labelled_by_url_name(self):
+        """Test counts, latency and query counts are recorded per view."""
+        client = self.make_planner()
+        client.get(reverse("guests:list_guests"))
+
+        assert (
+            http_requests.value(view="guests:list_guests", method="GET", status=200)
+            == 1
+        )
+        assert http_request_db_queries.value(view="guests:list_guests") == 1
+
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-token")
+        body = response.content.decode()
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert (
+            'http_requests_total{view="guests:list_guests",method="GET",status="200"}'
+            in body
+        )
+        assert (
+            'http_request_duration_seconds_count{view="guests:list_guests",'
+            'method="GET"} 1.0' in body
+        )
+
+    @override_settings(METRICS_TOKEN="scrape-token")
+    def test_wrong_token_is_rejected(self):
+        """Test scrapes need the configured bearer token."""
+        response = APIClient().get("/metrics", HTTP_AUTHORIZATION="Bearer nope")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_hidden_without_token_in_production(self):
+        """Test the endpoint does not exist without a token outside DEBUG."""
+        assert APIClient().get("/metrics").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_auth_outcomes_are_counted(self):
+        """Test failed logins show up in the auth counter."""
+        APIClient().post(
+            reverse("authentication:login"),
+            {"username": "nobody", "password": "wrong"},
+            format="json",
+        )
+
+        assert (
+            metrics_registry.get("auth_events_total").value(
+                event="login", outcome="failure"
+            )
+            == 1
+        )
+
+
+class TestRequestProfiling:
+    """Test the sampling profiler middleware."""
+
+    def slow_view(self, request):
+        time.sleep(0.05)
+        return HttpResponse()
+
+    def make_middleware(self, tmp_path, **overrides):
+        options = {
+            "PROFILE_REQUESTS": True,
+            "PROFILE_SAMPLE_RATE": 0.0,
+            "PROFILE_SLOW_REQUEST_MS": 10_000,
+            "PROFILE_INTERVAL_MS": 1,
+            "PROFILES_DIR": tmp_path,
+            **overrides,
+        }
+        with override_settings(**options):
+            return RequestProfilingMiddleware(self.slow_view)
+
+    def run_request(self, middleware):
+        request = RequestFactory().get("/api/v1/guests/list/")
+        request.request_id = "abcd1234"
+        return middleware(request)
+
+    @override_settings(PROFILE_REQUESTS=False)
+    def test_disabled_by_default(self):
+        """Test the middleware removes itself unless enabled."""
+        with pytest.raises(MiddlewareNotUsed):
+            RequestProfilingMiddleware(self.slow_view)
+
+    def test_fast_unsampled_requests_write_nothing(self, tmp_path):
+        """Test requests under the threshold leave no files."""
+        self.run_request(self.make_middleware(tmp_path))
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_slow_requests_write_collapsed_stacks(self, tmp_path):
+        """Test slow requests keep flamegraph-ready stacks tagged with the id."""
+        self.run_request(self.make_middleware(tmp_path, PROFILE_SLOW_REQUEST_MS=10))
+
+        (path,) = tmp_path.iterdir()
+        assert path.name.endswith("-abcd1234.collapsed")
+        stack, count = path.read_text().splitlines()[0].rsplit(" ", 1)
+        assert "TestRequestProfiling.slow_view" in stack
+        assert int(count) > 0
+
+    def test_sampled_requests_write_pstats(self, tmp_path):
+        """Test sampled requests are profiled with cProfile."""
+        self.run_request(self.make_middleware(tmp_path, PROFILE_SAMPLE_RATE=1.0))
+
+        (path,) = tmp_path.glob("*.pstats")
+        stats = pstats.Stats(str(path))
+        assert any(name == "slow_view" for _, _, name in stats.stats)
+
+    def test_oldest_profiles_are_pruned(self, tmp_path):
+        """Test the directory is kept within its byte budget."""
+        for index in range(3):
+            path = tmp_path / f"{index}.collapsed"
+            path.write_text("x" * 100)
+            os.utime(path, (index, index))
+
+        deleted = prune_profiles(tmp_path, max_bytes=150)
+
+        assert [path.name for path in deleted] == ["0.collapsed", "1.collapsed"]
+        assert [path.name for path in tmp_path.iterdir()] == ["2.collapsed"]
+
+    def test_sampler_only_records_registered_threads(self):
+        """Test samples stop once a thread is unregistered."""
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        time.sleep(0.02)
+        samples = sampler.stop()
+
+        assert sum(samples.values()) > 0
+        assert all("test_sampler_only_records" in stack for stack in samples)
+        assert sampler.stop() == {}
+
+
+@pytest.mark.django_db
+class TestSQLComments:
+    """Test SQL statements are tagged with the request that issued them."""
+
+    def run_request(self, **overrides):
+        """Run two identical queries through the middleware and return the SQL."""
+        executed = []
+
+        def record(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        def view(request):
+            request.resolver_match = resolve(reverse("guests:list_guests"))
+            with connection.execute_wrapper(record):
+                User.objects.filter(username="planner").exists()
+                User.objects.filter(username="planner").exists()
+            return HttpResponse()
+
+        with override_settings(**{"DEBUG": True, "SQL_COMMENTS": True, **overrides}):
+            RequestLoggingMiddleware(view)(RequestFactory().get("/api/v1/guests/"))
+        return executed
+
+    def test_format_comment_sorts_and_encodes(self):
+        """Test tags follow the sqlcommenter format."""
+        assert (
+            format_comment({"route": "a/b", "app": "guests", "empty": ""})
+            == "/*app='guests',route='a%2Fb'*/"
+        )
+
+    def test_statements_carry_request_id_route_and_app(self):
+        """Test the comment is appended after the untouched statement."""
+        first, _ = self.run_request()
+
+        statement, comment = first.rsplit(" /*", 1)
+        assert statement.startswith("SELECT")
+        assert comment.startswith("app='guests',request_id='")
+        assert comment.endswith(",route='list_guests'*/")
+
+    def test_sql_text_is_stable_for_statement_caches(self):
+        """Test repeated statements keep identical text, so caches still hit.
+
+        Within a request the comment never changes; without the request id
+        the text is also identical across requests.
+        """
+        first, second = self.run_request()
+        assert first == second
+
+        with_id = self.run_request()[0]
+        assert with_id != first
+        assert self.run_request(SQL_COMMENT_REQUEST_ID=False) == self.run_request(
+            SQL_COMMENT_REQUEST_ID=False
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(SQL_COMMENTS=True)
+    def test_statements_of_asgi_requests_are_tagged(self):
+        """Test statements a sync view runs under ASGI carry the comment."""
+        user = User.objects.create_user(username="planner", password="pass12345")
+        executed = []
+
+        def record(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # The view runs on this thread, inside the request's wrappers.
+        with connection.execute_wrapper(record):
+            response = asgi_get(user, reverse("authentication:profile"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert executed
+        assert all("route='profile'" in sql for sql in executed)
+
+    def test_tagging_can_be_disabled(self):
+        """Test statements are left alone when the toggle is off."""
+        first, _ = self.run_request(SQL_COMMENTS=False)
+
+        assert "/*" not in first
+
+
+@pytest.mark.django_db
+class TestNPlusOneDetection:
+    """Test repeated query shapes are caught per request."""
+
+    def make_planner(self, tasks=0):
+        user = User.objects.create_user(username="nplusone", password="pass12345")
+        profile = WeddingProfile.objects.create(
+            user=user,
+            wedding_date=date.today() + timedelta(days=200),
+            bride_name="Aisha Juma",
+            groom_name="Vincent Simiyu",
+            budget=Decimal("750000"),
+        )
+        vendor = Vendor.objects.create(
+            wedding_profile=profile, name="Tamu Caterers", category="catering"
+        )
+        for index in range(tasks):
+            Task.objects.create(
+                wedding_profile=profile, title=f"Task {index}", vendor=vendor
+            )
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def lookup_users(self, request):
+        for index in range(7):
+            User.objects.filter(pk=index).first()
+        return HttpResponse()
+
+    def test_normalize_sql_removes_values_and_comments(self):
+        """Test statements differing only in values share a shape."""
+        assert normalize_sql(
+            "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21 "
+            "/*request_id='abc'*/"
+        ) == normalize_sql("SELECT * FROM t  WHERE id IN (%s) AND name = 'y' LIMIT 1")
+
+    @override_settings(NPLUSONE_RAISE=True)
+    def test_raises_with_originating_stack(self):
+        """Test the error names the shape and the code that looped."""
+        middleware = RequestLoggingMiddleware(self.lookup_users)
+
+        with pytest.raises(NPlusOneError) as error:
+            middleware(RequestFactory().get("/api/v1/tasks/list/"))
+
+        assert "7x SELECT" in str(error.value)
+        assert "in lookup_users" in str(error.value)
+
+    @override_settings(DEBUG=True, NPLUSONE_RAISE=False)
+    def test_warns_when_not_raising(self, records):
+        """Test the detector logs a warning outside the test suite."""
+        RequestLoggingMiddleware(self.lookup_users)(
+            RequestFactory().get("/api/v1/tasks/list/")
+        )
+
+        (record,) = [r for r in records if hasattr(r, "n_plus_one")]
+        assert record.levelno == logging.WARNING
+        assert record.n_plus_one[0]["count"] == 7
+
+    @pytest.mark.django_db(transaction=True)
+    def test_raises_for_sync_views_under_asgi(self, monkeypatch):
+        """Test the detector sees queries a view runs off the event loop."""
+        self.make_planner(tasks=8)
+        # Without the join, listing tasks loads each task's vendor by itself.
+        monkeypatch.setattr(QuerySet, "select_related", lambda self, *fields: self)
+
+        with pytest.raises(NPlusOneError, match="in list_tasks"):
+            asgi_get(User.objects.get(username="nplusone"), reverse("tasks:list_tasks"))
+
+    def test_list_endpoints_do_not_query_per_row(self):
+        """Test relations rendered by list serializers are joined up front."""
+        client = self.make_planner(tasks=8)
+
+        for name in ("tasks:list_tasks", "guests:list_guests", "vendors:list_vendors"):
+            assert client.get(reverse(name)).status_code == status.HTTP_200_OK
+
+
+class TestRequestBodyLogging:
+    """Test request bodies are logged at bounded cost."""
+
+    @pytest.fixture
+    def debug_records(self, records):
+        logger = logging.getLogger("apps.requests")
+        logger.setLevel(logging.DEBUG)
+        return records
+
+    def log_body(self, payload, **overrides):
+        body = json.dumps(payload).encode()
+        request = RequestFactory().post(
+            "/api/v1/guests/", body, content_type="application/json"
+        )
+        options = {"LOG_REQUEST_BODIES": True, **overrides}
+        with override_settings(**options):
+            middleware = RequestLoggingMiddleware(lambda request: HttpResponse())
+        middleware._log_request_body(request, "abcd1234")
+
+    def body_messages(self, records):
+        return [r.getMessage() for r in records if "Request body" in r.getMessage()]
+
+    def test_sensitive_values_are_redacted(self, debug_records):
+        """Test passwords are hidden and emails partially hidden, at any depth."""
+        self.log_body(
+            {
+                "username": "aisha",
+                "password": "s3cret!",
+                "guests": [{"name": "Mary", "Email": "mary@example.com"}],
+            }
+        )
+
+        (message,) = self.body_messages(debug_records)
+        assert "s3cret" not in message
+        assert '"password": "[REDACTED]"' in message
+        assert '"Email": "mar***@example.com"' in message
+        assert '"username": "aisha"' in message
+
+    def test_bulk_bodies_are_truncated(self, debug_records):
+        """Test only the first bytes of a large body are logged, with its size."""
+        guests = [{"name": f"Guest {i}", "phone": "0712345678"} for i in range(2000)]
+        self.log_body({"guests": guests}, LOG_REQUEST_BODY_MAX_BYTES=100)
+
+        (message,) = self.body_messages(debug_records)
+        assert len(message) < 250
+        assert "bytes total>" in message
+        assert "0712345678" not in message
+
+    def test_truncated_secret_is_still_redacted(self, debug_records):
+        """Test a value cut off by truncation is not leaked."""
+        self.log_body(
+            {"password": "a-very-long-secret-value"}, LOG_REQUEST_BODY_MAX_BYTES=20
+        )
+
+        (message,) = self.body_messages(debug_records)
+        assert "a-very" not in message
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"token": ["s1", "s2"], "name": "Mary"},
+            {"password": {"old": "s1", "new": "s2"}, "name": "Mary"},
+            {"Email": [{"address": "s1@example.com"}, "s2"], "name": "Mary"},
+        ],
+    )
+    def test_nested_values_are_redacted_whole(self, debug_records, payload):
+        """Test lists and objects under sensitive keys are hidden entirely."""
+        self.log_body(payload)
+
+        (message,) = self.body_messages(debug_records)
+        body = json.loads(message.split("Request body: ", 1)[1])
+        assert "s1" not in message
+        assert "s2" not in message
+        assert body == {next(iter(payload)): "[REDACTED]", "name": "Mary"}
+
+    def test_key_like_text_in_values_is_not_a_key(self, debug_records):
+        """Test quoted text resembling a key does not throw redaction off."""
+        self.log_body({"note": 'say "token": 1', "token": 'q"secret'})
+
+        (message,) = self.body_messages(debug_records)
+        body = json.loads(message.split("Request body: ", 1)[1])
+        assert body == {"note": 'say "token": 1', "token": "[REDACTED]"}
+
+    def test_truncated_nested_secret_is_still_redacted(self, debug_records):
+        """Test a list cut off by truncation is hidden to the end of the text."""
+        self.log_body(
+            {"name": "Mary", "token": ["first-secret", "second-secret"]},
+            LOG_REQUEST_BODY_MAX_BYTES=40,
+        )
+
+        (message,) = self.body_messages(debug_records)
+        assert "secret" not in message
+        assert '"name": "Mary"' in message
+
+    def test_skipped_when_debug_logging_is_off(self, records):
+        """Test the body is not read at all unless DEBUG records are wanted."""
+        self.log_body({"password": "s3cret!"})
+
+        assert self.body_messages(records) == []
+
+
+class TestLatencyReport:
+    """Test the latency report over text and JSON request logs."""
+
+    def test_reports_percentiles_per_route(self, tmp_path):
+        """Test paths are grouped by URL name across plain and gzipped files."""
+        text_lines = [
+            f"[2025-01-01 10:00:00] INFO apps.requests: [ab12cd{i:02d}] GET "
+            f"/api/v1/guests/{i}/ - 200 ({i + 1}.0ms) - 2 queries (1ms, 0 duplicated)"
+            for i in range(100)
+        ]
+        (tmp_path / "django.log").write_text("\n".join(text_lines) + "\nnoise\n")
+        json_lines = [
+            json.dumps(
+                {
+                    "message": "...",
+                    "method": "GET",
+                    "path": "/api/v1/tasks/list/",
+                    "status_code": 500 if i == 0 else 200,
+                    "duration_ms": 20.0,
+                }
+            )
+            for i in range(4)
+        ]
+        with gzip.open(tmp_path / "django.log.1.gz", "wt") as handle:
+            handle.write("\n".join(json_lines))
+
+        output = StringIO()
+        call_command(
+            "latency_report",
+            str(tmp_path / "django.log"),
+            str(tmp_path / "django.log.1.gz"),
+            format="json",
+            stdout=output,
+            stderr=StringIO(),
+        )
+        guests, tasks = json.loads(output.getvalue())
+
+        assert guests["route"] == "guests:get_guest"
+        assert guests["count"] == 100
+        assert guests["p50_ms"] == pytest.approx(50, rel=0.02)
+        assert guests["p99_ms"] == pytest.approx(99, rel=0.02)
+        assert guests["max_ms"] == 100
+        assert guests["error_rate"] == 0
+        assert tasks["route"] == "tasks:list_tasks"
+        assert tasks["error_rate"] == 0.25
+
+    def report(self, tmp_path, records):
+        """Run the report over JSON ``records``; return its rows and warnings."""
+        log = tmp_path / "django.log"
+        log.write_text("".join(json.dumps(record) + "\n" for record in records))
+        output, errors = StringIO(), StringIO()
+        call_command(
+            "latency_report", str(log), format="json", stdout=output, stderr=errors
+        )
+        return json.loads(output.getvalue()), errors.getvalue()
+
+    def test_sampled_lines_are_weighted(self, tmp_path):
+        """Test a line sampled at 10% stands for ten requests."""
+        response = {"method": "GET", "path": "/api/v1/tasks/list/"}
+        failed = [{**response, "status_code": 500, "duration_ms": 100.0}] * 9
+        sampled = [
+            {**response, "status_code": 200, "duration_ms": 1.0, "sample_rate": 0.1}
+        ] * 10
+        (tasks,), warnings_text = self.report(tmp_path, failed + sampled)
+
+        assert tasks["count"] == 109
+        assert tasks["logged"] == 19
+        assert tasks["error_rate"] == pytest.approx(9 / 109, abs=1e-4)
+        assert tasks["p50_ms"] == pytest.approx(1, rel=0.02)
+        assert tasks["p90_ms"] == pytest.approx(1, rel=0.02)
+        assert tasks["p99_ms"] == pytest.approx(100, rel=0.02)
+        assert warnings_text == ""
+
+    def test_warns_about_unweighted_and_partial_logs(self, tmp_path):
+        """Test text lines and WARNING-only logs are reported as skewed."""
+        log = tmp_path / "django.log"
+        log.write_text(
+            "[2025-01-01 10:00:00] WARNING apps.requests: [ab12cd00] GET "
+            "/api/v1/tasks/list/ - 200 (1500.0ms) - slow\n"
+        )
+        errors = StringIO()
+        call_command("latency_report", str(log), stdout=StringIO(), stderr=errors)
+
+        assert "LOG_FORMAT=json" in errors.getvalue()
+        assert "LOG_FILE_LEVEL=INFO" in errors.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadTest:
+    """Test the load-test harness end to end against a live server."""
+
+    def test_reports_per_route_latency(self, live_server, tmp_path):
+        """Test every scenario runs and the JSON report covers its routes."""
+        output = tmp_path / "loadtest.json"
+        call_command(
+            "loadtest",
+            base_url=live_server.url,
+            couples=1,
+            guests=20,
+            tasks=5,
+            vendors=3,
+            # SQLite's shared in-memory test database locks on parallel writes.
+            concurrency=1,
+            duration=1.0,
+            output=str(output),
+            stdout=StringIO(),
+        )
+        report = json.loads(output.read_text())
+
+        routes = {row["route"]: row for row in report["routes"]}
+        assert report["requests"] == sum(row["requests"] for row in routes.values())
+        assert "guests:update_rsvp" in routes
+        assert "profiles:wedding_progress" in routes
+        assert all(row["error_rate"] == 0 for row in routes.values())
+        assert (
+            Guest.objects.filter(
+                wedding_profile__user__username__startswith=("loadtest-couple-")
+            ).count()
+            == 20
+        )
+
+
+@pytest.mark.django_db
+class TestBenchmarkEndpoints:
+    """Test the in-process endpoint benchmark and its baseline checks."""
+
+    def run(self, baseline, **options):
+        """Benchmark the guest list on the small data set in place."""
+        call_command(
+            "benchmark_endpoints",
+            sizes=["small"],
+            iterations=1,
+            endpoints=["guests:list_guests", "vendors:create_vendor"],
+            baseline=str(baseline),
+            in_place=True,
+            stdout=StringIO(),
+            stderr=StringIO(),
+            **options,
+        )
+
+    def test_writes_and_checks_baseline(self, tmp_path):
+        """Test a run passes against the baseline it just wrote."""
+        baseline = tmp_path / "baseline.json"
+        self.run(baseline, update_baseline=True)
+
+        results = json.loads(baseline.read_text())["results"]["small"]
+        assert set(results) == {"guests:list_guests", "vendors:create_vendor"}
+        assert results["guests:list_guests"]["status"] == [200]
+        assert results["vendors:create_vendor"]["status"] == [201]
+        assert results["guests:list_guests"]["queries"] > 0
+        assert not Guest.objects.filter(
+            wedding_profile__user__username="benchmark-small"
+        ).exists()
+
+        self.run(baseline, time_threshold=100.0, memory_threshold=100.0)
+
+    def test_fails_when_queries_increase(self, tmp_path):
+        """Test an endpoint issuing more queries than the baseline fails."""
+        baseline = tmp_path / "baseline.json"
+        self.run(baseline, update_baseline=True)
+        report = json.loads(baseline.read_text())
+        report["results"]["small"]["guests:list_guests"]["queries"] -= 1
+        baseline.write_text(json.dumps(report))
+
+        with pytest.raises(CommandError, match="guests:list_guests"):
+            self.run(baseline, time_threshold=100.0, memory_threshold=100.0)
+
+    def test_covers_every_api_url_name(self):
+        """Test every named API route has a benchmark case."""
+        missing = [
+            name
+            for name in url_names()
+            if name not in CASES and not name.startswith("admin:")
+        ]
+        assert missing == []
+
+
+@pytest.mark.django_db
+class TestSeedWeddings:
+    """Test bulk seeding of realistic wedding data."""
+
+    def seed(self, prefix, **options):
+        """Run seed_weddings with small volumes and return its output."""
+        out = StringIO()
+        options = {"couples": 3, "guests": 40, "tasks": 10, "vendors": 4, **options}
+        call_command(
+            "seed_weddings", prefix=prefix, batch_size=50, stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_creates_requested_volumes(self):
+        """Test every couple gets a profile and the requested rows."""
+        output = self.seed("seed-a-")
+
+        profiles = WeddingProfile.objects.filter(user__username__startswith="seed-a-")
+        assert profiles.count() == 3
+        for profile in profiles:
+            assert profile.guests.count() == 40
+            assert profile.tasks.count() == 10
+            assert profile.vendors.count() == 4
+        assert (
+            Task.objects.filter(wedding_profile__in=profiles, vendor__isnull=False)
+            .exclude(vendor__wedding_profile=F("wedding_profile"))
+            .count()
+            == 0
+        )
+        assert "Created 168 rows" in output
+
+    def test_values_pass_validators(self):
+        """Test generated names, phones and venues satisfy the apps' validators."""
+        self.seed("seed-a-")
+
+        profiles = WeddingProfile.objects.filter(user__username__startswith="seed-a-")
+        for profile in profiles:
+            validate_venue_name(profile.venue)
+            validate_wedding_budget_structure(profile.budget)
+        for guest in Guest.objects.filter(wedding_profile__in=profiles):
+            validate_guest_name(guest.name)
+            validate_guest_email_format(guest.email)
+        for vendor in Vendor.objects.filter(wedding_profile__in=profiles):
+            validate_vendor_name(vendor.name)
+            validate_kenyan_phone_number(vendor.phone)
+
+    def test_same_seed_produces_same_data(self):
+        """Test seeding is deterministic for a given seed."""
+        self.seed("seed-a-", seed=7)
+        self.seed("seed-b-", seed=7)
+
+        def rows(prefix):
+            return list(
+                Guest.objects.filter(wedding_profile__user__username__startswith=prefix)
+                .order_by("pk")
+                .values_list("name", "email", "rsvp_status", "plus_one")
+            )
+
+        assert rows("seed-a-") == rows("seed-b-")
+
+    def test_rejects_guest_lists_over_the_limit(self):
+        """Test more guests than a wedding may have is refused."""
+        with pytest.raises(CommandError, match="cannot exceed 2000"):
+            self.seed("seed-a-", guests=2001)
+
+    def test_existing_prefix_requires_clear(self):
+        """Test reseeding a prefix fails unless --clear replaces the data."""
+        self.seed("seed-a-")
+        with pytest.raises(CommandError, match="--clear"):
+            self.seed("seed-a-")
+
+        self.seed("seed-a-", couples=1, clear=True)
+        assert User.objects.filter(username__startswith="seed-a-").count() == 1
+        assert (
+            Guest.objects.filter(
+                wedding_profile__user__username__startswith="seed-a-"
+            ).count()
+            == 40
+        )
+
+
+class TestQueryPlanHelpers:
+    """Test reading table accesses and outlines out of EXPLAIN JSON."""
+
+    PLAN: ClassVar = {
+        "Node Type": "Sort",
+        "Plans": [
+            {
+                "Node Type": "Nested Loop",
+                "Plans": [
+                    {
+                        "Node Type": "Bitmap Heap Scan",
+                        "Relation Name": "guests_guest",
+                        "Plans": [
+                            {
+                                "Node Type": "Bitmap Index Scan",
+                                "Index Name": "guests_guest_wedding_profile_id",
+                            }
+                        ],
+                    },
+                    {
+                        "Node Type": "Seq Scan",
+                        "Relation Name": "profiles_weddingprofile",
+                    },
+                ],
+            }
+        ],
+    }
+
+    def test_scans_merge_bitmap_index_into_heap_scan(self):
+        """Test a bitmap scan is reported as one indexed table access."""
+        assert query_plans.scans(self.PLAN) == [
+            query_plans.Scan(
+                "Bitmap Heap Scan", "guests_guest", "guests_guest_wedding_profile_id"
+            ),
+            query_plans.Scan("Seq Scan", "profiles_weddingprofile"),
+        ]
+        assert [scan.uses_index for scan in query_plans.scans(self.PLAN)] == [
+            True,
+            False,
+        ]
+
+    def test_outline_drops_costs(self):
+        """Test the outline keeps node types, indexes and relations only."""
+        assert query_plans.outline(self.PLAN) == [
+            "Sort",
+            "  Nested Loop",
+            "    Bitmap Heap Scan on guests_guest",
+            "      Bitmap Index Scan using guests_guest_wedding_profile_id",
+            "    Seq Scan on profiles_weddingprofile",
+        ]
+
+
+# Tables that grow with every wedding; hot queries must reach them by index.
+PLANNED_TABLES = ("guests_guest", "tasks_task", "vendors_vendor")
+QUERY_PLANS_DIR = Path(__file__).parent / "query_plans"
+# Outline name, URL name and query string of each hot request.
+HOT_QUERIES = [
+    ("list_guests", "guests:list_guests", ""),
+    (
+        "list_guests_filtered",
+        "guests:list_guests",
+        "?rsvp_status=confirmed&plus_one=true",
+    ),
+    ("list_tasks", "tasks:list_tasks", ""),
+    (
+        "list_tasks_filtered",
+        "tasks:list_tasks",
+        "?completed=false&assigned_to=bride",
+    ),
+    ("list_vendors", "vendors:list_vendors", "?category=cater"),
+    ("search_vendors", "vendors:search_vendors", "?q=cater"),
+    ("guest_statistics", "guests:guest_statistics", ""),
+    ("wedding_progress", "profiles:wedding_progress", ""),
+]
+
+
+def updating_query_plans(config) -> bool:
+    """Return whether this run should rewrite the recorded plan outlines."""
+    return bool(
+        config.getoption("update_query_plans")
+        or os.environ.get("UPDATE_QUERY_PLANS") == "1"
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Query plans are PostgreSQL-specific"
+)
+@pytest.mark.django_db
+class TestQueryPlans:
+    """Test the hot list and statistics queries keep using their indexes.
+
+    Plans are compared as outlines recorded in ``query_plans/``. Outlines are
+    only written with ``--update-query-plans`` (or ``UPDATE_QUERY_PLANS=1``),
+    against PostgreSQL. A different outline fails the test; without a recorded
+    outline only the sequential scan check runs.
+    """
+
+    @pytest.fixture(scope="class")
+    def couple(self, django_db_setup, django_db_blocker):
+        """Seed enough weddings for the planner to favour indexes."""
+        with django_db_blocker.unblock(), transaction.atomic():
+            seed_weddings(
+                300,
+                guests=150,
+                tasks=40,
+                vendors=15,
+                rng=random.Random(44),
+                username_prefix="plan-couple-",
+            )
+            with connection.cursor() as cursor:
+                for table in PLANNED_TABLES:
+                    cursor.execute(f"ANALYZE {table}")
+            yield User.objects.get(username="plan-couple-000000")
+            transaction.set_rollback(True)
+
+    def hot_statements(self, couple, url_name, query):
+        """Return the SELECTs on per-wedding tables one request runs."""
+        client = APIClient()
+        client.force_authenticate(couple)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(reverse(url_name) + query)
+        assert response.status_code == status.HTTP_200_OK
+        statements = [
+            captured["sql"]
+            for captured in context.captured_queries
+            if captured["sql"].startswith("SELECT")
+            and any(f'"{table}"' in captured["sql"] for table in PLANNED_TABLES)
+        ]
+        assert statements, f"{url_name} ran no query on {PLANNED_TABLES}"
+        return statements
+
+    @pytest.mark.parametrize("name,url_name,query", HOT_QUERIES)
+    def test_hot_queries_use_indexes(self, couple, request, name, url_name, query):
+        """Test no per-wedding table is read with a sequential scan."""
+        statements = self.hot_statements(couple, url_name, query)
+        lines, problems = [], []
+        for number, sql in enumerate(statements, 1):
+            plan = query_plans.explain(sql)
+            lines.append(f"-- query {number}")
+            lines.extend(query_plans.outline(plan))
+            problems.extend(
+                f"query {number}: {scan.node_type} on {scan.relation}"
+                for scan in query_plans.scans(plan)
+                if scan.relation in PLANNED_TABLES and not scan.uses_index
+            )
+        current = "\n".join(lines) + "\n"
+        if problems:
+            pytest.fail(
+                "\n".join(["Sequential scans on per-wedding tables:", *problems])
+                + "\n\n"
+                + current
+            )
+
+        recorded_path = QUERY_PLANS_DIR / f"{name}.txt"
+        if updating_query_plans(request.config):
+            QUERY_PLANS_DIR.mkdir(exist_ok=True)
+            recorded_path.write_text(current)
+            return
+        if not recorded_path.exists():
+            # Nothing to compare against yet; the index check above still ran.
+            warnings.warn(
+                f"No plan outline recorded for {name}; run the suite against "
+                "PostgreSQL with --update-query-plans and commit "
+                f"apps/common/query_plans/{recorded_path.name}.",
+                stacklevel=1,
+            )
+            return
+        recorded = recorded_path.read_text()
+        if current != recorded:
+            diff = "".join(
+                difflib.unified_diff(
+                    recorded.splitlines(keepends=True),
+                    current.splitlines(keepends=True),
+                    fromfile=f"recorded {recorded_path.name}",
+                    tofile="current",
+                )
+            )
+            pytest.fail(
+                f"The plan of {name} changed; review the diff and rerun with "
+                f"--update-query-plans if it is expected.\n\n{diff}"
+            )
+
+    def measure(self, statements):
+        """Return the planner's total cost and median runtime in ms."""
+        cost = sum(query_plans.explain(sql)["Total Cost"] for sql in statements)
+        timings = []
+        with connection.cursor() as cursor:
+            for _ in range(20):
+                started = time.perf_counter()
+                for sql in statements:
+                    cursor.execute(sql)
+                    cursor.fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+        return cost, statistics.median(timings)
+
+    def test_profile_indexes_beat_the_foreign_key_index(self, couple):
+        """Test the profile-scoped indexes cost less than the FK index alone.
+
+        Run with ``-s`` for the before and after numbers of every request.
+        """
+        statements = {
+            name: self.hot_statements(couple, url_name, query)
+            for name, url_name, query in HOT_QUERIES
+        }
+        after = {name: self.measure(sqls) for name, sqls in statements.items()}
+        # Back to the indexes of the initial migrations, then roll back.
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in (Guest, Task, Vendor):
+                table = model._meta.db_table
+                for index in model._meta.indexes:
+                    cursor.execute(f'DROP INDEX "{index.name}"')
+                cursor.execute(f'CREATE INDEX ON "{table}" ("wedding_profile_id")')
+                cursor.execute(f'ANALYZE "{table}"')
+            before = {name: self.measure(sqls) for name, sqls in statements.items()}
+            transaction.set_rollback(True)
+
+        print(f"\n{'request':<24}{'cost before':>12}{'after':>10}", end="")
+        print(f"{'ms before':>11}{'after':>8}")
+        for name in statements:
+            print(
+                f"{name:<24}{before[name][0]:>12.1f}{after[name][0]:>10.1f}"
+                f"{before[name][1]:>11.2f}{after[name][1]:>8.2f}"
+            )
+        assert sum(cost for cost, _ in after.values()) < sum(
+            cost for cost, _ in before.values()
+        )
+
+
+class TestProfileScopedIndexes:
+    """Test the per-wedding indexes and the migrations that build them."""
+
+    def is_concurrent(self, operation) -> bool:
+        """Return whether ``operation`` builds or drops an index concurrently."""
+        if isinstance(operation, SeparateDatabaseAndState):
+            return any(map(self.is_concurrent, operation.database_operations))
+        if isinstance(operation, RunSQL):
+            return "CONCURRENTLY" in str(operation.sql)
+        return isinstance(operation, AddIndexConcurrently)
+
+    def test_concurrent_index_migrations_are_not_atomic(self):
+        """Test migrations changing indexes concurrently run outside a transaction."""
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        concurrent = [
+            migration
+            for migration in loader.disk_migrations.values()
+            if any(map(self.is_concurrent, migration.operations))
+        ]
+        assert len(concurrent) == 6
+        for migration in concurrent:
+            assert not migration.atomic, f"{migration.app_label}.{migration.name}"
+
+    def test_profile_foreign_keys_are_covered(self):
+        """Test each profile FK without an index of its own leads a full index."""
+        for model in (Guest, Task, Vendor):
+            assert not model._meta.get_field("wedding_profile").db_index
+            assert any(
+                index.fields[0] == "wedding_profile" and index.condition is None
+                for index in model._meta.indexes
+            ), model.__name__
+
+    @pytest.mark.django_db
+    def test_profile_scoped_indexes_exist(self):
+        """Test the migrations created every declared index and no FK index."""
+        with connection.cursor() as cursor:
+            for model in (Guest, Task, Vendor):
+                constraints = connection.introspection.get_constraints(
+                    cursor, model._meta.db_table
+                )
+                for index in model._meta.indexes:
+                    assert constraints[index.name]["index"]
+                assert not [
+                    name
+                    for name, constraint in constraints.items()
+                    if constraint["index"]
+                    and constraint["columns"] == ["wedding_profile_id"]
+                ]
+
+
+class TestMemoryProfiler:
+    """Test per-stage memory measurement."""
+
+    def test_measures_peak_retained_and_sites(self, memory_profiler):
+        """Test a stage reports its allocations and where they were made."""
+        with memory_profiler.stage("kept"):
+            kept = [bytearray(1024) for _ in range(1024)]
+        with memory_profiler.stage("freed"):
+            freed = bytearray(4 * 1024 * 1024)
+            del freed
+
+        stage = memory_profiler["kept"]
+        assert stage.peak_bytes >= 1024 * 1024
+        assert stage.retained_bytes >= 1024 * 1024
+        assert stage.top_sites[0].location.startswith("apps/common/tests.py:")
+        assert stage.top_sites[0].count >= 1024
+        assert memory_profiler["freed"].peak_bytes >= 4 * 1024 * 1024
+        assert memory_profiler["freed"].retained_bytes < 64 * 1024
+        assert "kept" in memory_profiler.report()
+        assert len(kept) == 1024
+
+    def test_unknown_stage(self, memory_profiler):
+        """Test looking up a stage that never ran raises KeyError."""
+        with pytest.raises(KeyError):
+            memory_profiler["missing"]
+
+
+@pytest.mark.django_db
+class TestProfileMemoryCommand:
+    """Test the per-stage endpoint memory report."""
+
+    def test_reports_every_stage_as_json(self):
+        """Test each endpoint gets every stage and allocation sites."""
+        out = StringIO()
+        call_command(
+            "profile_memory",
+            "guests:list_guests",
+            "vendors:list_vendors",
+            guests=50,
+            tasks=5,
+            vendors=10,
+            format="json",
+            in_place=True,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        assert set(report) == {"guests:list_guests", "vendors:list_vendors"}
+        stages = report["guests:list_guests"]
+        assert [stage["stage"] for stage in stages] == [
+            "query",
+            "instances",
+            "serialize",
+            "render",
+            "request",
+        ]
+        assert all(stage["peak_kib"] > 0 for stage in stages)
+        assert stages[1]["top_sites"]
+        assert not User.objects.filter(username="profile-memory").exists()
+
+    def test_rejects_unknown_endpoint(self):
+        """Test an endpoint without a memory case is an error."""
+        with pytest.raises(CommandError, match="guests:create_guest"):
+            call_command("profile_memory", "guests:create_guest", stdout=StringIO())
+
+
+class ContentionMonitor:
+    """Sample PostgreSQL lock waits and count deadlocks while a block runs.
+
+    A background thread polls ``pg_stat_activity`` for backends of the test
+    database waiting on a lock; deadlocks are the change in
+    ``pg_stat_database.deadlocks``.
+    """
+
+    def __init__(self, interval=0.002):
+        """Poll every ``interval`` seconds."""
+        self.interval = interval
+        self.max_lock_waiters = 0
+        self.lock_wait_samples = 0
+        self.samples = 0
+        self.deadlocks = 0
+        self._stop = threading.Event()
+
+    def query(self, sql):
+        """Return the single value ``sql`` selects for the test database."""
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchone()[0]
+
+    def deadlock_count(self):
+        """Return the deadlocks PostgreSQL has recorded for the test database."""
+        return self.query(
+            "SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()"
+        )
+
+    def poll(self):
+        """Record the backends waiting on locks until stopped."""
+        try:
+            while not self._stop.is_set():
+                waiters = self.query(
+                    "SELECT count(*) FROM pg_stat_activity WHERE "
+                    "datname = current_database() AND wait_event_type = 'Lock'"
+                )
+                self.samples += 1
+                self.lock_wait_samples += bool(waiters)
+                self.max_lock_waiters = max(self.max_lock_waiters, waiters)
+                time.sleep(self.interval)
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        """Start sampling."""
+        self._start_deadlocks = self.deadlock_count()
+        self._thread = threading.Thread(target=self.poll)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop sampling and count the deadlocks detected meanwhile."""
+        self._stop.set()
+        self._thread.join()
+        # Backends report their statistics when they go idle; give the last
+        # ones a moment to arrive.
+        time.sleep(0.5)
+        self.query("SELECT pg_stat_clear_snapshot()")
+        self.deadlocks = self.deadlock_count() - self._start_deadlocks
+
+    def summary(self):
+        """Return the measurements as one line."""
+        share = self.lock_wait_samples / self.samples if self.samples else 0
+        return (
+            f"lock waits in {share:.0%} of {self.samples} samples, "
+            f"at most {self.max_lock_waiters} waiting, {self.deadlocks} deadlocks"
+        )
+
+
+def hammer(user, calls, threads):
+    """Send ``calls`` as ``user`` from ``threads`` threads released together.
+
+    Each call is ``(method, path, data)``; calls are dealt out round-robin.
+    Returns the response status codes in completion order and per-request
+    latencies in milliseconds.
+    """
+    token = str(RefreshToken.for_user(user).access_token)
+    barrier = threading.Barrier(threads)
+    statuses = []
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(batch):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        try:
+            barrier.wait()
+            for method, path, data in batch:
+                started = time.perf_counter()
+                response = getattr(client, method)(path, data, format="json")
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    statuses.append(response.status_code)
+                    latencies.append(elapsed)
+        finally:
+            connection.close()
+
+    workers = [
+        threading.Thread(target=worker, args=(calls[index::threads],))
+        for index in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return statuses, latencies
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Row locking needs PostgreSQL"
+)
+@pytest.mark.django_db(transaction=True)
+class TestWriteConcurrency:
+    """Test the write paths keep every update under wedding-day concurrency.
+
+    Threads hammer one wedding through the API while a ContentionMonitor
+    measures lock waits and deadlocks; each test then checks the final rows
+    for lost updates. Run with ``-s`` to see the measurements.
+    """
+
+    THREADS = 8
+
+    @pytest.fixture
+    def wedding(self):
+        """Seed one wedding with a few guests, tasks and vendors."""
+        return seed_wedding(
+            "concurrency-couple",
+            guests=20,
+            tasks=5,
+            vendors=3,
+            rng=random.Random(47),
+        )
+
+    def report(self, name, monitor, latencies):
+        """Print the contention measured for one scenario."""
+        latencies = sorted(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"\n{name}: {len(latencies)} requests, p95 {p95:.1f} ms")
+        print(f"  {monitor.summary()}")
+
+    def test_task_toggles_are_not_lost(self, wedding):
+        """Test concurrent toggles of one task each flip it exactly once."""
+        task = wedding.tasks[0]
+        start = task.is_completed
+        path = reverse("tasks:toggle_task", args=[task.pk])
+
+        with ContentionMonitor() as monitor:
+            statuses, latencies = hammer(
+                wedding.user, [("patch", path, None)] * 201, self.THREADS
+            )
+        self.report("toggle_task_completion", monitor, latencies)
+
+        assert statuses == [200] * 201
+        task.refresh_from_db()
+        assert task.is_completed is not start
+        assert monitor.deadlocks == 0
+
+    def test_rsvp_updates_survive_concurrent_guest_edits(self, wedding):
+        """Test guest edits do not write back the RSVP status they read."""
+        guest = wedding.guests[0]
+        Guest.objects.filter(pk=guest.pk).update(rsvp_status=RSVPStatus.INVITED)
+        rsvp = reverse("guests:update_rsvp", args=[guest.pk])
+        update = reverse("guests:update_guest", args=[guest.pk])
+        calls = []
+        for number in range(100):
+            name = f"Amani {SURNAMES[number % len(SURNAMES)]}"
+            calls.append(("patch", update, {"name": name}))
+            calls.append(("patch", rsvp, {"rsvp_status": RSVPStatus.CONFIRMED}))
+
+        with ContentionMonitor() as monitor:
+            statuses, latencies = hammer(wedding.user, calls, self.THREADS)
+        self.report("update_rsvp_status", monitor, latencies)
+
+        assert statuses == [200] * len(calls)
+        guest.refresh_from_db()
+        assert guest.rsvp_status == RSVPStatus.CONFIRMED
+        assert monitor.deadlocks == 0
+
+    def test_guest_creation_stops_exactly_at_the_cap(self, wedding):
+        """Test racing creations near the cap never exceed MAX_GUESTS."""
+        profile = wedding.profile
+        room = 10
+        factory = WeddingDataFactory(random.Random(47))
+        seeded = ValidationLimits.MAX_GUESTS - room - len(wedding.guests)
+        insert_rows(
+            Guest,
+            [
+                {"wedding_profile_id": profile.pk, **factory.guest(number)}
+                for number in range(seeded)
+            ],
+            batch_size=1000,
+        )
+        path = reverse("guests:create_guest")
+        calls = [("post", path, {"name": "Late Guest"}) for _ in range(room * 4)]
+
+        with ContentionMonitor() as monitor:
+            statuses, latencies = hammer(wedding.user, calls, self.THREADS)
+        self.report("create_guest", monitor, latencies)
+
+        assert statuses.count(201) == room
+        assert statuses.count(400) == len(calls) - room
+        assert (
+            Guest.objects.filter(wedding_profile=profile).count()
+            == ValidationLimits.MAX_GUESTS
+        )
+        assert monitor.deadlocks == 0
+
+    def test_profile_updates_of_different_fields_are_kept(self, wedding):
+        """Test concurrent PATCHes of different fields all stick."""
+        path = reverse("profiles:update_profile")
+        venues = [("patch", path, {"venue": f"Venue {number}"}) for number in range(50)]
+        budgets = [("patch", path, {"budget": 100000 + number}) for number in range(50)]
+        results = {}
+
+        def run(name, calls):
+            results[name] = hammer(wedding.user, calls, 1)
+
+        with ContentionMonitor() as monitor:
+            threads = [
+                threading.Thread(target=run, args=("venue", venues)),
+                threading.Thread(target=run, args=("budget", budgets)),
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        latencies = results["venue"][1] + results["budget"][1]
+        self.report("update_profile", monitor, latencies)
+
+        assert results["venue"][0] + results["budget"][0] == [200] * 100
+        profile = WeddingProfile.objects.get(pk=wedding.profile.pk)
+        assert profile.venue == "Venue 49"
+        assert profile.budget == 100049
+        assert monitor.deadlocks == 0
+
+
+class TestPrebuiltSchema:
+    """Test the schema and docs pages are served from a prebuilt artifact."""
+
+    @pytest.fixture
+    def artifact(self, tmp_path):
+        """Build the schema into a temporary file and serve it."""
+        path = tmp_path / "openapi.json"
+        call_command("build_schema", output=path, stdout=StringIO())
+        with override_settings(
+            OPENAPI_SCHEMA_PATH=path, DEBUG=False, OPENAPI_CACHE_MAX_AGE=600
+        ):
+            yield path
+
+    def test_build_schema_writes_the_openapi_document(self, artifact):
+        """Test the command writes the generated schema."""
+        document = json.loads(artifact.read_text())
+        assert document["openapi"].startswith("3.")
+        assert "/api/v1/guests/list/" in document["paths"]
+
+    def test_serves_the_artifact_with_etag(self, artifact):
+        """Test the schema is read from disk and revalidates with its ETag."""
+        artifact.write_bytes(b'{"openapi": "3.0.3", "paths": {}}')
+        client = APIClient()
+
+        response = client.get(reverse("schema"))
+        assert response.status_code == 200
+        assert response.content == b'{"openapi": "3.0.3", "paths": {}}'
+        assert response["Cache-Control"] == "public, max-age=600"
+        assert "Accept-Encoding" in response["Vary"]
+
+        response = client.get(reverse("schema"), HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304
+
+    def test_gzips_when_accepted(self, artifact):
+        """Test clients accepting gzip get the precompressed body."""
+        response = APIClient().get(reverse("schema"), HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.content) == artifact.read_bytes()
+
+    def test_docs_pages_load_the_versioned_schema(self, artifact):
+        """Test Swagger UI and Redoc point at the immutable schema URL."""
+        client = APIClient()
+        digest = schema.current_schema().digest
+        versioned = reverse("schema-versioned", args=[digest])
+
+        for name in ("swagger-ui", "redoc"):
+            response = client.get(reverse(name))
+            assert response.status_code == 200
+            assert versioned in response.content.decode()
+            assert "csrfmiddlewaretoken" not in response.content.decode()
+
+        response = client.get(versioned)
+        assert response.status_code == 200
+        assert response["Cache-Control"] == (
+            f"public, max-age={schema.IMMUTABLE_MAX_AGE}, immutable"
+        )
+
+        response = client.get(reverse("schema-versioned", args=["0" * 16]))
+        assert response.status_code == 302
+        assert response["Location"] == reverse("schema")
+
+    def test_regenerates_in_debug(self, artifact):
+        """Test DEBUG serves the schema generated from the code."""
+        artifact.write_bytes(b"{}")
+        with override_settings(DEBUG=True):
+            response = APIClient().get(reverse("schema"))
+        assert response["Cache-Control"] == "no-cache"
+        assert "paths" in json.loads(response.content)
+
+
+class TestLazyDocs:
+    """Test API docs are attached when the schema is generated."""
+
+    def test_defers_decorators_until_applied(self):
+        """Test views are undocumented until the deferred docs are applied."""
+
+        def view(request):
+            return HttpResponse()
+
+        calls = []
+        docs = LazyDocs("apps.guests.docs")
+        with override_settings(LAZY_API_DOCS=True):
+            assert docs.guest_list_docs(view) is view
+
+        from apps.guests import docs as guest_docs
+
+        original = guest_docs.guest_list_docs
+        guest_docs.guest_list_docs = calls.append  # type: ignore[assignment]
+        try:
+            assert calls == []
+            apply_deferred_docs()
+        finally:
+            guest_docs.guest_list_docs = original
+        assert calls == [view]
+
+    def test_returns_the_real_decorator_when_disabled(self):
+        """Test LAZY_API_DOCS=False applies docs at import as before."""
+        from apps.guests import docs as guest_docs
+
+        with override_settings(LAZY_API_DOCS=False):
+            decorator = LazyDocs("apps.guests.docs").guest_list_docs
+        assert decorator is guest_docs.guest_list_docs
+
+    def test_generated_schema_includes_the_docs(self):
+        """Test the schema carries the summaries from the docs modules."""
+        document = json.loads(schema.generate_schema())
+        operation = document["paths"]["/api/v1/guests/list/"]["get"]
+        assert operation["summary"] == "List wedding guests"
+        assert document["paths"]["/api/v1/auth/login/"]["post"]["summary"]
+
+    def test_fresh_process_schema_includes_the_docs(self, settings, tmp_path):
+        """Test build_schema documents views it imports itself, without checks."""
+        output = tmp_path / "openapi.json"
+        subprocess.run(
+            [
+                sys.executable,
+                "manage.py",
+                "build_schema",
+                "--skip-checks",
+                "--output",
+                str(output),
+            ],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "LAZY_API_DOCS": "True"},
+            capture_output=True,
+            check=True,
+        )
+
+        document = json.loads(output.read_text())
+        operation = document["paths"]["/api/v1/guests/list/"]["get"]
+        assert operation["summary"] == "List wedding guests"
+
+
+class TestProfileImports:
+    """Test the worker boot time report."""
+
+    def test_summarize_groups_self_time_by_package(self):
+        """Test importtime lines are summed per package and per app."""
+        output = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:      1500 |       1500 |     yaml.error",
+                "import time:       500 |       2000 |   yaml",
+                "import time:      2000 |       2000 | apps.guests.docs",
+                "import time:      1000 |       3000 | apps.guests.views",
+            ]
+        )
+
+        packages, modules = summarize(output)
+        assert packages == {"yaml": 2.0, "apps.guests": 3.0}
+        assert modules["apps.guests.docs"] == 2.0
+
+    def test_reports_boot_time_as_json(self):
+        """Test the report has boot timings and an import breakdown."""
+        out = StringIO()
+        call_command(
+            "profile_imports", runs=1, target_ms=60_000, format="json", stdout=out
+        )
+
+        report = json.loads(out.getvalue())
+        assert len(report["boot_ms"]["runs"]) == 1
+        assert report["boot_ms"]["median"] > 0
+        assert "django" in report["packages_ms"]
+        assert "config" in report["apps_ms"]
+
+    def test_fails_above_the_target(self):
+        """Test a median boot time above the target is an error."""
+        with pytest.raises(CommandError, match="exceeds"):
+            call_command("profile_imports", runs=1, target_ms=1, stdout=StringIO())
+
+
+@pytest.mark.django_db
+class TestSessionlessApi:
+    """Test API paths skip the session, CSRF, auth and message middleware."""
+
+    def view(self, request):
+        return HttpResponse()
+
+    def test_session_middleware_skips_api_paths(self):
+        """Test API requests get no session while admin requests do."""
+        middleware = SessionMiddleware(self.view)
+        api = RequestFactory().get("/api/v1/guests/list/")
+        admin = RequestFactory().get("/admin/")
+
+        middleware(api)
+        middleware(admin)
+        assert not hasattr(api, "session")
+        assert hasattr(admin, "session")
+
+    def test_api_session_auth_restores_the_full_stack(self):
+        """Test API_SESSION_AUTH runs the middleware for API paths too."""
+        with override_settings(API_SESSION_AUTH=True):
+            middleware = SessionMiddleware(self.view)
+        request = RequestFactory().get("/api/v1/guests/list/")
+
+        middleware(request)
+        assert hasattr(request, "session")
+
+    def test_csrf_is_only_checked_outside_the_api(self):
+        """Test unsafe API requests skip CSRF checks; admin ones do not."""
+        middleware = CsrfViewMiddleware(self.view)
+        api = RequestFactory().post("/health/")
+        admin = RequestFactory().post("/admin/login/")
+
+        assert middleware.process_view(api, self.view, (), {}) is None
+        response = middleware.process_view(admin, self.view, (), {})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_deploy_checks_pass(self, tmp_path):
+        """Test check --deploy accepts the CSRF subclass in a production setup."""
+        production = override_settings(
+            DEBUG=False,
+            SECRET_KEY=get_random_secret_key(),
+            # common.E002 refuses per-process caches outside DEBUG.
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": str(tmp_path),
+                }
+            },
+            SECURE_SSL_REDIRECT=True,
+            SECURE_HSTS_SECONDS=31536000,
+            SECURE_HSTS_INCLUDE_SUBDOMAINS=True,
+            SECURE_HSTS_PRELOAD=True,
+            SESSION_COOKIE_SECURE=True,
+            CSRF_COOKIE_SECURE=True,
+        )
+        with production:
+            call_command("check", deploy=True, fail_level="WARNING", stdout=StringIO())
+
+    def test_async_stack_passes_api_requests_through(self):
+        """Test the middleware hands API requests on under ASGI."""
+
+        async def get_response(request):
+            return HttpResponse(status=201)
+
+        middleware = SessionMiddleware(get_response)
+        request = RequestFactory().get("/api/v1/guests/list/")
+
+        assert iscoroutinefunction(middleware)
+        assert async_to_sync(middleware)(request).status_code == 201
+        assert not hasattr(request, "session")
+
+    def test_admin_still_uses_sessions(self, client):
+        """Test the admin login page keeps its CSRF cookie and session."""
+        response = client.get("/admin/login/")
+        assert response.status_code == status.HTTP_200_OK
+        assert "csrftoken" in response.cookies
+
+        staff = User.objects.create_superuser("admin", password="pass12345")
+        client.force_login(staff)
+        assert client.get("/admin/").status_code == status.HTTP_200_OK
+
+    def test_api_rejects_session_logins(self, client):
+        """Test a session cookie alone does not authenticate API requests."""
+        user = User.objects.create_user(username="browser", password="pass12345")
+        client.force_login(user)
+
+        response = client.get(reverse("authentication:profile"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "sessionid" not in response.cookies
+
+    def test_benchmark_reports_both_modes(self):
+        """Test the benchmark times each mode with and without a cookie."""
+        out = StringIO()
+        call_command(
+            "benchmark_middleware",
+            requests=3,
+            format="json",
+            in_place=True,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        assert set(report) == {"jwt", "jwt + session cookie"}
+        for modes in report.values():
+            assert set(modes) == {"full stack", "sessionless"}
+            assert modes["sessionless"]["queries"] == 1
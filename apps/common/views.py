@@ -0,0 +1,39 @@
+"""Operational views shared by the whole API."""
+
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from django.views.decorators.http import require_GET
+
+from apps.common.metrics import merged_metrics, render_text
+
+EXPOSITION_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _authorized(request: HttpRequest, token: str) -> bool:
+    """Return whether the request carries ``token`` as a bearer token."""
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(
+        credentials.encode("utf-8"), token.encode("utf-8")
+    )
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Serve every process's metrics in the Prometheus text format.
+
+    Requires ``Authorization: Bearer <METRICS_TOKEN>``. Without a configured
+    token the endpoint only exists while ``DEBUG`` is on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    elif not _authorized(request, token):
+        response = HttpResponse("Unauthorized", status=401, content_type="text/plain")
+        response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        return response
+
+    body = render_text(merged_metrics(settings.METRICS_MULTIPROC_DIR))
+    return HttpResponse(body, content_type=EXPOSITION_CONTENT_TYPE)
@@ -6,3 +6,11 @@ class GuestsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.guests"
+
+    def ready(self):
+        """Invalidate cached data whenever Guest rows change."""
+        from apps.common.cache import track_detail_writes, track_profile_writes
+
+        model = self.get_model("Guest")
+        track_profile_writes(model)
+        track_detail_writes(model)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("guests", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="guest",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
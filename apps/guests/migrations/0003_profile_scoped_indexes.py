@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-19 01:03
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("guests", "0002_guest_updated_at_auto_now"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="guest",
+            index=models.Index(
+                fields=["wedding_profile", "name"], name="guests_profile_name_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="guest",
+            index=models.Index(
+                fields=["wedding_profile", "rsvp_status", "name"],
+                name="guests_profile_rsvp_name_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="guest",
+            index=models.Index(
+                condition=models.Q(("plus_one", True)),
+                fields=["wedding_profile", "name"],
+                name="guests_profile_plus_one_idx",
+            ),
+        ),
+    ]
@@ -2,6 +2,7 @@ from typing import ClassVar
 
 from django.db import models
 
+from apps.common.cache import ProfileScopedQuerySet
 from apps.profiles.models import WeddingProfile
 
 
@@ -19,6 +20,8 @@ class Guest(models.Model):
         WeddingProfile,
         on_delete=models.CASCADE,
         related_name="guests",
+        # guests_profile_name_idx leads with the profile and serves its lookups.
+        db_index=False,
     )
     name = models.CharField(max_length=100)
     email = models.EmailField(blank=True)
@@ -27,7 +30,30 @@ class Guest(models.Model):
     )
     plus_one = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ProfileScopedQuerySet.as_manager()
+
+    class Meta:
+        """Indexes for the per-wedding guest list and RSVP statistics."""
+
+        indexes: ClassVar = [
+            # list_guests, ordered by name, optionally filtered by RSVP status;
+            # guest_statistics counts per status.
+            models.Index(
+                fields=["wedding_profile", "name"], name="guests_profile_name_idx"
+            ),
+            models.Index(
+                fields=["wedding_profile", "rsvp_status", "name"],
+                name="guests_profile_rsvp_name_idx",
+            ),
+            # Only a minority of guests bring a plus-one.
+            models.Index(
+                fields=["wedding_profile", "name"],
+                condition=models.Q(plus_one=True),
+                name="guests_profile_plus_one_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         """Return a string representation of the guest."""
@@ -1,6 +1,9 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
 
+from apps.common.constants import ValidationLimits
 from apps.guests.models import Guest
 from apps.profiles.models import WeddingProfile
 
@@ -27,3 +30,24 @@ def test_guest_str() -> None:
         plus_one=True,
     )
     assert str(guest) == "Alice (invited)"
+
+
+@pytest.mark.django_db
+def test_create_guest_stops_at_the_guest_cap(monkeypatch) -> None:
+    """Test a wedding at ValidationLimits.MAX_GUESTS cannot add another guest."""
+    monkeypatch.setattr(ValidationLimits, "MAX_GUESTS", 1)
+    user = User.objects.create(username="testuser")
+    WeddingProfile.objects.create(
+        user=user, wedding_date="2025-12-31", bride_name="Jane", groom_name="John"
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse("guests:create_guest")
+
+    first = client.post(url, {"name": "Alice Wanjiru"}, format="json")
+    second = client.post(url, {"name": "Brian Otieno"}, format="json")
+
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert "cannot have more than 1 guests" in second.json()["message"]
+    assert Guest.objects.count() == 1
@@ -4,26 +4,49 @@ Provides CRUD operations for wedding guest list including invitation,
 RSVP tracking, and guest management with proper authentication and ownership.
 """
 
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.cache import detail_cache, profile_cache
+from apps.common.constants import ValidationLimits
+from apps.common.db.routers import read_from_replica
+from apps.common.openapi import LazyDocs
 from apps.common.responses import APIResponse
+from apps.profiles.models import WeddingProfile
 
-from .docs import (
-    guest_create_docs,
-    guest_delete_docs,
-    guest_list_docs,
-    guest_retrieve_docs,
-    guest_rsvp_update_docs,
-    guest_statistics_docs,
-    guest_update_docs,
-)
 from .models import Guest
 from .serializers import GuestSerializer
 
+docs = LazyDocs("apps.guests.docs")
 
-@guest_create_docs
+
+def compute_guest_statistics(wedding_profile):
+    """Aggregate RSVP counts for a wedding profile's guest list."""
+    guests = Guest.objects.filter(wedding_profile=wedding_profile)
+
+    total_guests = guests.count()
+    confirmed = guests.filter(rsvp_status="confirmed").count()
+    declined = guests.filter(rsvp_status="declined").count()
+    pending = guests.filter(rsvp_status="invited").count()
+    maybe = guests.filter(rsvp_status="maybe").count()
+    plus_ones = guests.filter(plus_one=True).count()
+
+    confirmation_rate = (confirmed / total_guests * 100) if total_guests > 0 else 0
+
+    return {
+        "total_guests": total_guests,
+        "confirmed": confirmed,
+        "declined": declined,
+        "pending": pending,
+        "maybe": maybe,
+        "plus_ones": plus_ones,
+        "confirmation_rate": round(confirmation_rate, 1),
+    }
+
+
+@docs.guest_create_docs
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def create_guest(request):
@@ -38,7 +61,24 @@ def create_guest(request):
 
     serializer = GuestSerializer(data=request.data)
     if serializer.is_valid():
-        guest = serializer.save(wedding_profile=wedding_profile)
+        with transaction.atomic():
+            # Creations for one wedding queue on the profile row, so two
+            # requests cannot both see room for the last guest.
+            WeddingProfile.objects.select_for_update(no_key=True).get(
+                pk=wedding_profile.pk
+            )
+            if (
+                Guest.objects.filter(wedding_profile=wedding_profile).count()
+                >= ValidationLimits.MAX_GUESTS
+            ):
+                return APIResponse.error(
+                    message=(
+                        "A wedding cannot have more than "
+                        f"{ValidationLimits.MAX_GUESTS} guests."
+                    ),
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            guest = serializer.save(wedding_profile=wedding_profile)
         return APIResponse.created(
             data=GuestSerializer(guest).data,
             message="Guest added successfully",
@@ -51,9 +91,10 @@ def create_guest(request):
     )
 
 
-@guest_list_docs
+@docs.guest_list_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def list_guests(request):
     """List all guests for the authenticated user's wedding."""
     try:
@@ -64,7 +105,9 @@ def list_guests(request):
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    guests = Guest.objects.filter(wedding_profile=wedding_profile)
+    guests = Guest.objects.filter(wedding_profile=wedding_profile).select_related(
+        "wedding_profile"
+    )
 
     rsvp_status = request.GET.get("rsvp_status")
     if rsvp_status:
@@ -83,7 +126,7 @@ def list_guests(request):
     )
 
 
-@guest_retrieve_docs
+@docs.guest_retrieve_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_guest(request, guest_id):
@@ -91,43 +134,53 @@ def get_guest(request, guest_id):
     try:
         wedding_profile = request.user.wedding_profile
         guest = Guest.objects.get(id=guest_id, wedding_profile=wedding_profile)
-        return APIResponse.success(
-            data=GuestSerializer(guest).data,
-            message="Guest retrieved successfully",
+        return detail_cache.respond(
+            request,
+            guest,
+            lambda: APIResponse.success(
+                data=GuestSerializer(guest).data,
+                message="Guest retrieved successfully",
+            ),
         )
     except Exception:
         return APIResponse.not_found(message="Guest not found")
 
 
-@guest_update_docs
+@docs.guest_update_docs
 @api_view(["PUT", "PATCH"])
 @permission_classes([IsAuthenticated])
 def update_guest(request, guest_id):
-    """Update a specific guest's information."""
-    try:
-        wedding_profile = request.user.wedding_profile
-        guest = Guest.objects.get(id=guest_id, wedding_profile=wedding_profile)
-    except Exception:
-        return APIResponse.not_found(message="Guest not found")
+    """Update a specific guest's information.
 
+    The guest row is locked and re-read before the update, so a concurrent
+    RSVP change is not overwritten with the status read before it.
+    """
     partial = request.method == "PATCH"
-    serializer = GuestSerializer(guest, data=request.data, partial=partial)
-
-    if serializer.is_valid():
+    with transaction.atomic():
+        try:
+            wedding_profile = request.user.wedding_profile
+            guest = Guest.objects.select_for_update(no_key=True).get(
+                id=guest_id, wedding_profile=wedding_profile
+            )
+        except Exception:
+            return APIResponse.not_found(message="Guest not found")
+
+        serializer = GuestSerializer(guest, data=request.data, partial=partial)
+        if not serializer.is_valid():
+            return APIResponse.error(
+                errors=list(serializer.errors.values()),
+                message="Guest update failed",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
         serializer.save()
-        return APIResponse.success(
-            data=serializer.data,
-            message="Guest updated successfully",
-        )
 
-    return APIResponse.error(
-        errors=list(serializer.errors.values()),
-        message="Guest update failed",
-        status_code=status.HTTP_400_BAD_REQUEST,
+    return APIResponse.success(
+        data=serializer.data,
+        message="Guest updated successfully",
     )
 
 
-@guest_delete_docs
+@docs.guest_delete_docs
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
 def delete_guest(request, guest_id):
@@ -141,7 +194,7 @@ def delete_guest(request, guest_id):
         return APIResponse.not_found(message="Guest not found")
 
 
-@guest_rsvp_update_docs
+@docs.guest_rsvp_update_docs
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
 def update_rsvp_status(request, guest_id):
@@ -167,7 +220,9 @@ def update_rsvp_status(request, guest_id):
         )
 
     guest.rsvp_status = rsvp_status
-    guest.save()
+    # Only write the status, so a concurrent edit of the guest's other fields
+    # is not overwritten with the values read above.
+    guest.save(update_fields=["rsvp_status", "updated_at"])
 
     return APIResponse.success(
         data={
@@ -180,34 +235,22 @@ def update_rsvp_status(request, guest_id):
     )
 
 
-@guest_statistics_docs
+@docs.guest_statistics_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def guest_statistics(request):
     """Get guest statistics for the wedding."""
     try:
         wedding_profile = request.user.wedding_profile
-        guests = Guest.objects.filter(wedding_profile=wedding_profile)
-
-        total_guests = guests.count()
-        confirmed = guests.filter(rsvp_status="confirmed").count()
-        declined = guests.filter(rsvp_status="declined").count()
-        pending = guests.filter(rsvp_status="invited").count()
-        maybe = guests.filter(rsvp_status="maybe").count()
-        plus_ones = guests.filter(plus_one=True).count()
-
-        confirmation_rate = (confirmed / total_guests * 100) if total_guests > 0 else 0
+        statistics = profile_cache.get_or_compute(
+            wedding_profile.id,
+            "guest_statistics",
+            lambda: compute_guest_statistics(wedding_profile),
+        )
 
         return APIResponse.success(
-            data={
-                "total_guests": total_guests,
-                "confirmed": confirmed,
-                "declined": declined,
-                "pending": pending,
-                "maybe": maybe,
-                "plus_ones": plus_ones,
-                "confirmation_rate": round(confirmation_rate, 1),
-            },
+            data=statistics,
             message="Guest statistics retrieved successfully",
         )
     except Exception:
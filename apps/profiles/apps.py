@@ -6,3 +6,11 @@ class ProfilesConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.profiles"
+
+    def ready(self):
+        """Invalidate cached data whenever WeddingProfile rows change."""
+        from apps.common.cache import track_detail_writes, track_profile_writes
+
+        model = self.get_model("WeddingProfile")
+        track_profile_writes(model)
+        track_detail_writes(model)
@@ -1,12 +1,18 @@
+from typing import ClassVar
+
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from apps.common.cache import ProfileScopedQuerySet
+
 User = get_user_model()
 
 
 class WeddingProfile(models.Model):
     """Stores core wedding details for a couple; 1:1 with User."""
 
+    PROFILE_ID_FIELD: ClassVar = "id"
+
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -20,6 +26,8 @@ class WeddingProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProfileScopedQuerySet.as_manager()
+
     def __str__(self) -> str:
         """Return string representation of the wedding profile."""
         return f"{self.bride_name} & {self.groom_name} ({self.wedding_date})"
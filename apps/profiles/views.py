@@ -5,23 +5,21 @@ retrieval, update, and deletion with proper authentication.
 """
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.cache import detail_cache, profile_cache
 from apps.common.constants import VendorCategory, WeddingProgressDefaults
+from apps.common.db.routers import read_from_replica
+from apps.common.openapi import LazyDocs
 from apps.common.responses import APIResponse
 
-from .docs import (
-    profile_create_docs,
-    profile_delete_docs,
-    profile_progress_docs,
-    profile_retrieve_docs,
-    profile_update_docs,
-)
 from .models import WeddingProfile
 from .serializers import WeddingProfileSerializer
 
+docs = LazyDocs("apps.profiles.docs")
 User = get_user_model()
 
 
@@ -142,7 +140,53 @@ def calculate_budget_used(
     return int(total_budget * spending_rate)
 
 
-@profile_create_docs
+def compute_wedding_progress(wedding_profile):
+    """Compute planning progress statistics for a wedding profile."""
+    from datetime import date
+
+    from apps.guests.models import Guest
+    from apps.tasks.models import Task
+    from apps.vendors.models import Vendor
+
+    tasks = Task.objects.filter(wedding_profile=wedding_profile)
+    total_tasks = tasks.count()
+    completed_tasks = tasks.filter(is_completed=True).count()
+
+    guests = Guest.objects.filter(wedding_profile=wedding_profile)
+    total_guests = guests.count()
+    confirmed_guests = guests.filter(rsvp_status="confirmed").count()
+
+    vendors = Vendor.objects.filter(wedding_profile=wedding_profile)
+    vendors_booked = vendors.count()
+    vendors_needed = calculate_vendors_needed(wedding_profile)
+
+    days_remaining = (wedding_profile.wedding_date - date.today()).days
+
+    task_progress = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    guest_progress = (confirmed_guests / total_guests * 100) if total_guests > 0 else 0
+    vendor_progress = vendors_booked / vendors_needed * 100
+    overall_progress = round((task_progress + guest_progress + vendor_progress) / 3)
+
+    budget_used = calculate_budget_used(
+        wedding_profile, vendors_booked, total_tasks, completed_tasks
+    )
+
+    return {
+        "overall_progress": overall_progress,
+        "completed_tasks": completed_tasks,
+        "total_tasks": total_tasks,
+        "confirmed_guests": confirmed_guests,
+        "total_guests": total_guests,
+        "vendors_booked": vendors_booked,
+        "vendors_needed": vendors_needed,
+        "days_remaining": days_remaining,
+        "budget_used": budget_used,
+        "total_budget": float(wedding_profile.budget),
+        "next_milestones": generate_dynamic_milestones(wedding_profile),
+    }
+
+
+@docs.profile_create_docs
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def create_profile(request):
@@ -168,49 +212,62 @@ def create_profile(request):
     )
 
 
-@profile_retrieve_docs
+@docs.profile_retrieve_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_profile(request):
     """Get the authenticated user's wedding profile."""
     try:
         profile = request.user.wedding_profile
-        return APIResponse.success(
-            data=WeddingProfileSerializer(profile).data,
-            message="Wedding profile retrieved successfully",
+        return detail_cache.respond(
+            request,
+            profile,
+            lambda: APIResponse.success(
+                data=WeddingProfileSerializer(profile).data,
+                message="Wedding profile retrieved successfully",
+            ),
         )
     except WeddingProfile.DoesNotExist:
         return APIResponse.not_found(message="Wedding profile not found")
 
 
-@profile_update_docs
+@docs.profile_update_docs
 @api_view(["PUT", "PATCH"])
 @permission_classes([IsAuthenticated])
 def update_profile(request):
-    """Update the authenticated user's wedding profile."""
-    try:
-        profile = request.user.wedding_profile
-    except WeddingProfile.DoesNotExist:
-        return APIResponse.not_found(message="Wedding profile not found")
+    """Update the authenticated user's wedding profile.
 
+    The profile row is locked and re-read before the update, so concurrent
+    PATCHes of different fields each apply on top of the other instead of
+    writing back the values they read first.
+    """
     partial = request.method == "PATCH"
-    serializer = WeddingProfileSerializer(profile, data=request.data, partial=partial)
+    with transaction.atomic():
+        try:
+            profile = WeddingProfile.objects.select_for_update(no_key=True).get(
+                user=request.user
+            )
+        except WeddingProfile.DoesNotExist:
+            return APIResponse.not_found(message="Wedding profile not found")
 
-    if serializer.is_valid():
-        serializer.save()
-        return APIResponse.success(
-            data=serializer.data,
-            message="Wedding profile updated successfully",
+        serializer = WeddingProfileSerializer(
+            profile, data=request.data, partial=partial
         )
+        if not serializer.is_valid():
+            return APIResponse.error(
+                errors=list(serializer.errors.values()),
+                message="Profile update failed",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer.save()
 
-    return APIResponse.error(
-        errors=list(serializer.errors.values()),
-        message="Profile update failed",
-        status_code=status.HTTP_400_BAD_REQUEST,
+    return APIResponse.success(
+        data=serializer.data,
+        message="Wedding profile updated successfully",
     )
 
 
-@profile_delete_docs
+@docs.profile_delete_docs
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
 def delete_profile(request):
@@ -223,59 +280,26 @@ def delete_profile(request):
         return APIResponse.not_found(message="Wedding profile not found")
 
 
-@profile_progress_docs
+@docs.profile_progress_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def wedding_progress(request):
     """Get wedding planning progress statistics."""
     try:
         from datetime import date
 
-        from apps.guests.models import Guest
-        from apps.tasks.models import Task
-        from apps.vendors.models import Vendor
-
         wedding_profile = request.user.wedding_profile
-
-        tasks = Task.objects.filter(wedding_profile=wedding_profile)
-        total_tasks = tasks.count()
-        completed_tasks = tasks.filter(is_completed=True).count()
-
-        guests = Guest.objects.filter(wedding_profile=wedding_profile)
-        total_guests = guests.count()
-        confirmed_guests = guests.filter(rsvp_status="confirmed").count()
-
-        vendors = Vendor.objects.filter(wedding_profile=wedding_profile)
-        vendors_booked = vendors.count()
-        vendors_needed = calculate_vendors_needed(wedding_profile)
-
-        days_remaining = (wedding_profile.wedding_date - date.today()).days
-
-        task_progress = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        guest_progress = (
-            (confirmed_guests / total_guests * 100) if total_guests > 0 else 0
-        )
-        vendor_progress = vendors_booked / vendors_needed * 100
-        overall_progress = round((task_progress + guest_progress + vendor_progress) / 3)
-
-        budget_used = calculate_budget_used(
-            wedding_profile, vendors_booked, total_tasks, completed_tasks
+        progress = profile_cache.get_or_compute(
+            wedding_profile.id,
+            "wedding_progress",
+            lambda: compute_wedding_progress(wedding_profile),
+            # Days remaining and milestones roll over at midnight.
+            params={"today": date.today().isoformat()},
         )
 
         return APIResponse.success(
-            data={
-                "overall_progress": overall_progress,
-                "completed_tasks": completed_tasks,
-                "total_tasks": total_tasks,
-                "confirmed_guests": confirmed_guests,
-                "total_guests": total_guests,
-                "vendors_booked": vendors_booked,
-                "vendors_needed": vendors_needed,
-                "days_remaining": days_remaining,
-                "budget_used": budget_used,
-                "total_budget": float(wedding_profile.budget),
-                "next_milestones": generate_dynamic_milestones(wedding_profile),
-            },
+            data=progress,
             message="Wedding progress retrieved successfully",
         )
     except Exception:
@@ -6,3 +6,11 @@ class TasksConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.tasks"
+
+    def ready(self):
+        """Invalidate cached data whenever Task rows change."""
+        from apps.common.cache import track_detail_writes, track_profile_writes
+
+        model = self.get_model("Task")
+        track_profile_writes(model)
+        track_detail_writes(model)
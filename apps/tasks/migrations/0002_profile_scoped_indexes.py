@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-19 01:04
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["wedding_profile", "-created_at"],
+                name="tasks_profile_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["wedding_profile", "is_completed", "-created_at"],
+                name="tasks_profile_done_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="task",
+            index=models.Index(
+                fields=["wedding_profile", "assigned_to", "-created_at"],
+                name="tasks_profile_assignee_idx",
+            ),
+        ),
+    ]
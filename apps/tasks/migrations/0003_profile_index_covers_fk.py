@@ -0,0 +1,42 @@
+# Generated by Django 4.2.23 on 2026-10-19 01:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("profiles", "0001_initial"),
+        ("tasks", "0002_profile_scoped_indexes"),
+    ]
+
+    operations = [
+        # tasks_profile_created_idx leads with the profile, so the foreign key's own index
+        # is dropped, without the lock AlterField's plain DROP INDEX takes.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="task",
+                    name="wedding_profile",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tasks",
+                        to="profiles.weddingprofile",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql='DROP INDEX CONCURRENTLY IF EXISTS "tasks_task_wedding_profile_id_98fa382c"',
+                    reverse_sql=(
+                        'CREATE INDEX CONCURRENTLY IF NOT EXISTS "tasks_task_wedding_profile_id_98fa382c" '
+                        'ON "tasks_task" ("wedding_profile_id")'
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -2,6 +2,7 @@ from typing import ClassVar
 
 from django.db import models
 
+from apps.common.cache import ProfileScopedQuerySet
 from apps.profiles.models import WeddingProfile
 from apps.vendors.models import Vendor
 
@@ -19,6 +20,8 @@ class Task(models.Model):
         WeddingProfile,
         on_delete=models.CASCADE,
         related_name="tasks",
+        # tasks_profile_created_idx leads with the profile and serves its lookups.
+        db_index=False,
     )
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -34,6 +37,28 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProfileScopedQuerySet.as_manager()
+
+    class Meta:
+        """Indexes for the per-wedding task list and progress counts."""
+
+        indexes: ClassVar = [
+            # list_tasks, newest first, optionally filtered by completion or
+            # assignee; wedding_progress counts completed tasks.
+            models.Index(
+                fields=["wedding_profile", "-created_at"],
+                name="tasks_profile_created_idx",
+            ),
+            models.Index(
+                fields=["wedding_profile", "is_completed", "-created_at"],
+                name="tasks_profile_done_idx",
+            ),
+            models.Index(
+                fields=["wedding_profile", "assigned_to", "-created_at"],
+                name="tasks_profile_assignee_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         """Return a string representation of the task."""
         return self.title
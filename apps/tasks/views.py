@@ -4,25 +4,23 @@ Provides CRUD operations for wedding tasks including creation,
 listing, update, and deletion with proper authentication and ownership.
 """
 
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.cache import detail_cache
+from apps.common.db.routers import read_from_replica
+from apps.common.openapi import LazyDocs
 from apps.common.responses import APIResponse
 
-from .docs import (
-    task_create_docs,
-    task_delete_docs,
-    task_list_docs,
-    task_retrieve_docs,
-    task_toggle_docs,
-    task_update_docs,
-)
 from .models import Task
 from .serializers import TaskSerializer
 
+docs = LazyDocs("apps.tasks.docs")
 
-@task_create_docs
+
+@docs.task_create_docs
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def create_task(request):
@@ -50,9 +48,10 @@ def create_task(request):
     )
 
 
-@task_list_docs
+@docs.task_list_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def list_tasks(request):
     """List all tasks for the authenticated user's wedding.
 
@@ -68,7 +67,9 @@ def list_tasks(request):
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    tasks = Task.objects.filter(wedding_profile=wedding_profile)
+    tasks = Task.objects.filter(wedding_profile=wedding_profile).select_related(
+        "wedding_profile", "vendor"
+    )
 
     completed = request.GET.get("completed")
     if completed is not None:
@@ -87,7 +88,7 @@ def list_tasks(request):
     )
 
 
-@task_retrieve_docs
+@docs.task_retrieve_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_task(request, task_id):
@@ -95,15 +96,19 @@ def get_task(request, task_id):
     try:
         wedding_profile = request.user.wedding_profile
         task = Task.objects.get(id=task_id, wedding_profile=wedding_profile)
-        return APIResponse.success(
-            data=TaskSerializer(task).data,
-            message="Task retrieved successfully",
+        return detail_cache.respond(
+            request,
+            task,
+            lambda: APIResponse.success(
+                data=TaskSerializer(task).data,
+                message="Task retrieved successfully",
+            ),
         )
     except Exception:
         return APIResponse.not_found(message="Task not found")
 
 
-@task_update_docs
+@docs.task_update_docs
 @api_view(["PUT", "PATCH"])
 @permission_classes([IsAuthenticated])
 def update_task(request, task_id):
@@ -131,7 +136,7 @@ def update_task(request, task_id):
     )
 
 
-@task_delete_docs
+@docs.task_delete_docs
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
 def delete_task(request, task_id):
@@ -145,16 +150,23 @@ def delete_task(request, task_id):
         return APIResponse.not_found(message="Task not found")
 
 
-@task_toggle_docs
+@docs.task_toggle_docs
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
 def toggle_task_completion(request, task_id):
-    """Toggle the completion status of a task."""
+    """Toggle the completion status of a task.
+
+    The task row is locked while it is flipped, so concurrent toggles apply
+    one after another instead of reading the same state and losing a flip.
+    """
     try:
         wedding_profile = request.user.wedding_profile
-        task = Task.objects.get(id=task_id, wedding_profile=wedding_profile)
-        task.is_completed = not task.is_completed
-        task.save()
+        with transaction.atomic():
+            task = Task.objects.select_for_update(no_key=True).get(
+                id=task_id, wedding_profile=wedding_profile
+            )
+            task.is_completed = not task.is_completed
+            task.save(update_fields=["is_completed", "updated_at"])
         return APIResponse.success(
             data={
                 "id": task.id,
@@ -6,3 +6,11 @@ class VendorsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.vendors"
+
+    def ready(self):
+        """Invalidate cached data whenever Vendor rows change."""
+        from apps.common.cache import track_detail_writes, track_profile_writes
+
+        model = self.get_model("Vendor")
+        track_profile_writes(model)
+        track_detail_writes(model)
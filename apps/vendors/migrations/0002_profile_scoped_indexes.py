@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-19 01:04
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("vendors", "0001_initial"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="vendor",
+            index=models.Index(
+                fields=["wedding_profile", "category", "name"],
+                name="vendors_profile_cat_name_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="vendor",
+            index=models.Index(
+                fields=["wedding_profile", "name"], name="vendors_profile_name_idx"
+            ),
+        ),
+    ]
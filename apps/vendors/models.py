@@ -1,5 +1,8 @@
+from typing import ClassVar
+
 from django.db import models
 
+from apps.common.cache import ProfileScopedQuerySet
 from apps.profiles.models import WeddingProfile
 
 
@@ -10,6 +13,8 @@ class Vendor(models.Model):
         WeddingProfile,
         on_delete=models.CASCADE,
         related_name="vendors",
+        # vendors_profile_name_idx leads with the profile and serves its lookups.
+        db_index=False,
     )
     name = models.CharField(max_length=100)
     category = models.CharField(max_length=50)
@@ -20,6 +25,22 @@ class Vendor(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProfileScopedQuerySet.as_manager()
+
+    class Meta:
+        """Indexes for the per-wedding vendor list and search."""
+
+        indexes: ClassVar = [
+            # list_vendors orders by category then name, search_vendors by name.
+            models.Index(
+                fields=["wedding_profile", "category", "name"],
+                name="vendors_profile_cat_name_idx",
+            ),
+            models.Index(
+                fields=["wedding_profile", "name"], name="vendors_profile_name_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         """Return string representation of the vendor."""
         return self.name
@@ -9,22 +9,48 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 
+from apps.common.cache import detail_cache, profile_cache
+from apps.common.db.routers import read_from_replica
+from apps.common.openapi import LazyDocs
 from apps.common.responses import APIResponse
 
-from .docs import (
-    vendor_categories_docs,
-    vendor_create_docs,
-    vendor_delete_docs,
-    vendor_list_docs,
-    vendor_retrieve_docs,
-    vendor_search_docs,
-    vendor_update_docs,
-)
 from .models import Vendor
 from .serializers import VendorSerializer
 
+docs = LazyDocs("apps.vendors.docs")
 
-@vendor_create_docs
+
+def compute_vendor_categories(wedding_profile):
+    """Group a wedding profile's vendors by category."""
+    vendors = Vendor.objects.filter(wedding_profile=wedding_profile)
+
+    categories = {}
+    for vendor in vendors:
+        category = vendor.category
+        if category not in categories:
+            categories[category] = []
+        categories[category].append(vendor.name)
+
+    category_data = []
+    for category, vendor_names in categories.items():
+        category_data.append(
+            {
+                "category": category,
+                "count": len(vendor_names),
+                "vendors": sorted(vendor_names),
+            }
+        )
+
+    category_data.sort(key=lambda x: x["category"])
+
+    return {
+        "categories": category_data,
+        "total_vendors": vendors.count(),
+        "total_categories": len(categories),
+    }
+
+
+@docs.vendor_create_docs
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def create_vendor(request):
@@ -52,9 +78,10 @@ def create_vendor(request):
     )
 
 
-@vendor_list_docs
+@docs.vendor_list_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def list_vendors(request):
     """List all vendors for the authenticated user's wedding."""
     try:
@@ -65,7 +92,9 @@ def list_vendors(request):
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    vendors = Vendor.objects.filter(wedding_profile=wedding_profile)
+    vendors = Vendor.objects.filter(wedding_profile=wedding_profile).select_related(
+        "wedding_profile"
+    )
 
     category = request.GET.get("category")
     if category:
@@ -79,7 +108,7 @@ def list_vendors(request):
     )
 
 
-@vendor_retrieve_docs
+@docs.vendor_retrieve_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_vendor(request, vendor_id):
@@ -87,15 +116,19 @@ def get_vendor(request, vendor_id):
     try:
         wedding_profile = request.user.wedding_profile
         vendor = Vendor.objects.get(id=vendor_id, wedding_profile=wedding_profile)
-        return APIResponse.success(
-            data=VendorSerializer(vendor).data,
-            message="Vendor retrieved successfully",
+        return detail_cache.respond(
+            request,
+            vendor,
+            lambda: APIResponse.success(
+                data=VendorSerializer(vendor).data,
+                message="Vendor retrieved successfully",
+            ),
         )
     except Exception:
         return APIResponse.not_found(message="Vendor not found")
 
 
-@vendor_update_docs
+@docs.vendor_update_docs
 @api_view(["PUT", "PATCH"])
 @permission_classes([IsAuthenticated])
 def update_vendor(request, vendor_id):
@@ -123,7 +156,7 @@ def update_vendor(request, vendor_id):
     )
 
 
-@vendor_delete_docs
+@docs.vendor_delete_docs
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
 def delete_vendor(request, vendor_id):
@@ -137,40 +170,22 @@ def delete_vendor(request, vendor_id):
         return APIResponse.not_found(message="Vendor not found")
 
 
-@vendor_categories_docs
+@docs.vendor_categories_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def vendor_categories(request):
     """Get list of vendor categories for the wedding."""
     try:
         wedding_profile = request.user.wedding_profile
-        vendors = Vendor.objects.filter(wedding_profile=wedding_profile)
-
-        categories = {}
-        for vendor in vendors:
-            category = vendor.category
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(vendor.name)
-
-        category_data = []
-        for category, vendor_names in categories.items():
-            category_data.append(
-                {
-                    "category": category,
-                    "count": len(vendor_names),
-                    "vendors": sorted(vendor_names),
-                }
-            )
-
-        category_data.sort(key=lambda x: x["category"])
+        categories = profile_cache.get_or_compute(
+            wedding_profile.id,
+            "vendor_categories",
+            lambda: compute_vendor_categories(wedding_profile),
+        )
 
         return APIResponse.success(
-            data={
-                "categories": category_data,
-                "total_vendors": vendors.count(),
-                "total_categories": len(categories),
-            },
+            data=categories,
             message="Vendor categories retrieved successfully",
         )
     except Exception:
@@ -180,14 +195,17 @@ def vendor_categories(request):
         )
 
 
-@vendor_search_docs
+@docs.vendor_search_docs
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def search_vendors(request):
     """Search vendors by name, category, or contact person."""
     try:
         wedding_profile = request.user.wedding_profile
-        vendors = Vendor.objects.filter(wedding_profile=wedding_profile)
+        vendors = Vendor.objects.filter(wedding_profile=wedding_profile).select_related(
+            "wedding_profile"
+        )
 
         query = request.GET.get("q", "").strip()
         if query:
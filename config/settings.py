@@ -10,6 +10,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -53,6 +54,7 @@ INSTALLED_APPS = [
     "corsheaders",
     "drf_spectacular",
     # Local apps
+    "apps.common",
     "apps.authentication",
     "apps.guests",
     "apps.profiles",
@@ -60,18 +62,36 @@ INSTALLED_APPS = [
     "apps.vendors",
 ]
 
+# API clients authenticate with JWTs, so requests under these prefixes skip
+# the session, CSRF, auth and message middleware the admin needs. Setting
+# API_SESSION_AUTH runs them everywhere and accepts session logins in the API.
+# It is off by default, which also takes DRF's SessionAuthentication out of
+# the API: a browser signed in to the admin is anonymous to the API and to
+# "Authorize" in the Swagger UI, and has to send a JWT instead.
+SESSIONLESS_PATH_PREFIXES = ("/api/", "/health/", "/metrics")
+API_SESSION_AUTH = os.environ.get("API_SESSION_AUTH", "False").lower() == "true"
+
 MIDDLEWARE = [
+    "apps.common.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "apps.common.middleware.RequestLoggingMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "apps.common.middleware.RequestProfilingMiddleware",
+    "apps.common.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "apps.common.middleware.CsrfViewMiddleware",
+    "apps.common.middleware.AuthenticationMiddleware",
+    "apps.common.middleware.ReplicaPinningMiddleware",
+    "apps.common.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# security.W003 only looks for django.middleware.csrf.CsrfViewMiddleware by
+# name; apps.common.middleware.CsrfViewMiddleware subclasses it and enforces
+# CSRF on every path outside SESSIONLESS_PATH_PREFIXES (everywhere with
+# API_SESSION_AUTH), where no session cookie is read.
+SILENCED_SYSTEM_CHECKS = ["security.W003"]
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -96,7 +116,7 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+DATABASES: dict[str, dict] = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": os.environ.get("DBNAME", "wedding_planner_db"),
@@ -104,9 +124,113 @@ DATABASES = {
         "PASSWORD": os.environ.get("DBPASSWORD", "your_password"),
         "HOST": os.environ.get("DBHOST", "localhost"),
         "PORT": os.environ.get("DBPORT", "5432"),
+        # Keep each thread's connection open between requests instead of
+        # reconnecting every time; it is pinged before reuse.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": (
+            os.environ.get("DB_CONN_HEALTH_CHECKS", "True").lower() == "true"
+        ),
     },
 }
 
+# Optional in-process connection pool shared by all request threads. Requests
+# return their connection to the pool when they finish, so CONN_MAX_AGE is 0.
+DB_POOL_ENABLED = os.environ.get("DB_POOL_ENABLED", "False").lower() == "true"
+if DB_POOL_ENABLED:
+    DATABASES["default"].update(
+        {
+            "ENGINE": "apps.common.db.backends.postgresql",
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                    "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 5)),
+                    "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", 300)),
+                    "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", 3600)),
+                },
+            },
+        }
+    )
+
+# Optional read replicas: comma-separated host[:port] list sharing the
+# primary's credentials. List, statistics, progress and search views read
+# from a healthy replica unless the user wrote within REPLICA_PIN_SECONDS.
+# The pins live in the default cache, so replicas require CACHE_BACKEND file
+# or redis (system check common.E001).
+DB_REPLICA_HOSTS = [
+    host.strip()
+    for host in os.environ.get("DB_REPLICA_HOSTS", "").split(",")
+    if host.strip()
+]
+for index, replica in enumerate(DB_REPLICA_HOSTS):
+    replica_host, _, replica_port = replica.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["apps.common.db.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+REPLICA_RETRY_SECONDS = int(os.environ.get("REPLICA_RETRY_SECONDS", 30))
+
+
+# Cache Configuration
+# CACHE_BACKEND selects locmem (default), file or redis; the redis backend
+# speaks RESP directly and does not need the redis package. locmem is private
+# to each process, so a write on one worker would not invalidate another
+# worker's cached aggregates: with DEBUG off it is refused (system check
+# common.E002) unless AGGREGATE_CACHE_ENABLED is off. Use file for workers on
+# a single host and redis across hosts.
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "apps.common.cache.backends.RespCache",
+}
+CACHE_DEFAULT_LOCATIONS = {
+    "locmem": "wedding-planner",
+    "file": os.path.join(tempfile.gettempdir(), "wedding-planner-cache"),
+    "redis": "redis://127.0.0.1:6379/0",
+}
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem").lower()
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION", CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]
+        ),
+        "KEY_PREFIX": os.environ.get("CACHE_KEY_PREFIX", "wedding"),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT_SECONDS", 300)),
+    },
+}
+
+AGGREGATE_CACHE_ENABLED = (
+    os.environ.get("AGGREGATE_CACHE_ENABLED", "True").lower() == "true"
+)
+AGGREGATE_CACHE_ALIAS = "default"
+AGGREGATE_CACHE_TIMEOUT = int(os.environ.get("AGGREGATE_CACHE_TIMEOUT_SECONDS", 300))
+
+# Concurrent identical aggregate computations share one result; the cache
+# lock extends this across worker processes.
+SINGLE_FLIGHT_ENABLED = (
+    os.environ.get("SINGLE_FLIGHT_ENABLED", "True").lower() == "true"
+)
+SINGLE_FLIGHT_CACHE_LOCK = (
+    os.environ.get("SINGLE_FLIGHT_CACHE_LOCK", "False").lower() == "true"
+)
+SINGLE_FLIGHT_TIMEOUT_SECONDS = float(
+    os.environ.get("SINGLE_FLIGHT_TIMEOUT_SECONDS", 10)
+)
+SINGLE_FLIGHT_POLL_INTERVAL_SECONDS = 0.05
+
+# Rendered detail responses are kept per process, bounded by total size.
+DETAIL_CACHE_ENABLED = os.environ.get("DETAIL_CACHE_ENABLED", "True").lower() == "true"
+DETAIL_CACHE_MAX_BYTES = int(os.environ.get("DETAIL_CACHE_MAX_BYTES", 8 * 1024 * 1024))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -155,7 +279,11 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
+        *(
+            ["rest_framework.authentication.SessionAuthentication"]
+            if API_SESSION_AUTH
+            else []
+        ),
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -208,7 +336,23 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
     "COMPONENT_SPLIT_REQUEST": True,
     "SCHEMA_PATH_PREFIX": "/api/v1/",
+    "DEFAULT_GENERATOR_CLASS": "apps.common.openapi.SchemaGenerator",
 }
+# Attach the apps' docs.py metadata to views when a schema is generated
+# instead of at import, which keeps it out of every worker's boot.
+LAZY_API_DOCS = os.environ.get("LAZY_API_DOCS", "True").lower() == "true"
+# "python manage.py profile_imports" fails when the median worker boot (WSGI
+# application plus URLconf, without interpreter start-up) is slower than this.
+BOOT_TIME_TARGET_MS = float(os.environ.get("BOOT_TIME_TARGET_MS", 800))
+
+# The schema is generated at deploy time with "python manage.py build_schema"
+# and served from memory; with DEBUG on it is regenerated per request instead.
+# /api/schema/, /api/docs/ and /api/redoc/ may be cached OPENAPI_CACHE_MAX_AGE
+# seconds; the digest-versioned schema URL the docs pages load, for a year.
+OPENAPI_SCHEMA_PATH = Path(
+    os.environ.get("OPENAPI_SCHEMA_PATH") or BASE_DIR / "openapi.json"
+)
+OPENAPI_CACHE_MAX_AGE = int(os.environ.get("OPENAPI_CACHE_MAX_AGE", 3600))
 
 # CORS Configuration (from environment)
 CORS_ALLOWED_ORIGINS = [
@@ -225,73 +369,182 @@ LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO" if DEBUG else "WARNING")
 LOG_REQUEST_BODIES = (
     os.environ.get("LOG_REQUEST_BODIES", "True").lower() == "true" and DEBUG
 )
+# Only the first LOG_REQUEST_BODY_MAX_BYTES of a body are logged (at DEBUG).
+LOG_REQUEST_BODY_MAX_BYTES = int(os.environ.get("LOG_REQUEST_BODY_MAX_BYTES", 2048))
 LOG_TO_FILE = os.environ.get("LOG_TO_FILE", "True").lower() == "true"
 LOG_TO_CONSOLE = os.environ.get("LOG_TO_CONSOLE", "True").lower() == "true"
+# "json" writes one JSON object per line with every request field.
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+# Colour text console output with coloredlogs (imported only when enabled).
+LOG_COLORS = os.environ.get("LOG_COLORS", str(DEBUG)).lower() == "true"
+# In production, errors and requests slower than LOG_SLOW_REQUEST_MS are always
+# logged; other responses are logged with probability LOG_SAMPLE_RATE.
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", 0.1))
+LOG_SLOW_REQUEST_MS = float(os.environ.get("LOG_SLOW_REQUEST_MS", 1000))
+# Count and time each request's SQL for the response log line; optionally
+# expose the timings to clients in a Server-Timing header.
+LOG_QUERY_STATS = os.environ.get("LOG_QUERY_STATS", "True").lower() == "true"
+SERVER_TIMING_HEADER = (
+    os.environ.get("SERVER_TIMING_HEADER", str(DEBUG)).lower() == "true"
+)
+# Append /*app=...,request_id=...,route=...*/ to every SQL statement a request
+# runs, so slow-query logs and pg_stat_statements map back to endpoints.
+# Without the request id, identical statements keep identical SQL text across
+# requests (for client-side prepared statement caches).
+SQL_COMMENTS = os.environ.get("SQL_COMMENTS", "True").lower() == "true"
+SQL_COMMENT_REQUEST_ID = (
+    os.environ.get("SQL_COMMENT_REQUEST_ID", "True").lower() == "true"
+)
+# Flag requests that run one query shape more than NPLUSONE_THRESHOLD times,
+# with the stack that issued it: a warning, or an NPlusOneError with
+# NPLUSONE_RAISE (the test suite turns this on).
+NPLUSONE_DETECTION = os.environ.get("NPLUSONE_DETECTION", str(DEBUG)).lower() == "true"
+NPLUSONE_THRESHOLD = int(os.environ.get("NPLUSONE_THRESHOLD", 5))
+NPLUSONE_RAISE = os.environ.get("NPLUSONE_RAISE", "False").lower() == "true"
+
+# Metrics are served at /metrics in the Prometheus text format. With
+# METRICS_TOKEN set, scrapes need "Authorization: Bearer <token>"; without one
+# the endpoint is only available while DEBUG is on. Under several worker
+# processes, point PROMETHEUS_MULTIPROC_DIR at a directory shared by the
+# workers (and emptied on deploy) so every worker's numbers are merged.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR", "")
+METRICS_FLUSH_INTERVAL_SECONDS = float(
+    os.environ.get("METRICS_FLUSH_INTERVAL_SECONDS", 1)
+)
 
-# Create logs directory
+# The file handlers create the directory when they first write.
 LOGS_DIR = BASE_DIR / "logs"
-LOGS_DIR.mkdir(exist_ok=True)
+
+# Opt-in request profiling. A PROFILE_SAMPLE_RATE fraction of requests runs
+# under cProfile; any request slower than PROFILE_SLOW_REQUEST_MS keeps its
+# sampled stacks. Files are written to PROFILES_DIR, capped at PROFILE_MAX_BYTES.
+PROFILE_REQUESTS = os.environ.get("PROFILE_REQUESTS", "False").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0.01))
+PROFILE_SLOW_REQUEST_MS = float(
+    os.environ.get("PROFILE_SLOW_REQUEST_MS", LOG_SLOW_REQUEST_MS)
+)
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 5))
+PROFILE_MAX_BYTES = int(os.environ.get("PROFILE_MAX_BYTES", 100 * 1024 * 1024))
+PROFILES_DIR = LOGS_DIR / "profiles"
+
+# Log records are queued on the request thread and written by a background
+# listener. LOG_QUEUE_OVERFLOW decides what happens when the queue is full:
+# drop_new, drop_oldest or block. The file rotates by size, or on the
+# LOG_ROTATE_WHEN schedule (e.g. "midnight") when set, and old files are gzipped.
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+LOG_QUEUE_OVERFLOW = os.environ.get("LOG_QUEUE_OVERFLOW", "drop_new")
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", 10))
+LOG_ROTATE_WHEN = os.environ.get("LOG_ROTATE_WHEN", "")
+# INFO also writes every logged response line to the file, for latency_report
+# (which also needs LOG_FORMAT=json to weight lines by their sample rate).
+LOG_FILE_LEVEL = os.environ.get("LOG_FILE_LEVEL", "WARNING")
+
+LOG_HANDLERS = [
+    name
+    for name, enabled in (("console", LOG_TO_CONSOLE), ("file", LOG_TO_FILE))
+    if enabled
+]
+LOG_CONSOLE_FORMATTER = (
+    "json" if LOG_FORMAT == "json" else "colored" if LOG_COLORS else "detailed"
+)
+LOG_FILE_HANDLER = {
+    "formatter": "json" if LOG_FORMAT == "json" else "detailed",
+    "level": LOG_FILE_LEVEL,
+    "filters": ["apps_only"],
+    "filename": LOGS_DIR / "django.log",
+    "backupCount": LOG_BACKUP_COUNT,
+    "delay": True,
+}
+if LOG_ROTATE_WHEN:
+    LOG_FILE_HANDLER.update(
+        {
+            "class": "apps.common.logging_handlers.GzipTimedRotatingFileHandler",
+            "when": LOG_ROTATE_WHEN,
+        }
+    )
+else:
+    LOG_FILE_HANDLER.update(
+        {
+            "class": "apps.common.logging_handlers.GzipRotatingFileHandler",
+            "maxBytes": LOG_MAX_BYTES,
+        }
+    )
 
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "apps_only": {"name": "apps"},
+    },
     "formatters": {
-        "colored": {
-            "()": "coloredlogs.ColoredFormatter",
-            "format": "%(asctime)s %(name)s %(levelname)s %(message)s",
-            "datefmt": "%H:%M:%S",
-        },
+        **(
+            {
+                "colored": {
+                    "()": "coloredlogs.ColoredFormatter",
+                    "format": "%(asctime)s %(name)s %(levelname)s %(message)s",
+                    "datefmt": "%H:%M:%S",
+                }
+            }
+            if LOG_COLORS
+            else {}
+        ),
         "detailed": {
             "format": "[{asctime}] {levelname} {name}: {message}",
             "style": "{",
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
+        "json": {
+            "()": "apps.common.logging_formatters.JsonFormatter",
+        },
     },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
-            "formatter": "colored",
+            "formatter": LOG_CONSOLE_FORMATTER,
             "level": "INFO",
         },
-        "file": {
-            "class": "logging.FileHandler",
-            "filename": LOGS_DIR / "django.log",
-            "formatter": "detailed",
-            "level": "WARNING",
+        "file": LOG_FILE_HANDLER,
+        "queue": {
+            "class": "apps.common.logging_handlers.QueueHandler",
+            "handlers": LOG_HANDLERS,
+            "maxsize": LOG_QUEUE_SIZE,
+            "overflow": LOG_QUEUE_OVERFLOW,
         },
     },
     "root": {
-        "handlers": ["console"],
+        "handlers": ["queue"],
         "level": "INFO",
     },
     "loggers": {
         "django": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
         "django.server": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
         "drf_spectacular": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": "WARNING",
             "propagate": False,
         },
         "apps": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": LOG_LEVEL,
             "propagate": False,
         },
         "apps.requests": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": LOG_LEVEL,
             "propagate": False,
         },
         "apps.errors": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": "WARNING",
             "propagate": False,
         },
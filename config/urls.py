@@ -6,21 +6,20 @@ Main URL router with API versioning and comprehensive endpoint organization.
 from django.contrib import admin
 from django.http import HttpResponse
 from django.urls import include, path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+
+from apps.common import schema
+from apps.common.views import metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", schema.schema, name="schema"),
     path(
-        "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
+        "api/schema/<slug:digest>/",
+        schema.versioned_schema,
+        name="schema-versioned",
     ),
-    path("api/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    path("api/docs/", schema.swagger_ui, name="swagger-ui"),
+    path("api/redoc/", schema.redoc, name="redoc"),
     path("api/v1/auth/", include("apps.authentication.urls")),
     path("api/v1/profiles/", include("apps.profiles.urls")),
     path("api/v1/tasks/", include("apps.tasks.urls")),
@@ -32,4 +31,5 @@ urlpatterns = [
             '{"status": "healthy"}', content_type="application/json"
         ),
     ),
+    path("metrics", metrics, name="metrics"),
 ]
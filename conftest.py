@@ -0,0 +1,32 @@
+"""Project-wide pytest configuration."""
+
+import pytest
+from django.test import override_settings
+
+from apps.common.memory import MemoryProfiler
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fail_on_n_plus_one_queries():
+    """Make every request in the test suite raise on N+1 queries."""
+    with override_settings(NPLUSONE_DETECTION=True, NPLUSONE_RAISE=True):
+        yield
+
+
+@pytest.fixture
+def memory_profiler():
+    """Trace allocations for the test; measure blocks with ``.stage(name)``."""
+    with MemoryProfiler() as profiler:
+        yield profiler
+
+
+def pytest_addoption(parser):
+    """Register project-specific command line options."""
+    parser.addoption(
+        "--update-query-plans",
+        action="store_true",
+        help=(
+            "Rewrite the query plan outlines recorded for TestQueryPlans "
+            "(or set UPDATE_QUERY_PLANS=1)."
+        ),
+    )